@@ -1,166 +1,241 @@
-class Node:
-    pass
+import sys
+from position import Span
+
+## Nodes are slotted: no per-instance __dict__, operators are kept as their token type
+## and identifiers as interned names, so the tree holds on to no tokens at all.
+class Node(Span):
+    # Every node covers source[start:end]; pos_start/pos_end are resolved on demand
+    __slots__ = ('source', 'start', 'end')
+
+    def setSpan(self, first, last):
+        # Synthetic tokens and empty blocks have no source; fall back to 'first'
+        self.source = first.source
+        self.start = first.start
+        self.end = last.end if last.source else first.end
+
+    def noSpan(self):
+        self.source = self.start = self.end = None
+
+def fields(node):
+    # (name, value) for each of the node's own slots, i.e. everything but the span
+    for name in type(node).__slots__:
+        yield name, getattr(node, name)
 
 class ProgramNode(Node):
-    def __init__(self, statements):
-        self.statements = statements
+    __slots__ = ('statements', 'declarations')
+
+    def __init__(self, statements, declarations):
+        self.statements = tuple(statements)
+        self.declarations = declarations
+        self.noSpan()
 
 class IfStatementNode(Node):
+    __slots__ = ('test', 'body', 'alternative')
+
     def __init__(self, test, body, alternative):
         self.test = test
         self.body = body
         self.alternative = alternative
-        self.pos_start = test.pos_start
-        self.pos_end = alternative.pos_end if alternative else body.pos_end
+        self.setSpan(test, alternative if alternative else body)
 
 class ForStatementNode(Node):
+    __slots__ = ('init', 'test', 'update', 'body')
+
     def __init__(self, init, test, update, body):
         self.init = init
         self.test = test
         self.update = update
         self.body = body
-        self.pos_start = self.init.pos_start
-        self.pos_end = self.body.pos_end
+        self.setSpan(self.init, self.body)
 
 class PutStatementNode(Node):
+    __slots__ = ('arguments',)
+
     def __init__(self, arguments):
-        self.arguments = arguments
-        self.pos_start = arguments[0].pos_start
-        self.pos_end = arguments[-1].pos_start
+        self.arguments = tuple(arguments)
+        self.setSpan(arguments[0], arguments[-1])
 
 class WhileStatementNode(Node):
+    __slots__ = ('test', 'body')
+
     def __init__(self, test, body):
         self.test = test
         self.body = body
-        self.pos_start = test.pos_start
-        self.pos_end = body.pos_end
+        self.setSpan(test, body)
 
 class BlockStatementNode(Node):
+    __slots__ = ('body',)
+
     def __init__(self, body):
-        self.body = body
+        self.body = tuple(body)
         if len(body) > 0:
-            self.pos_start = body[0].pos_start
-            self.pos_end = body[-1].pos_end
+            self.setSpan(body[0], body[-1])
+        else:
+            self.noSpan()
 
 class ExpressionStatementNode(Node):
+    __slots__ = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
-        self.pos_start = expression.pos_start
-        self.pos_end = expression.pos_end
+        self.setSpan(expression, expression)
 
 class ListExpressionNode(Node):
-    def __init__(self, elements, pos_start = None, pos_end = None):
-        self.elements = elements
-        self.pos_start = pos_start
-        self.pos_end = pos_end
+    __slots__ = ('elements',)
+
+    def __init__(self, elements, first = None, last = None):
+        self.elements = tuple(elements)
+        if first and last:
+            self.setSpan(first, last)
+        else:
+            self.noSpan()
 
 class UpdateExpressionNode(Node):
+    __slots__ = ('operator', 'argument')
+
     def __init__(self, operator, argument):
-        self.operator = self.token = operator
+        self.operator = operator.type
         self.argument = argument
-        self.pos_start = argument.pos_start
-        self.pos_end = operator.pos_end
+        self.setSpan(argument, operator)
 
 class AssignmentExpressionNode(Node):
+    __slots__ = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
         self.left = left
-        self.op = self.token = op
+        self.op = op.type
         self.right = right
-        self.pos_start = left.pos_start
-        self.pos_end = right.pos_end
+        self.setSpan(left, right)
 
 class CallExpressionNode(Node):
+    __slots__ = ('callee', 'arguments')
+
     def __init__(self, callee, arguments):
         self.callee = callee
-        self.arguments = arguments
-        self.pos_start = callee.pos_start
+        self.arguments = tuple(arguments)
         if len(arguments) > 0:
-            self.pos_end = arguments[-1].pos_end
+            self.setSpan(callee, arguments[-1])
         else:
-            self.pos_end = self.pos_start
+            self.setSpan(callee, callee)
 
 class VariableDeclarationNode(Node):
+    __slots__ = ('kind', 'variableDeclarators')
+
     def __init__(self, kind, declarations):
         self.kind = kind
-        self.variableDeclarators = declarations
-        self.pos_start = kind.pos_start
-        self.pos_end = declarations[-1].pos_end
+        self.variableDeclarators = tuple(declarations)
+        self.setSpan(kind, declarations[-1])
 
 class VariableDeclaratorNode(Node):
+    __slots__ = ('identifier', 'init')
+
     def __init__(self, identifier, init):
         self.identifier = identifier
         self.init = init
-        self.pos_start = identifier.pos_start
-        if init:
-            self.pos_end = init.pos_end
-        else:
-            self.pos_end = identifier.pos_end
+        self.setSpan(identifier, init if init else identifier)
 
 class InlineFunctionNode(Node):
-    def __init__(self, params, body, symbolTable):
+    __slots__ = ('name', 'params', 'body', 'layout')
+
+    def __init__(self, params, body):
         self.name = None
-        self.params = params
+        self.params = tuple(params)
         self.body = body
-        self.symtab = symbolTable
-        self.pos_start = self.name.pos_start if self.name else 0
-        self.pos_end = body.pos_end
+        # Set by the resolver; see symTable.FrameLayout
+        self.layout = None
+        self.setSpan(body, body)
 
     def setPosition(self, name):
-        self.name = name.identifier.value
-        self.pos_start = name.pos_start
+        self.name = name.name
+        self.start = name.start
 
 class MemberExpressionNode(Node):
+    __slots__ = ('identifier', 'property')
+
     def __init__(self, identifier, Property):
         self.identifier = identifier
         self.property = Property
-        self.pos_start = identifier.pos_start
-        self.pos_end = Property.pos_end
+        self.setSpan(identifier, Property)
 
 class IdentifierNode(Node):
+    __slots__ = ('name', 'scope', 'slot')
+
     def __init__(self, identifier):
-        self.identifier = identifier
-        self.pos_start = self.identifier.pos_start
-        self.pos_end = self.identifier.pos_end
+        self.name = sys.intern(identifier.value)
+        # Set by the resolver: the FrameLayout of the enclosing function (None at the
+        # top level) and the name's index in it (None when it is not a local)
+        self.scope = None
+        self.slot = None
+        self.setSpan(identifier, identifier)
 
     def __repr__(self):
-        return f'[Identifier: {self.identifier.value}]'
+        return f'[Identifier: {self.name}]'
 
 class LiteralNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, stringToken):
-        self.token = stringToken
-        self.pos_start = self.token.pos_start
-        self.pos_end = self.token.pos_end
+        self.value = stringToken.value
+        self.setSpan(stringToken, stringToken)
 
 class ReturnNode(Node):
+    __slots__ = ('expr', 'tail')
+
     def __init__(self, expr):
         self.expr = expr
-        self.pos_start = expr.pos_start
-        self.pos_end = expr.pos_end
+        # Set by the resolver: True when 'expr' calls the function the 'ret' is in, with
+        # all its arguments, so the call can run again in the same frame
+        self.tail = False
+        self.setSpan(expr, expr)
 
 class NumberNode(Node):
+    __slots__ = ('value',)
+
     def __init__(self, token):
-        self.token = token
         self.value = token.value
-        self.pos_start = self.token.pos_start
-        self.pos_end   = self.token.pos_end
+        self.setSpan(token, token)
 
     def __repr__(self):
         return f'NumberNode[v:{self.value}]'
 
+class ConstantNode(Node):
+    # A subtree the optimizer evaluated ahead of time; 'value' is an int, float or str
+    __slots__ = ('value',)
+
+    def __init__(self, value, node):
+        self.value = value
+        self.setSpan(node, node)
+
+    def __repr__(self):
+        return f'ConstantNode[v:{self.value!r}]'
+
 class UnaryOpNode(Node):
+    __slots__ = ('op', 'expr')
+
     def __init__(self, op, expr):
         self.expr = expr
-        self.token = self.op = op
-        self.pos_start = self.op.pos_start
-        self.pos_end = self.expr.pos_end
+        self.op = op.type
+        self.setSpan(op, expr)
 
 class BinOpNode(Node):
-    def __init__(self, left, op, right, pos_start = None, pos_end = None):
+    __slots__ = ('left', 'op', 'right')
+
+    def __init__(self, left, op, right):
         self.left = left
-        self.token = self.op = op
+        self.op = op.type
         self.right = right
-        self.pos_start = self.left.pos_start
-        self.pos_end = self.right.pos_end
+        self.setSpan(left, right)
 
     def __repr__(self):
-        return f'BinOp[l:{self.left}, o:{self.op}, r:{self.right}]'
\ No newline at end of file
+        return f'BinOp[l:{self.left}, o:{self.op}, r:{self.right}]'
+
+class LogicalOpNode(Node):
+    # '&&' and '||': 1 or 0 by the truth of the operands, and the right one is only
+    # evaluated when the left one does not decide it
+    __slots__ = ('left', 'op', 'right')
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op.type
+        self.right = right
+        self.setSpan(left, right)
@@ -0,0 +1,118 @@
+import gc
+import os
+import sys
+import glob
+import pickle
+import hashlib
+import ast
+import lexer as Lexer
+import parser as Parser
+
+## Parsed programs are stored next to the script in __orioncache__/<script>.orionc:
+##
+##   MAGIC | interpreter key (32 bytes) | source key (32 bytes) | pickled payload
+##
+## A cache file is only used when both keys match, so it is ignored (and rewritten) when
+##   - the script's text changes in any way (sha256 of the source),
+##   - any module of the interpreter changes, or a different Python minor version runs it,
+##   - the file is truncated, corrupt, or was written by an older cache format.
+## Programs with lexer or parser errors are never cached.
+CACHE_DIR = '__orioncache__'
+EXTENSION = '.orionc'
+MAGIC = b'ORIONC\x01\n'
+KEY_SIZE = hashlib.sha256().digest_size
+
+_interpreterKey = None
+
+def interpreterKey():
+    global _interpreterKey
+    if _interpreterKey is None:
+        digest = hashlib.sha256(MAGIC)
+        digest.update(repr(sys.version_info[:2]).encode())
+        root = os.path.dirname(os.path.abspath(__file__))
+        for path in sorted(glob.glob(os.path.join(root, '*.py'))):
+            with open(path, 'rb') as file:
+                digest.update(os.path.basename(path).encode())
+                digest.update(file.read())
+        _interpreterKey = digest.digest()
+    return _interpreterKey
+
+def sourceKey(text):
+    return hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest()
+
+def cachePath(fileName, extension = EXTENSION):
+    directory, name = os.path.split(os.path.abspath(fileName))
+    return os.path.join(directory, CACHE_DIR, name + extension)
+
+
+## Unpickling allocates the whole tree in one go; letting the cyclic collector scan it
+## over and over on the way costs more than the load itself.
+class _NoCollection:
+    def __enter__(self):
+        self.enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc):
+        if self.enabled: gc.enable()
+
+
+def load(fileName, text):
+    try:
+        with open(cachePath(fileName), 'rb') as file:
+            header = file.read(len(MAGIC) + 2 * KEY_SIZE)
+            if header != MAGIC + interpreterKey() + sourceKey(text):
+                return None
+            with _NoCollection():
+                program = pickle.load(file)
+    except Exception:
+        # Missing, stale or unreadable: the caller just parses again
+        return None
+    # The same text may have been cached under another path (the script was moved, or
+    # run from another directory); errors name the file as it is run now
+    source = sourceOf(program)
+    if source is not None:
+        source.fileName = fileName
+    return program
+
+def sourceOf(program):
+    # The Source all of a parsed program's nodes share, or None if it has no nodes
+    pending = [program]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Node):
+            if node.source is not None:
+                return node.source
+            pending.extend(value for name, value in ast.fields(node))
+        elif isinstance(node, (tuple, list)):
+            pending.extend(node)
+    return None
+
+def store(fileName, text, program):
+    path = cachePath(fileName)
+    temp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(temp, 'wb') as file:
+            file.write(MAGIC + interpreterKey() + sourceKey(text))
+            with _NoCollection():
+                pickle.dump(program, file, pickle.HIGHEST_PROTOCOL)
+        # Readers either see the old file or the complete new one
+        os.replace(temp, path)
+        return True
+    except (OSError, pickle.PicklingError, RecursionError):
+        # Read-only directory or an AST too deep to pickle; caching is best effort
+        try: os.remove(temp)
+        except OSError: pass
+        return False
+
+def parse(fileName, text, useCache = True):
+    if useCache:
+        program = load(fileName, text)
+        if program is not None:
+            result = Parser.ParseResult()
+            return result.success(program)
+
+    result = Parser.Parser(Lexer.Lexer(fileName, text)).parse()
+    if useCache and not result.error:
+        store(fileName, text, result.node)
+    return result
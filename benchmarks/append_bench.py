@@ -0,0 +1,80 @@
+## Appending in place against copying the List, for the 'result = result..[count]' loop
+## of examples/loops&conditionals.orion on the tree walker. The copying build is
+## quadratic, so it only runs up to 40,000 items; the in-place one goes on to a million,
+## where its time per item should stay flat. Both must print the same.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+
+BUILD = '''
+let result, count = [], 0;
+while (count < {0}) {{
+    result = result..[count];
+    count++;
+}}
+puts len(result);
+puts result[{0} - 1];
+'''
+SIZES = [10000, 20000, 40000, 1000000]
+COPY_SIZES = 40000
+
+
+def copyingExtended(self, values):
+    # What '..' did before: a new Python list every time
+    return Type.List(self.value + values)
+
+@contextlib.contextmanager
+def copying():
+    extended = Type.List.extended
+    Type.List.extended = copyingExtended
+    try:
+        yield
+    finally:
+        Type.List.extended = extended
+
+@contextlib.contextmanager
+def inPlace():
+    yield
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Interpreter.Interpreter(result).Interpret()
+    return output.getvalue()
+
+def measure(mode, result, repeat):
+    with mode():
+        output = run(result)
+        return output, common.best_of(lambda: run(result), repeat)
+
+def main(scale = 1):
+    rows = []
+    for size in SIZES:
+        size *= scale
+        result = parse(BUILD.format(size))
+        repeat = 3 if size <= COPY_SIZES * scale else 1
+        newOutput, newTime = measure(inPlace, result, repeat)
+        perItem = f'{newTime / size * 1e6:6.2f} us/item'
+        if size <= COPY_SIZES * scale:
+            oldOutput, oldTime = measure(copying, result, repeat)
+            if oldOutput != newOutput:
+                raise Exception(f'{size:,} items: appending in place changes the output')
+            rows.append((f'{size:,} items', f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x  {perItem}'))
+        else:
+            rows.append((f'{size:,} items', f'{"-":>9}     {newTime * 1000:9.1f} ms  {"-":>6}   {perItem}'))
+    common.report('copying, in place, speedup, in place per item', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
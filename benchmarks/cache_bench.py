@@ -0,0 +1,42 @@
+## Time to get a parsed program with a cold __orioncache__ (parse and store) against a
+## warm one (load the pickled AST), plus the cost of parsing with the cache disabled.
+import os
+import sys
+import shutil
+import tempfile
+import common
+
+import astCache
+
+
+def cold(fileName, text):
+    shutil.rmtree(os.path.dirname(astCache.cachePath(fileName)), ignore_errors = True)
+    return astCache.parse(fileName, text)
+
+def main(copies = 100):
+    text = common.corpus(copies)
+    directory = tempfile.mkdtemp()
+    try:
+        fileName = os.path.join(directory, 'bench.orion')
+        with open(fileName, 'w') as file:
+            file.write(text)
+
+        if cold(fileName, text).error: raise Exception('Corpus does not parse')
+        if astCache.load(fileName, text) is None: raise Exception('Cache was not written')
+
+        noCache = common.best_of(lambda: astCache.parse(fileName, text, False))
+        miss = common.best_of(lambda: cold(fileName, text))
+        hit = common.best_of(lambda: astCache.parse(fileName, text))
+        size = os.path.getsize(astCache.cachePath(fileName))
+    finally:
+        shutil.rmtree(directory)
+
+    common.report(f'{text.count(chr(10)) + 1} lines, {size / 1024:,.0f} KiB cache file', [
+        ('parse, no cache', f'{noCache * 1000:10.1f} ms'),
+        ('miss (parse + store)', f'{miss * 1000:10.1f} ms'),
+        ('hit (load)', f'{hit * 1000:10.1f} ms'),
+        ('hit speedup', f'{noCache / hit:10.2f}x'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,84 @@
+## Calls per second of recursive Orion functions when each call gets a new Interpreter and
+## binds its arguments by name (how calls used to run) against calls on the run's own
+## interpreter with arguments stored straight into their frame slots.
+import io
+import sys
+import contextlib
+import common
+
+import token as Token
+import lexer as Lexer
+import parser as Parser
+import symTable as SymbolTable
+import typeSystem as Type
+import interpreter as Interpreter
+
+PROGRAMS = [
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    else {{ ret fib(n - 1) + fib(n - 2); }}
+}}
+puts fib({0});
+''', 18, lambda n: 2 * fibonacci(n + 1) - 1),
+    ('factorial(20), repeated', common.example('simpleFactorial.orion').replace('{', '{{').replace('}', '}}') + '''
+let i = 0;
+while (i < {0}) {{
+    factorial(20);
+    i++;
+}}
+''', 2000, lambda n: 21 * n + 7),
+]
+
+
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n): a, b = b, a + b
+    return a
+
+
+class PerCallFunction(Type.Function):
+    def execute(self, arguments, parentContext):
+        newContext = self.generate_new_context(parentContext)
+        self.check_args(self.arg_names, arguments, newContext)
+        for name, argument in zip(self.arg_names, arguments):
+            newContext.symbolTable.define(name, SymbolTable.Symbol(Token.cons.LET, argument))
+        interp = Interpreter.Interpreter(self.body, GlobalSymtab = self.symtab.parent)
+        return interp.Interpret(newContext)
+
+class PerCallInterpreter(Interpreter.Interpreter):
+    def function(self, name, args, body, symtab, layout):
+        return PerCallFunction(name, args, body, symtab, layout)
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    sys.setrecursionlimit(10000)
+    rows = []
+    for title, template, size, calls in PROGRAMS:
+        size = size + scale - 1 if 'fib' in title else size * scale
+        result = parse(template.format(size))
+        if run(PerCallInterpreter, result) != run(Interpreter.Interpreter, result):
+            raise Exception(f'{title}: the two ways of calling print different output')
+        count = calls(size)
+        # Taken in turns, so a slow patch of the machine hits both the same
+        oldTime = newTime = None
+        for _ in range(7):
+            old = common.best_of(lambda: run(PerCallInterpreter, result), 1)
+            new = common.best_of(lambda: run(Interpreter.Interpreter, result), 1)
+            oldTime, newTime = min(old, oldTime or old), min(new, newTime or new)
+        rows.append((title, f'{count / oldTime:10,.0f}  {count / newTime:10,.0f}  {oldTime / newTime:6.2f}x'))
+    common.report('calls/s: interpreter per call, one interpreter and slot binding, speedup', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,101 @@
+## Shared helpers for the benchmark scripts in this folder.
+## Run any benchmark from the repository root, e.g. `python3 benchmarks/lexer_bench.py`.
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+import subprocess
+
+# The interpreter ships modules called 'token' and 'ast', which shadow the standard
+# library. Load the stdlib modules that depend on them first, then let the repo win.
+import tracemalloc
+import linecache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, 'examples')
+
+sys.modules.pop('token', None)
+sys.modules.pop('ast', None)
+sys.path.insert(0, ROOT)
+
+
+def example(name):
+    with open(os.path.join(EXAMPLES, name)) as file:
+        return file.read()
+
+def corpus(copies):
+    # Every example program, repeated 'copies' times
+    names = sorted(name for name in os.listdir(EXAMPLES) if name.endswith('.orion'))
+    text = '\n'.join(example(name) for name in names)
+    return '\n'.join([text] * copies)
+
+def best_of(function, repeat = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def report(title, rows):
+    print(title)
+    width = max(len(row[0]) for row in rows)
+    for name, value in rows:
+        print(f'  {name.ljust(width)}  {value}')
+
+
+## Baselines. A benchmark measuring code this repository has since replaced checks the
+## revision before the change out into a temporary git worktree and runs it there, in a
+## Python of its own (the old modules have the same names as the new ones). The code
+## run gets the worktree first on its path, 'best_of', and its data as JSON on stdin,
+## and prints its results as JSON.
+BASELINE_PREAMBLE = '''
+import io, sys, json, time, contextlib, tracemalloc, linecache
+sys.modules.pop('token', None)
+sys.modules.pop('ast', None)
+sys.path.insert(0, sys.argv[1])
+
+def best_of(function, repeat = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+'''
+
+def git(*args):
+    return subprocess.run(['git', '-C', ROOT, *args], check = True, capture_output = True, text = True).stdout
+
+def revisionBefore(subject):
+    # The parent of the commit whose subject starts with 'subject', e.g. '[user-001]'
+    for line in git('log', '--format=%H %s').splitlines():
+        commit, title = line.split(' ', 1)
+        if title.startswith(subject):
+            return commit + '^'
+    raise Exception(f'no commit titled {subject!r} in this repository')
+
+@contextlib.contextmanager
+def worktree(revision):
+    directory = tempfile.mkdtemp(prefix = 'orion-baseline-')
+    git('worktree', 'add', '--detach', directory, revision)
+    try:
+        yield directory
+    finally:
+        git('worktree', 'remove', '--force', directory)
+        shutil.rmtree(directory, ignore_errors = True)
+
+def runBaseline(directory, code, data):
+    # -I keeps the working directory off the path, so the stdlib loads as itself
+    process = subprocess.run([sys.executable, '-I', '-c', BASELINE_PREAMBLE + code, directory],
+                             input = json.dumps(data), capture_output = True, text = True)
+    if process.returncode:
+        raise Exception(f'the baseline failed:\n{process.stderr}')
+    return json.loads(process.stdout)
@@ -0,0 +1,57 @@
+## Nodes visited per second with the cached class -> handler table in NodeVisitor,
+## against the original per-visit 'visit_' + name string and getattr.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+
+
+class LegacyDispatch(Interpreter.Interpreter):
+    def visit(self, node, context):
+        method_name = 'visit_' + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node, context)
+
+class CountingDispatch(Interpreter.Interpreter):
+    visits = 0
+
+    def visit(self, node, context):
+        CountingDispatch.visits += 1
+        return super().visit(node, context)
+
+
+def run(interpreterClass, result):
+    # Function bodies are run by typeSystem.Function through Interpreter.Interpreter,
+    # so the class under test is swapped in for the whole run
+    original = Interpreter.Interpreter
+    Interpreter.Interpreter = interpreterClass
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            interpreterClass(result).Interpret()
+    finally:
+        Interpreter.Interpreter = original
+    return output.getvalue()
+
+def main(size = 3000):
+    text = common.example('fizzbuzz.orion').replace('range(100)', f'range({size})')
+    result = Parser.Parser(Lexer.Lexer('fizzbuzz.orion', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+
+    if run(CountingDispatch, result) != run(LegacyDispatch, result):
+        raise Exception('Dispatch changes the output')
+    visits = CountingDispatch.visits
+    oldTime = common.best_of(lambda: run(LegacyDispatch, result), 7)
+    newTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 7)
+    common.report(f'fizzbuzz over range({size}), {visits} node visits', [
+        ('getattr per visit', f'{visits / oldTime:12,.0f} nodes/s'),
+        ('cached handlers', f'{visits / newTime:12,.0f} nodes/s'),
+        ('speedup', f'{oldTime / newTime:12.2f}x'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,62 @@
+## The closure-compiling engine against the tree walker, on the example programs with
+## their loops scaled up. Both engines must print the same output for every program.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import closureCompiler as ClosureCompiler
+
+ENGINES = [
+    ('tree', Interpreter.Interpreter),
+    ('closure', ClosureCompiler.ClosureInterpreter),
+]
+
+def fizzbuzz(size):
+    return common.example('fizzbuzz.orion').replace('range(100)', f'range({size})')
+
+def factorial(size):
+    return common.example('simpleFactorial.orion') + f'''
+let i = 0;
+while (i < {size}) {{
+    factorial(30);
+    i++;
+}}
+'''
+
+def loops(size):
+    text = common.example('loops&conditionals.orion')
+    return text.replace('count < 10', f'count < {size // 100}').replace('range(10)', f'range({size})')
+
+PROGRAMS = [
+    ('fizzbuzz.orion', fizzbuzz, 5000),
+    ('simpleFactorial.orion', factorial, 500),
+    ('loops&conditionals.orion', loops, 10000),
+]
+
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    sys.setrecursionlimit(10000)
+    rows = []
+    for name, program, size in PROGRAMS:
+        result = Parser.Parser(Lexer.Lexer(name, program(size * scale))).parse()
+        if result.error: raise Exception(result.error.as_string())
+        outputs = [run(engine, result) for title, engine in ENGINES]
+        if outputs[0] != outputs[1]:
+            raise Exception(f'{name}: the engines print different output')
+        treeTime, closureTime = (common.best_of(lambda: run(engine, result), 5) for title, engine in ENGINES)
+        rows.append((name, f'{treeTime * 1000:9.1f} ms  {closureTime * 1000:9.1f} ms  {treeTime / closureTime:6.2f}x'))
+
+    common.report('tree walker, closures, speedup', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,93 @@
+## Parser throughput (AST nodes/s) on expression-heavy input: the precedence-climbing
+## expression parser against the original one-method-per-level recursive descent.
+import sys
+import common
+
+import lexer as Lexer
+import parser as Parser
+import ast
+import token as Token
+
+STATEMENTS = [
+    'let a{0} = (b + {0}) * c - d / 4 % 3 + -e * 2;',
+    'let f{0} = x .. "y" .. z{0} == "xyz" && !g || h < 1 && i >= j;',
+    'let k{0} = l[m + 1] * n(o, p * 2, [1, 2, q - 3]) - #r + s{0};',
+    't{0} = (u + v) * (w - x) / (y % z + 1) - 1 * 2 * 3 * 4 + 5 + 6;',
+    'if (a <= b && c != d || e > f) {{ g = g + {0}; }}',
+]
+
+
+class DescentParser(Parser.Parser):
+    # The expression layer as it was: one method and one ParseResult per level
+    def descent(self, function, operators):
+        res = Parser.ParseResult()
+        node = res.register(function())
+        if res.error: return res
+
+        while self.currentToken.type in operators:
+            op = self.currentToken
+            res.register(self.advance())
+            right = res.register(function())
+            if res.error: return res
+            node = self.operation(node, op, right)
+        return res.success(node)
+
+    def expr(self):
+        return self.descent(self.and_expr, (Token.cons.OR))
+
+    def and_expr(self):
+        return self.descent(self.comp_expr, (Token.cons.AND))
+
+    def comp_expr(self):
+        return self.descent(self.arith_expr, (Token.cons.IN,Token.cons.EQ,Token.cons.NEQ,Token.cons.LT,Token.cons.GT,Token.cons.LTE,Token.cons.GTE))
+
+    def arith_expr(self):
+        return self.descent(self.term, (Token.cons.CONCAT, Token.cons.PLUS, Token.cons.MINUS))
+
+    def term(self):
+        return self.descent(self.factor, (Token.cons.MUL, Token.cons.DIV, Token.cons.MOD))
+
+
+def source(count):
+    return '\n'.join(STATEMENTS[i % len(STATEMENTS)].format(i) for i in range(count))
+
+def parse(parserClass, text):
+    result = parserClass(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result.node
+
+def shape(node):
+    # Nested tuples of node classes, operators and leaf values, for comparing trees
+    if isinstance(node, (list, tuple)):
+        return tuple(shape(item) for item in node)
+    if isinstance(node, Token.Token):
+        return (node.type, node.value)
+    if isinstance(node, ast.Node):
+        return (type(node).__name__,) + tuple(shape(value) for key, value in ast.fields(node)
+                                              if key not in ('declarations', 'scope', 'layout'))
+    return node
+
+def count(node):
+    if isinstance(node, (list, tuple)):
+        return sum(count(item) for item in node)
+    if isinstance(node, ast.Node):
+        return 1 + sum(count(value) for key, value in ast.fields(node))
+    return 0
+
+def main(statements = 20000):
+    text = source(statements)
+    for sample in (text, common.corpus(1)):
+        if shape(parse(Parser.Parser, sample)) != shape(parse(DescentParser, sample)):
+            raise Exception('Parsers disagree on the tree')
+
+    nodes = count(parse(Parser.Parser, text))
+    oldTime = common.best_of(lambda: parse(DescentParser, text))
+    newTime = common.best_of(lambda: parse(Parser.Parser, text))
+    common.report(f'{statements} statements, {nodes} nodes', [
+        ('recursive descent', f'{nodes / oldTime:12,.0f} nodes/s'),
+        ('precedence climbing', f'{nodes / newTime:12,.0f} nodes/s'),
+        ('speedup', f'{oldTime / newTime:12.2f}x'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
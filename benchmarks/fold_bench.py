@@ -0,0 +1,63 @@
+## Constant folding: every example must print the same with and without the optimizer,
+## then a loop full of constant expressions is timed both ways.
+import io
+import os
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import optimizer as Optimizer
+import interpreter as Interpreter
+
+LOOP = '''
+let i, total, text = 0, 0, "";
+while (i < {0}) {{
+    total = total + 60 * 60 * 24 - -1 + 10 / 4;
+    text = ' ' * 5 .. "a|b" - "|";
+    i = i + 1;
+}}
+puts total, text;
+'''
+
+
+def parse(name, text, optimize):
+    result = Parser.Parser(Lexer.Lexer(name, text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    if optimize:
+        result.node = Optimizer.optimize(result.node)
+    return result
+
+def run(result, stdin = ''):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        sys.stdin = io.StringIO(stdin)
+        try:
+            Interpreter.Interpreter(result).Interpret()
+        finally:
+            sys.stdin = sys.__stdin__
+    return output.getvalue()
+
+def main(iterations = 20000):
+    for name in sorted(os.listdir(common.EXAMPLES)):
+        text = common.example(name) if name.endswith('.orion') else ''
+        # Programs drawing random numbers cannot be compared run to run
+        if not text or 'random(' in text: continue
+        if run(parse(name, text, True), '5\n') != run(parse(name, text, False), '5\n'):
+            raise Exception(f'{name}: output changes with constant folding')
+
+    text = LOOP.format(iterations)
+    folded, plain = parse('<bench>', text, True), parse('<bench>', text, False)
+    if run(folded) != run(plain):
+        raise Exception('Loop output changes with constant folding')
+    plainTime = common.best_of(lambda: run(plain))
+    foldedTime = common.best_of(lambda: run(folded))
+    common.report(f'{iterations} loop iterations, examples print the same either way', [
+        ('as parsed', f'{plainTime * 1000:9.1f} ms'),
+        ('constants folded', f'{foldedTime * 1000:9.1f} ms'),
+        ('speedup', f'{plainTime / foldedTime:9.2f}x'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,43 @@
+## Tokens per second of the regex lexer against the original character-at-a-time lexer,
+## run from a worktree of the revision before the rewrite.
+import sys
+import json
+import common
+
+import lexer as Lexer
+
+BASELINE = '''
+import lexer as Lexer
+text = json.load(sys.stdin)
+tokens, error = Lexer.Lexer('<bench>', text).tokenize()
+print(json.dumps({
+    'tokens': [[token.type, token.value] for token in tokens],
+    'time': best_of(lambda: Lexer.Lexer('<bench>', text).tokenize()),
+}))
+'''
+
+
+def run(text):
+    tokens, error = Lexer.Lexer('<bench>', text).tokenize()
+    if error: raise Exception(error.as_string())
+    return tokens
+
+def main(copies = 200):
+    text = common.corpus(copies)
+    new = run(text)
+    with common.worktree(common.revisionBefore('[user-001]')) as directory:
+        old = common.runBaseline(directory, BASELINE, text)
+    if json.loads(json.dumps([[t.type, t.value] for t in new])) != old['tokens']:
+        raise Exception('Lexers disagree on the token stream')
+
+    count = len(new)
+    oldTime = old['time']
+    newTime = common.best_of(lambda: run(text))
+    common.report(f'{text.count(chr(10)) + 1} lines, {count} tokens', [
+        ('legacy lexer', f'{count / oldTime:12,.0f} tokens/s'),
+        ('regex lexer', f'{count / newTime:12,.0f} tokens/s'),
+        ('speedup', f'{oldTime / newTime:12.2f}x'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
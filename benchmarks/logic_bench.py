@@ -0,0 +1,84 @@
+## Short-circuit '&&'/'||' and allocation-free conditions against the way they were run:
+## both operands always evaluated and every condition read through the Number its test
+## made. A guard that skips an expensive call, and loops whose conditions are plain
+## comparisons, on the tree walker. Both must print the same.
+import io
+import sys
+import contextlib
+import common
+
+import token as Token
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+
+PROGRAMS = [
+    ('guarded call', '''
+func slow(n) {{
+    let i = 0;
+    while (i < 50) {{ i++; }}
+    ret n % 7 == 0;
+}}
+let i, hits = 0, 0;
+while (i < {0}) {{
+    if (i % 10 == 0 && slow(i)) {{ hits++; }}
+    i++;
+}}
+puts hits;
+''', 5000),
+    ('comparison conditions', '''
+let i, evens = 0, 0;
+while (i < {0}) {{
+    if (i % 2 == 0) {{ evens++; }}
+    i++;
+}}
+puts evens;
+''', 25000),
+    ('either of two tests', '''
+let i, found = 0, 0;
+while (i < {0}) {{
+    if (i % 3 == 0 || i % 5 == 0) {{ found++; }}
+    i++;
+}}
+puts found;
+''', 25000),
+]
+
+
+class EagerInterpreter(Interpreter.Interpreter):
+    # '&&' and '||' as they were: both operands evaluated, conditions read through a Number
+    def visit_LogicalOpNode(self, node, context):
+        left = self.visit(node.left, context)
+        right = self.visit(node.right, context)
+        value = left.value and right.value if node.op == Token.cons.AND else left.value or right.value
+        return Type.Number(int(value))
+
+    def truth(self, node, context):
+        return bool(self.visit(node, context).value)
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    rows = []
+    for title, template, size in PROGRAMS:
+        result = parse(template.format(size * scale))
+        if run(EagerInterpreter, result) != run(Interpreter.Interpreter, result):
+            raise Exception(f'{title}: the two evaluations print different output')
+        oldTime = common.best_of(lambda: run(EagerInterpreter, result), 3)
+        newTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 3)
+        rows.append((f'{title} ({size * scale:,})', f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+    common.report('eager, short-circuit, speedup', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
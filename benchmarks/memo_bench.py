@@ -0,0 +1,69 @@
+## Memo caches for pure functions (--memo) against plain calls: recursive fib, where
+## the cache turns exponential work into linear, fizzbuzz.orion, whose inline fizz/buzz
+## are called up to three times per number, and a pure function called with arguments
+## that never repeat, which only pays for the cache. Both runs must print the same.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import memo as Memo
+
+PROGRAMS = [
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    ret fib(n - 1) + fib(n - 2);
+}}
+puts fib({0});
+''', 18),
+    ('fizzbuzz.orion', None, 2000),
+    ('no repeated arguments', '''
+func square(n) {{ ret n * n; }}
+let i, total = 0, 0;
+while (i < {0}) {{
+    total += square(i);
+    i++;
+}}
+puts total;
+''', 5000),
+]
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result, size):
+    output = io.StringIO()
+    interp = Interpreter.Interpreter(result)
+    interp.memoSize = size
+    with contextlib.redirect_stdout(output):
+        interp.Interpret()
+    return output.getvalue(), interp
+
+def main(scale = 1):
+    rows, statistics = [], []
+    for title, template, size in PROGRAMS:
+        if template is None:
+            text = common.example(title).replace('range(100)', f'range({size * scale})')
+        else:
+            text = template.format(size * scale if 'fib' not in title else size + scale - 1)
+        result = parse(text)
+        plain, memoized = run(result, None), run(result, Memo.DEFAULT_SIZE)
+        if plain[0] != memoized[0]:
+            raise Exception(f'{title}: memoizing changes the output')
+        oldTime = common.best_of(lambda: run(result, None), 5)
+        newTime = common.best_of(lambda: run(result, Memo.DEFAULT_SIZE), 5)
+        rows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+        for cache in memoized[1].memos.values():
+            statistics.append((f'{title}: {cache.name}', f'{cache.hits:8,} hits  {cache.misses:8,} misses  {cache.evictions:8,} evictions'))
+    common.report(f'plain calls, memo caches of {Memo.DEFAULT_SIZE}, speedup', rows)
+    common.report('memo caches after one run', statistics)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,47 @@
+## Memory taken by the AST of a large generated program: bytes per node and the growth
+## of the process' resident set while the parsed program is alive.
+import gc
+import os
+import sys
+import common
+
+import lexer as Lexer
+import parser as Parser
+from position_bench import retained
+from expr_bench import source, count
+
+
+def rss():
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result.node
+
+def main(statements = 50000):
+    text = source(statements)
+    program, astBytes = retained(lambda: parse(text))
+    nodes = count(program)
+    del program
+    gc.collect()
+
+    before = rss()
+    program = parse(text)
+    gc.collect()
+    grown = rss() - before
+
+    common.report(f'{statements} statements, {nodes} nodes', [
+        ('retained by the AST', f'{astBytes / 2**20:8.1f} MiB'),
+        ('per node', f'{astBytes / nodes:8.1f} B'),
+        ('RSS growth', f'{grown / 2**20:8.1f} MiB'),
+        ('RSS total', f'{rss() / 2**20:8.1f} MiB'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
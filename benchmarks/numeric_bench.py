@@ -0,0 +1,122 @@
+## Lists of numbers packed into Python arrays against the boxed Lists of Numbers they
+## replace: the time of each vectorized operation on a million-item List (the boxed one
+## loops over its Numbers, making one per result) and of packing it the first time, then
+## the time and memory of a pipeline on the tree walker. Both must print the same.
+import io
+import sys
+import contextlib
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+
+OPERATIONS = [
+    ('xs + 7', 'add', 7),
+    ('xs - ys', 'sub', None),
+    ('xs * 3', 'mul', 3),
+    ('xs / 4', 'div', 4),
+    ('xs % 9', 'mod', 9),
+    ('xs < ys', 'compare_lt', None),
+    ('xs * 0.5', 'mul', 0.5),
+]
+PIPELINE = '''
+let xs = range({0});
+let ys = (xs * 3 + 1) % 1000003;
+let flags = ys < 500000;
+puts len(ys);
+puts ys[{0} - 1];
+puts flags[{0} - 1];
+'''
+
+
+def unpacked(self):
+    # What Lists did before: never packed, so every operation goes item by item
+    return None
+
+@contextlib.contextmanager
+def boxed():
+    packed = Type.List.packed
+    Type.List.packed = unpacked
+    try:
+        yield
+    finally:
+        Type.List.packed = packed
+
+@contextlib.contextmanager
+def packed():
+    yield
+
+
+def numbers(size, offset):
+    return Type.List([Type.number(i + offset) for i in range(size)])
+
+def operate(method, left, right):
+    result, error = getattr(left, method)(right)
+    if error: raise Exception(error.as_string())
+    return result
+
+def measureOperation(mode, method, left, right):
+    with mode():
+        # The first operation packs the Lists; the ones timed find them packed
+        output = repr(operate(method, left, right))
+        return output, common.best_of(lambda: operate(method, left, right), 3)
+
+def measurePacking(size):
+    lists = [numbers(size, 0) for i in range(3)]
+    return common.best_of(lambda: lists.pop().packed(), 3)
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result):
+    output = io.StringIO()
+    interp = Interpreter.Interpreter(result)
+    with contextlib.redirect_stdout(output):
+        interp.Interpret()
+    return output.getvalue(), interp
+
+def measurePipeline(mode, result):
+    with mode():
+        output = run(result)[0]
+        elapsed = common.best_of(lambda: run(result), 3)
+        tracemalloc.start()
+        try:
+            interp = run(result)[1]
+            held, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            del interp
+    return output, elapsed, held, peak
+
+def main(scale = 1):
+    size = 1000000 * scale
+    rows = []
+    xs, ys = numbers(size, 0), numbers(size, 1)
+    for title, method, scalar in OPERATIONS:
+        right = ys if scalar is None else Type.number(scalar)
+        oldOutput, oldTime = measureOperation(boxed, method, numbers(size, 0), right)
+        newOutput, newTime = measureOperation(packed, method, xs, right)
+        if oldOutput != newOutput:
+            raise Exception(f'{title}: packing changes the result')
+        rows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+    rows.append(('packing xs, once', f'{"-":>9}     {measurePacking(size) * 1000:9.1f} ms'))
+    common.report(f'{size:,} items: boxed, packed, speedup', rows)
+
+    result = parse(PIPELINE.format(size))
+    oldOutput, oldTime, oldHeld, oldPeak = measurePipeline(boxed, result)
+    newOutput, newTime, newHeld, newPeak = measurePipeline(packed, result)
+    if oldOutput != newOutput:
+        raise Exception('the pipeline prints different output when packed')
+    common.report(f'pipeline over range({size:,}): boxed, packed', [
+        ('time', f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'),
+        ('held at the end', f'{oldHeld / 2**20:9,.1f} MiB {newHeld / 2**20:9,.1f} MiB'),
+        ('peak', f'{oldPeak / 2**20:9,.1f} MiB {newPeak / 2**20:9,.1f} MiB'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
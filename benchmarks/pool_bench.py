@@ -0,0 +1,98 @@
+## Shared small-int and boolean Numbers against a new Number for every result, on the
+## tree walker: time, peak memory and the blocks still held at the end (tracemalloc) of
+## a loop of counters and comparisons and of a program that keeps its results in Lists.
+## Both must print the same.
+import io
+import sys
+import contextlib
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+
+PROGRAMS = [
+    ('counters and comparisons', '''
+let i, count = 0, 0;
+while (i < {0}) {{
+    if (i % 3 == 0 && i != 9) {{ count++; }}
+    i++;
+}}
+puts count;
+''', 20000),
+    ('Lists of results', '''
+let flags, rests = [], [];
+for (let i : range({0})) {{
+    flags = flags .. [i % 2 == 0];
+    rests = rests .. [i % 7];
+}}
+puts len(flags) + len(rests);
+''', 1500),
+]
+
+
+class FreshBooleans:
+    # What comparisons gave before: a new Number each time
+    def __getitem__(self, truth):
+        return Type.Number(int(truth))
+
+@contextlib.contextmanager
+def unpooled():
+    booleans = Type.BOOLEANS
+    Type.smallInts(0, 0)
+    Type.BOOLEANS = FreshBooleans()
+    try:
+        yield
+    finally:
+        Type.BOOLEANS = booleans
+        Type.smallInts(*Type.SMALL_INT_RANGE)
+
+@contextlib.contextmanager
+def pooled():
+    yield
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result):
+    output = io.StringIO()
+    interp = Interpreter.Interpreter(result)
+    with contextlib.redirect_stdout(output):
+        interp.Interpret()
+    return output.getvalue(), interp
+
+def measure(mode, result):
+    with mode():
+        output = run(result)[0]
+        elapsed = common.best_of(lambda: run(result), 3)
+        tracemalloc.start()
+        try:
+            interp = run(result)[1]
+            blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            del interp
+    return output, elapsed, peak, blocks
+
+def main(scale = 1):
+    timeRows, memoryRows = [], []
+    for title, template, size in PROGRAMS:
+        result = parse(template.format(size * scale))
+        oldOutput, oldTime, oldPeak, oldBlocks = measure(unpooled, result)
+        newOutput, newTime, newPeak, newBlocks = measure(pooled, result)
+        if oldOutput != newOutput:
+            raise Exception(f'{title}: pooling changes the output')
+        title = f'{title} ({size * scale:,})'
+        timeRows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+        memoryRows.append((title, f'{oldPeak / 1024:9,.0f} KiB  {newPeak / 1024:9,.0f} KiB  {oldBlocks:9,} blocks  {newBlocks:9,} blocks'))
+    common.report('new Numbers, pooled Numbers, speedup', timeRows)
+    common.report('peak memory and blocks held at the end: new Numbers, pooled Numbers', memoryRows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,48 @@
+## Memory held by tokens and by the parsed AST on a large script. The token list is set
+## against the one the lexer made before positions became source offsets, run from a
+## worktree of that revision.
+import sys
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+
+BASELINE = '''
+import lexer as Lexer
+text = json.load(sys.stdin)
+tracemalloc.start()
+before = tracemalloc.get_traced_memory()[0]
+tokens = Lexer.Lexer('<bench>', text).tokenize()[0]
+after = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+print(json.dumps(after - before))
+'''
+
+
+def retained(build):
+    # Bytes still allocated once 'build' returns, while its result is alive
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def main(copies = 100):
+    text = common.corpus(copies)
+    tokens, newTokens = retained(lambda: Lexer.Lexer('<bench>', text).tokenize()[0])
+    count = len(tokens)
+    del tokens
+    with common.worktree(common.revisionBefore('[user-003]')) as directory:
+        oldTokens = common.runBaseline(directory, BASELINE, text)
+    program, astBytes = retained(lambda: Parser.Parser(Lexer.Lexer('<bench>', text)).parse().node)
+
+    common.report(f'{text.count(chr(10)) + 1} lines, {count} tokens', [
+        ('legacy token list', f'{oldTokens / 2**20:8.1f} MiB  {oldTokens / count:6.0f} B/token'),
+        ('offset token list', f'{newTokens / 2**20:8.1f} MiB  {newTokens / count:6.0f} B/token'),
+        ('parsed program', f'{astBytes / 2**20:8.1f} MiB'),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
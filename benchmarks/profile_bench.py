@@ -0,0 +1,77 @@
+## The cost of --profile: the tree walker against ProfilingInterpreter, which times every
+## statement and call, on a recursive function, a deep non-tail recursion (the cost of a
+## call must not grow with the depth it is made at), a loop of short statements and
+## fizzbuzz.orion. Both must print the same; the profiled run should stay under 2x.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import profiler as Profiler
+
+PROGRAMS = [
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    ret fib(n - 1) + fib(n - 2);
+}}
+puts fib({0});
+''', 20),
+    ('recursion 100 calls deep', '''
+func down(n) {{
+    if (n == 0) {{ ret 0; }}
+    let r = down(n - 1);
+    ret r + 1;
+}}
+let i, total = 0, 0;
+while (i < {0}) {{
+    total += down(100);
+    i++;
+}}
+puts total;
+''', 100),
+    ('loop of short statements', '''
+let i, total = 0, 0;
+while (i < {0}) {{
+    total += i;
+    i++;
+}}
+puts total;
+''', 20000),
+    ('fizzbuzz.orion', None, 1000),
+]
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    # The profiler's own Python frames sit between the tree walker's
+    sys.setrecursionlimit(10000)
+    rows = []
+    for title, template, size in PROGRAMS:
+        if template is None:
+            text = common.example(title).replace('range(100)', f'range({size * scale})')
+        else:
+            text = template.format(size * scale if 'fib' not in title else size + scale - 1)
+        result = parse(text)
+        if run(Interpreter.Interpreter, result) != run(Profiler.ProfilingInterpreter, result):
+            raise Exception(f'{title}: profiling changes the output')
+        plain = common.best_of(lambda: run(Interpreter.Interpreter, result), 3)
+        profiled = common.best_of(lambda: run(Profiler.ProfilingInterpreter, result), 3)
+        rows.append((title, f'{plain * 1000:9.1f} ms  {profiled * 1000:9.1f} ms  {profiled / plain:6.2f}x'))
+    common.report('plain, profiled, overhead', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,81 @@
+## range() as a lazy Range against the List of Numbers it used to build: time and peak
+## memory (tracemalloc) of a 'for' loop over it and of reading one element, on the tree
+## walker. Both must print the same.
+import io
+import sys
+import contextlib
+import tracemalloc
+import common
+
+import token as Token
+import lexer as Lexer
+import parser as Parser
+import symTable as SymbolTable
+import typeSystem as Type
+import interpreter as Interpreter
+
+PROGRAMS = [
+    ('for loop over range', '''
+let total = 0;
+for (let i : range({0})) {{
+    total += i;
+}}
+puts total;
+''', 200000),
+    ('last element of range', '''
+let numbers = range({0});
+puts numbers[len(numbers) - 1];
+''', 1000000),
+]
+
+
+class EagerRange(Type.BuiltInFunction):
+    # range() as it was: every Number made up front, in a List
+    def execute_range(self, exec_ctx):
+        end = exec_ctx.symbolTable.get('end').type
+        return Type.List([Type.Number(i) for i in range(end.value)])
+    execute_range.arg_names = ['end']
+
+class EagerInterpreter(Interpreter.Interpreter):
+    def environment(self, program):
+        symtab = super().environment(program)
+        self.globals.define('range', SymbolTable.Symbol(Token.cons.FUNCTION, EagerRange('range')))
+        return symtab
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def peak(engine, result):
+    tracemalloc.start()
+    try:
+        run(engine, result)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main(scale = 1):
+    timeRows, memoryRows = [], []
+    for title, template, size in PROGRAMS:
+        result = parse(template.format(size * scale))
+        if run(EagerInterpreter, result) != run(Interpreter.Interpreter, result):
+            raise Exception(f'{title}: the two ranges print different output')
+        oldTime = common.best_of(lambda: run(EagerInterpreter, result), 3)
+        newTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 3)
+        oldPeak, newPeak = peak(EagerInterpreter, result), peak(Interpreter.Interpreter, result)
+        title = f'{title} ({size * scale:,})'
+        timeRows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+        memoryRows.append((title, f'{oldPeak / 1024:12,.0f} KiB  {newPeak / 1024:12,.0f} KiB'))
+    common.report('List of Numbers, lazy Range, speedup', timeRows)
+    common.report('peak memory: List of Numbers, lazy Range', memoryRows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
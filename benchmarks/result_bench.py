@@ -0,0 +1,97 @@
+## Runtime errors and 'ret' as exceptions against the RTResult every visit used to return:
+## how many result wrappers a run allocated before (none now) and the time each takes.
+## The RTResult tree walker runs from a worktree of the revision before the change; both
+## must print the same output for every program.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+
+PROGRAMS = [
+    ('while loop, arithmetic', '''
+let i, total = 0, 0;
+while (i < {0}) {{
+    total = total + i * 2 % 7;
+    i++;
+}}
+puts total;
+''', 20000),
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    else {{ ret fib(n - 1) + fib(n - 2); }}
+}}
+puts fib({0});
+''', 16),
+    ('fizzbuzz.orion', None, 2000),
+    ('loops&conditionals.orion', None, 1),
+]
+
+BASELINE = '''
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import visitor
+
+created = 0
+init = visitor.RTResult.__init__
+def counted(self):
+    global created
+    created += 1
+    init(self)
+visitor.RTResult.__init__ = counted
+
+results = []
+for text in json.load(sys.stdin):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    def run():
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            Interpreter.Interpreter(result).Interpret()
+        return output.getvalue()
+    created = 0
+    output = run()
+    results.append({'output': output, 'wrappers': created, 'time': best_of(run, 5)})
+print(json.dumps(results))
+'''
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    texts = []
+    for title, template, size in PROGRAMS:
+        if template is None:
+            texts.append(common.example(title).replace('range(100)', f'range({size * scale})'))
+        else:
+            texts.append(template.format(size * scale if 'fib' not in title else size + scale - 1))
+    with common.worktree(common.revisionBefore('[user-014]')) as directory:
+        baselines = common.runBaseline(directory, BASELINE, texts)
+
+    timeRows, allocationRows = [], []
+    for (title, template, size), text, old in zip(PROGRAMS, texts, baselines):
+        result = parse(text)
+        if old['output'] != run(Interpreter.Interpreter, result):
+            raise Exception(f'{title}: the tree walkers print different output')
+        oldTime = old['time']
+        newTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 5)
+        allocationRows.append((title, f'{old["wrappers"]:12,} -> 0'))
+        timeRows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+    common.report('RTResult objects allocated per run', allocationRows)
+    common.report('RTResult, exceptions, speedup', timeRows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
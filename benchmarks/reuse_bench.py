@@ -0,0 +1,43 @@
+## Parse once, run many: time to run each example N times when it is re-parsed for every
+## run against parsing it once and running the same AST. Every run must print the same.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+
+PROGRAMS = ['dataTypes.orion', 'fizzbuzz.orion', 'helloWorld.orion', 'loops&conditionals.orion',
+            'orionWelcome.orion', 'simpleFactorial.orion']
+
+
+def parse(name, text):
+    result = Parser.Parser(Lexer.Lexer(name, text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Interpreter.Interpreter(result).Interpret()
+    return output.getvalue()
+
+def main(runs = 50):
+    rows = []
+    for name in PROGRAMS:
+        text = common.example(name)
+        program = parse(name, text)
+        outputs = {run(program) for _ in range(3)}
+        if len(outputs) != 1 or outputs != {run(parse(name, text))}:
+            raise Exception(f'{name}: runs of a shared AST printed different output')
+
+        fresh = common.best_of(lambda: [run(parse(name, text)) for _ in range(runs)])
+        shared = common.best_of(lambda: [run(program) for _ in range(runs)])
+        rows.append((name, f'{fresh * 1000:9.1f} ms  {shared * 1000:9.1f} ms  {fresh / shared:6.2f}x'))
+
+    common.report(f'{runs} runs each: parse every run, parse once, saving', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,96 @@
+## Identifier lookup through resolved (layout, slot) pairs and array-backed frames,
+## against the same programs with resolution stripped (dict tables, findSymbol walks).
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import symTable as SymbolTable
+import ast
+
+PROGRAMS = [
+    ('factorial(20), repeated', '''
+func factorial(number) {{
+    if(number == 0) {{
+        ret 1;
+    }}else {{
+        ret number * factorial(number - 1);
+    }}
+}}
+let i, total = 0, 0;
+while (i < {0}) {{
+    total = factorial(20);
+    i = i + 1;
+}}
+puts total;
+''', 200),
+    ('while loop in a function', '''
+func count(n) {{
+    let i, sum = 0, 0;
+    while (i < n) {{
+        sum = sum + i * 2;
+        i = i + 1;
+    }}
+    ret sum;
+}}
+puts count({0});
+''', 20000),
+    ('while loop at top level', '''
+let i, sum = 0, 0;
+while (i < {0}) {{
+    sum = sum + i * 2;
+    i = i + 1;
+}}
+puts sum;
+''', 20000),
+]
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def unresolve(node):
+    # Undo the resolver: no layouts means plain SymbolTables and findSymbol everywhere
+    if isinstance(node, tuple):
+        for item in node: unresolve(item)
+    elif isinstance(node, ast.Node):
+        if isinstance(node, ast.IdentifierNode):
+            node.scope = node.slot = None
+        if isinstance(node, ast.InlineFunctionNode):
+            node.layout = None
+        if isinstance(node, ast.ProgramNode):
+            for name, kind, value in node.declarations.entries:
+                if isinstance(value, SymbolTable.FunctionContext):
+                    value.layout = None
+                    unresolve(value.body)
+        for name, child in ast.fields(node):
+            unresolve(child)
+
+def run(result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Interpreter.Interpreter(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    sys.setrecursionlimit(10000)
+    rows = []
+    for title, template, count in PROGRAMS:
+        text = template.format(count * scale)
+        resolved, dynamic = parse(text), parse(text)
+        unresolve(dynamic.node)
+        if run(resolved) != run(dynamic):
+            raise Exception(f'{title}: resolved and dynamic lookups disagree')
+        dynamicTime = common.best_of(lambda: run(dynamic), 7)
+        resolvedTime = common.best_of(lambda: run(resolved), 7)
+        rows.append((title, f'{dynamicTime * 1000:9.1f} ms  {resolvedTime * 1000:9.1f} ms  {dynamicTime / resolvedTime:6.2f}x'))
+
+    common.report('dynamic lookup, resolved slots, speedup', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
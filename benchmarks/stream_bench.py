@@ -0,0 +1,39 @@
+## Peak memory and time-to-first-token of lazy (streaming) against eager parsing.
+import sys
+import time
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+
+
+def parse(text, lazy):
+    parser = Parser.Parser(Lexer.Lexer('<bench>', text), lazy = lazy)
+    result = parser.parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result.node
+
+def peak(text, lazy):
+    tracemalloc.start()
+    node = parse(text, lazy)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def first_token(text, lazy):
+    start = time.perf_counter()
+    Parser.Parser(Lexer.Lexer('<bench>', text), lazy = lazy)
+    return time.perf_counter() - start
+
+def main(copies = 100):
+    text = common.corpus(copies)
+    rows = []
+    for name, lazy in (('eager', False), ('lazy', True)):
+        rows.append((f'{name} peak memory', f'{peak(text, lazy) / 2**20:10.1f} MiB'))
+        rows.append((f'{name} first token', f'{first_token(text, lazy) * 1000:10.2f} ms'))
+        rows.append((f'{name} full parse', f'{common.best_of(lambda: parse(text, lazy)):10.2f} s'))
+    common.report(f'{text.count(chr(10)) + 1} lines', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
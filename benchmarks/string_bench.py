@@ -0,0 +1,91 @@
+## Ropes against a new Python string for every '..': the time to build a string a piece
+## at a time on the tree walker, then to index, measure and print it, and the peak memory
+## of the build (tracemalloc). The flat build copies everything so far on each step, so
+## it only runs up to a few MB; the rope build goes on to 10 MB. Both must print the same.
+import io
+import sys
+import contextlib
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+
+PIECE = 1000
+BUILD = '''
+let piece, text, i = "{1}", "", 0;
+while (i < {0}) {{
+    text = text .. piece;
+    i++;
+}}
+puts #text;
+puts text[#text - 1] .. text[0];
+'''
+SIZES = [1, 2, 4, 10]
+FLAT_SIZES = 4
+
+
+def flatJoined(self, piece):
+    # What '..' did before: a new Python string every time
+    return Type.String(self.value + piece)
+
+@contextlib.contextmanager
+def flat():
+    joined = Type.String.joined
+    Type.String.joined = flatJoined
+    try:
+        yield
+    finally:
+        Type.String.joined = joined
+
+@contextlib.contextmanager
+def rope():
+    yield
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        Interpreter.Interpreter(result).Interpret()
+    return output.getvalue()
+
+def measure(mode, result):
+    with mode():
+        output = run(result)
+        elapsed = common.best_of(lambda: run(result), 3)
+        tracemalloc.start()
+        try:
+            run(result)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return output, elapsed, peak
+
+def main(scale = 1):
+    timeRows, memoryRows = [], []
+    for megabytes in SIZES:
+        pieces = megabytes * scale * 1000
+        result = parse(BUILD.format(pieces, 'x' * (PIECE - 1) + 'y'))
+        newOutput, newTime, newPeak = measure(rope, result)
+        title = f'{megabytes * scale} MB in {pieces:,} pieces'
+        if megabytes <= FLAT_SIZES:
+            oldOutput, oldTime, oldPeak = measure(flat, result)
+            if oldOutput != newOutput:
+                raise Exception(f'{title}: ropes change the output')
+            timeRows.append((title, f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'))
+            memoryRows.append((title, f'{oldPeak / 2**20:9,.1f} MiB  {newPeak / 2**20:9,.1f} MiB'))
+        else:
+            timeRows.append((title, f'{"-":>9}     {newTime * 1000:9.1f} ms  {"-":>6}'))
+            memoryRows.append((title, f'{"-":>9}      {newPeak / 2**20:9,.1f} MiB'))
+    common.report('flat strings, ropes, speedup', timeRows)
+    common.report('peak memory of a build: flat strings, ropes', memoryRows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
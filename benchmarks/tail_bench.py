@@ -0,0 +1,108 @@
+## Self tail calls ('ret f(...)' inside f) run as loops in the frame the call already has:
+## an accumulator-style recursion a million calls deep on every engine, checked against
+## its known result, then its peak memory at growing depths (flat) and how deep the same
+## program gets with the tail calls left unmarked.
+import io
+import sys
+import time
+import contextlib
+import tracemalloc
+import common
+
+import ast
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import closureCompiler as ClosureCompiler
+import virtualMachine as VirtualMachine
+import transpiler as Transpiler
+
+SUM = '''
+func sum(n, total) {{
+    if (n == 0) {{ ret total; }}
+    ret sum(n - 1, total + n);
+}}
+puts sum({0}, 0);
+'''
+
+def python(result):
+    interp = Transpiler.PythonInterpreter(result)
+    interp.useCache = False
+    return interp
+
+ENGINES = [
+    ('tree walker', Interpreter.Interpreter),
+    ('closures', ClosureCompiler.ClosureInterpreter),
+    ('bytecode VM', VirtualMachine.VMInterpreter),
+    ('Python', python),
+]
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def untail(node):
+    # Clears every tail mark the resolver set, so each 'ret f(...)' is an ordinary call
+    if isinstance(node, tuple):
+        for item in node: untail(item)
+    elif isinstance(node, ast.Node):
+        if isinstance(node, ast.ReturnNode): node.tail = False
+        for name, child in ast.fields(node): untail(child)
+
+def peak(engine, depth):
+    result = parse(SUM.format(depth))
+    tracemalloc.start()
+    try:
+        run(engine, result)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def deepest(engine, limit):
+    depth, reached = 1000, 'none'
+    while depth <= limit:
+        result = parse(SUM.format(depth))
+        for statement in result.node.declarations.entries:
+            untail(statement[2].body)
+        try:
+            if run(engine, result).strip() != str(depth * (depth + 1) // 2):
+                break
+        except RecursionError:
+            break
+        reached = f'{depth:,}'
+        depth *= 10
+    return reached
+
+def main(scale = 1):
+    sys.setrecursionlimit(10000)
+    depth = 1000000 * scale
+    result = parse(SUM.format(depth))
+    expected = str(depth * (depth + 1) // 2)
+    rows = []
+    for title, engine in ENGINES:
+        # One run each: at this depth it is both the check and the timing
+        start = time.perf_counter()
+        output = run(engine, result).strip()
+        elapsed = time.perf_counter() - start
+        if output != expected:
+            raise Exception(f'{title}: sum({depth}) printed {output!r}, not {expected}')
+        rows.append((title, f'{elapsed:7.2f} s  {depth / elapsed:10,.0f} calls/s'))
+    common.report(f'sum({depth:,}, 0) through {depth:,} tail calls', rows)
+
+    common.report('tree walker peak memory, by depth', [
+        (f'{n:,} calls', f'{peak(Interpreter.Interpreter, n) / 1024:8.1f} KiB') for n in (1000, 10000, 100000)
+    ])
+    common.report(f'deepest without tail calls (Python recursion limit {sys.getrecursionlimit()})', [
+        (title, deepest(engine, depth)) for title, engine in ENGINES
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,84 @@
+## The Python transpiler (--engine python) against the tree walker, then what the code
+## cache saves: transpiling and compiling a program cold against loading it from disk.
+import io
+import os
+import sys
+import shutil
+import tempfile
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import transpiler as Transpiler
+
+PROGRAMS = [
+    ('while loop, arithmetic', '''
+let i, total = 0, 0;
+while (i < {0}) {{
+    total = total + i * 2 % 7;
+    i++;
+}}
+puts total;
+''', 50000),
+    ('for loop over range', '''
+let total = 0;
+for (let i : range({0})) {{
+    total += i;
+}}
+puts total;
+''', 50000),
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    else {{ ret fib(n - 1) + fib(n - 2); }}
+}}
+puts fib({0});
+''', 18),
+]
+
+
+def parse(fileName, text):
+    result = Parser.Parser(Lexer.Lexer(fileName, text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    directory = tempfile.mkdtemp()
+    try:
+        rows = []
+        for title, template, size in PROGRAMS:
+            text = template.format(size * scale if 'fib' not in title else size + scale - 1)
+            result = parse(os.path.join(directory, 'bench.orion'), text)
+            if run(Interpreter.Interpreter, result) != run(Transpiler.PythonInterpreter, result):
+                raise Exception(f'{title}: the transpiled program prints different output')
+            treeTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 5)
+            pythonTime = common.best_of(lambda: run(Transpiler.PythonInterpreter, result), 5)
+            rows.append((title, f'{treeTime * 1000:9.1f} ms  {pythonTime * 1000:9.1f} ms  {treeTime / pythonTime:6.2f}x'))
+        common.report('tree walker, transpiled to Python, speedup', rows)
+
+        text = common.corpus(4 * scale)
+        program = parse(os.path.join(directory, 'corpus.orion'), text).node
+        cacheDir = os.path.join(directory, '__orioncache__')
+        def cold():
+            shutil.rmtree(cacheDir, ignore_errors = True)
+            Transpiler.compileProgram(program)
+        cold()
+        coldTime = common.best_of(cold, 5)
+        warmTime = common.best_of(lambda: Transpiler.compileProgram(program), 5)
+        common.report(f'code for every example x{4 * scale} ({len(text):,} characters)', [
+            ('transpile + compile', f'{coldTime * 1000:9.2f} ms'),
+            ('load from the cache', f'{warmTime * 1000:9.2f} ms  ({coldTime / warmTime:.1f}x faster)'),
+        ])
+    finally:
+        shutil.rmtree(directory, ignore_errors = True)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,128 @@
+## Slotted Values against the dict-backed ones they replaced, which worked out their
+## length up front and were given a context and a position after every operation: the
+## cost of one arithmetic step and the memory of 100,000 Numbers, then operations per
+## second of an arithmetic loop on every engine.
+import io
+import sys
+import contextlib
+import tracemalloc
+import common
+
+import lexer as Lexer
+import parser as Parser
+import typeSystem as Type
+import interpreter as Interpreter
+import closureCompiler as ClosureCompiler
+import virtualMachine as VirtualMachine
+import transpiler as Transpiler
+
+# Five operations per iteration: *, +, %, < and the ++
+LOOP = '''
+let i, total = 0, 0;
+while (i < {0}) {{
+    total = (total + i * 3) % 1000003;
+    i++;
+}}
+puts total;
+'''
+OPERATIONS = 5
+
+
+class LegacyNumber:
+    # Number as it was
+    def __init__(self, value):
+        self.value = value
+        self.setPosition()
+        self.setContext()
+        if type(self.value) == float:
+            self.length = len(str(self.value)) - 1
+        else:
+            self.length = len(str(self.value))
+
+    def setPosition(self, span = None):
+        self.span = span
+        return self
+
+    def setContext(self, context = None):
+        self.context = context
+        return self
+
+    def add(self, other):
+        return LegacyNumber(self.value + other.value).setContext(self.context), None
+
+    def mul(self, other):
+        return LegacyNumber(self.value * other.value).setContext(self.context), None
+
+
+def legacySteps(count):
+    total, three = LegacyNumber(0).setContext(None).setPosition(None), LegacyNumber(3)
+    for i in range(count):
+        product, error = LegacyNumber(i).setContext(None).setPosition(None).mul(three)
+        product.setPosition(None)
+        total, error = total.add(product)
+        total.setPosition(None)
+    return total.value
+
+def steps(count):
+    total, three = Type.Number(0), Type.Number(3)
+    for i in range(count):
+        product, error = Type.Number(i).mul(three)
+        total, error = total.add(product)
+    return total.value
+
+def held(kind, count):
+    tracemalloc.start()
+    try:
+        numbers = [kind(i) for i in range(count)]
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def python(result):
+    interp = Transpiler.PythonInterpreter(result)
+    interp.useCache = False
+    return interp
+
+ENGINES = [
+    ('tree walker', Interpreter.Interpreter),
+    ('closures', ClosureCompiler.ClosureInterpreter),
+    ('bytecode VM', VirtualMachine.VMInterpreter),
+    ('Python', python),
+]
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def main(scale = 1):
+    count = 100000 * scale
+    if legacySteps(count) != steps(count):
+        raise Exception('the two Numbers add up differently')
+    oldTime = common.best_of(lambda: legacySteps(count), 3)
+    newTime = common.best_of(lambda: steps(count), 3)
+    common.report('dict-backed Numbers, slotted Numbers, speedup', [
+        (f'{count:,} steps of one * and one +', f'{oldTime * 1000:9.1f} ms  {newTime * 1000:9.1f} ms  {oldTime / newTime:6.2f}x'),
+        (f'{count:,} Numbers held', f'{held(LegacyNumber, count) / 1024:9,.0f} KiB  {held(Type.Number, count) / 1024:9,.0f} KiB'),
+    ])
+
+    size = 20000 * scale
+    result = parse(LOOP.format(size))
+    expected = run(Interpreter.Interpreter, result)
+    rows = []
+    for title, engine in ENGINES:
+        if run(engine, result) != expected:
+            raise Exception(f'{title}: the loop prints different output')
+        elapsed = common.best_of(lambda: run(engine, result), 3)
+        rows.append((title, f'{size * OPERATIONS / elapsed:12,.0f} ops/s'))
+    common.report(f'arithmetic loop, {size:,} iterations of {OPERATIONS} operations', rows)
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,94 @@
+## The bytecode VM against the tree walker on numeric loops, recursion and fizzbuzz,
+## then the deepest recursion each engine survives.
+import io
+import sys
+import contextlib
+import common
+
+import lexer as Lexer
+import parser as Parser
+import interpreter as Interpreter
+import virtualMachine as VirtualMachine
+
+PROGRAMS = [
+    ('while loop, arithmetic', '''
+let i, total = 0, 0;
+while (i < {0}) {{
+    total = total + i * 2 % 7;
+    i++;
+}}
+puts total;
+''', 50000),
+    ('for loop over range', '''
+let total = 0;
+for (let i : range({0})) {{
+    total += i;
+}}
+puts total;
+''', 50000),
+    ('recursive fib', '''
+func fib(n) {{
+    if (n < 2) {{ ret n; }}
+    else {{ ret fib(n - 1) + fib(n - 2); }}
+}}
+puts fib({0});
+''', 18),
+    ('fizzbuzz.orion', None, 5000),
+]
+
+DEEP = '''
+func down(n) {{
+    if (n == 0) {{ ret 0; }}
+    else {{ ret 1 + down(n - 1); }}
+}}
+puts down({0});
+'''
+
+
+def parse(text):
+    result = Parser.Parser(Lexer.Lexer('<bench>', text)).parse()
+    if result.error: raise Exception(result.error.as_string())
+    return result
+
+def run(engine, result):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        engine(result).Interpret()
+    return output.getvalue()
+
+def deepest(engine, limit = 256000):
+    # Doubles the depth until the engine fails or 'limit' is reached
+    depth, reached = 1000, 'none'
+    while depth <= limit:
+        try:
+            if run(engine, parse(DEEP.format(depth))).strip() != str(depth):
+                break
+        except RecursionError:
+            break
+        reached = f'{depth:,}' + (' (the most tried)' if depth == limit else '')
+        depth *= 2
+    return reached
+
+def main(scale = 1):
+    sys.setrecursionlimit(10000)
+    rows = []
+    for title, template, size in PROGRAMS:
+        if template is None:
+            text = common.example('fizzbuzz.orion').replace('range(100)', f'range({size * scale})')
+        else:
+            text = template.format(size * scale if 'fib' not in title else size + scale - 1)
+        result = parse(text)
+        if run(Interpreter.Interpreter, result) != run(VirtualMachine.VMInterpreter, result):
+            raise Exception(f'{title}: the VM prints different output')
+        treeTime = common.best_of(lambda: run(Interpreter.Interpreter, result), 5)
+        vmTime = common.best_of(lambda: run(VirtualMachine.VMInterpreter, result), 5)
+        rows.append((title, f'{treeTime * 1000:9.1f} ms  {vmTime * 1000:9.1f} ms  {treeTime / vmTime:6.2f}x'))
+    common.report('tree walker, bytecode VM, speedup', rows)
+
+    common.report(f'deepest recursion (Python recursion limit {sys.getrecursionlimit()})', [
+        ('tree walker', deepest(Interpreter.Interpreter)),
+        ('bytecode VM', deepest(VirtualMachine.VMInterpreter)),
+    ])
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,298 @@
+import token as Token
+import symTable as SymbolTable
+import ast
+import optimizer as Optimizer
+
+## Linear bytecode for virtualMachine.VM. A CodeObject is a flat list of (opcode,
+## argument) int pairs plus a constant table; most arguments index that table, which
+## holds the nodes and method names an instruction needs. Every statement and every
+## expression leaves exactly one value on the stack (None for statements), so a block's
+## value is whatever its last statement left, like visit_BlockStatementNode's.
+
+LOAD_NUMBER   = 0   # consts[arg] is a NumberNode/ConstantNode; push a new Number
+LOAD_STRING   = 1   # consts[arg] is a LiteralNode/ConstantNode; push a new String
+LOAD_NAME     = 2   # consts[arg] is an IdentifierNode; push what it names
+LOAD_NONE     = 3   # push None
+POP           = 4   # drop the top of the stack
+BINARY_OP     = 5   # consts[arg] is (method, node); pop right and left, push the result
+UNARY_OP      = 6   # consts[arg] is (operation, node); replace the top with its result
+DEFINE        = 7   # consts[arg] is (name, kind); pop a value and define it in the scope
+ASSIGN        = 8   # consts[arg] is (name, method or None, node); pop right and left, update name
+UPDATE        = 9   # consts[arg] is (name, method, node); pop the value, update name by one
+BUILD_LIST    = 10  # consts[arg] is (count, node); pop that many values, push a List
+MEMBER        = 11  # consts[arg] is a MemberExpressionNode; pop index and value, push the item
+PUTS          = 12  # pop arg values and print them
+MAKE_FUNCTION = 13  # consts[arg] is an InlineFunctionNode; push a new Function
+CALL          = 14  # consts[arg] is (count, node); pop the arguments and the callee, push the result
+JUMP          = 15  # continue at arg
+JUMP_IF_FALSE = 16  # pop a value, continue at arg if its .value is false
+GET_ITER      = 17  # replace the top with an iterator over its elements() (a Range's Python range)
+FOR_ITER      = 18  # push the iterator's next item, or pop it and continue at arg
+STORE_ITEM    = 19  # consts[arg] is (name, node); pop a loop item and update the loop variable
+RETURN        = 20  # pop a value and hand it to the caller; ends the code object
+FALLBACK      = 21  # consts[arg] is a node; push what the tree walker evaluates it to
+TAIL_CALL     = 22  # CALL, but a call of the running function starts its code over in the same frame
+
+## Opcode -> name, for the disassembler
+OPNAMES = {value: name for name, value in list(globals().items()) if name.isupper() and type(value) is int}
+
+## Instructions that take a jump target rather than a constant
+JUMPS = (JUMP, JUMP_IF_FALSE, FOR_ITER)
+
+
+class CodeObject:
+    __slots__ = ('name', 'instructions', 'consts', 'nodes')
+
+    def __init__(self, name):
+        self.name = name
+        self.instructions = []
+        self.consts = []
+        # The node each instruction was compiled from, for the disassembler
+        self.nodes = []
+
+    def emit(self, opcode, argument, node):
+        self.instructions.append(opcode)
+        self.instructions.append(argument)
+        self.nodes.append(node)
+        return len(self.instructions) - 2
+
+    def const(self, value):
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def here(self):
+        return len(self.instructions)
+
+    def patch(self, offset, target):
+        self.instructions[offset + 1] = target
+
+
+class Compiler:
+    def __init__(self):
+        # id(node) -> (node, CodeObject); holding on to the node keeps its id from being reused
+        self.codes = {}
+
+    def code(self, node, name):
+        # The code object running 'node' and returning its value: a program, a function
+        # body or a hoisted init node. Each node is compiled once.
+        entry = self.codes.get(id(node))
+        if entry is None:
+            code = CodeObject(name)
+            self.compile(node, code)
+            if isinstance(node, ast.ProgramNode):
+                code.emit(LOAD_NONE, 0, node)
+            code.emit(RETURN, 0, node)
+            entry = self.codes[id(node)] = (node, code)
+        return entry[1]
+
+    def compile(self, node, code):
+        method = getattr(self, 'compile_' + type(node).__name__, self.fallback)
+        method(node, code)
+
+    def fallback(self, node, code):
+        code.emit(FALLBACK, code.const(node), node)
+
+    ## STATEMENTS
+    def compile_ProgramNode(self, node, code):
+        for statement in node.statements:
+            self.compile(statement, code)
+            code.emit(POP, 0, statement)
+
+    def compile_BlockStatementNode(self, node, code):
+        if not node.body:
+            return code.emit(LOAD_NONE, 0, node)
+        for index, statement in enumerate(node.body):
+            if index:
+                code.emit(POP, 0, statement)
+            self.compile(statement, code)
+            if isinstance(statement, ast.ReturnNode): break
+
+    def compile_ReturnNode(self, node, code):
+        # Leaves the function (or the program) from wherever the 'ret' is
+        if node.tail:
+            self.compile_CallExpressionNode(node.expr, code, TAIL_CALL)
+        else:
+            self.compile(node.expr, code)
+        code.emit(RETURN, 0, node)
+
+    def compile_IfStatementNode(self, node, code):
+        tests = self.condition(node.test, code)
+        self.compile(node.body, code)
+        end = code.emit(JUMP, 0, node)
+        for test in tests:
+            code.patch(test, code.here())
+        if node.alternative is not None:
+            self.compile(node.alternative, code)
+        else:
+            code.emit(LOAD_NONE, 0, node)
+        code.patch(end, code.here())
+
+    def compile_WhileStatementNode(self, node, code):
+        if node.test is None:
+            return self.fallback(node, code)
+        start = code.here()
+        tests = self.condition(node.test, code)
+        self.compile(node.body, code)
+        code.emit(POP, 0, node)
+        code.emit(JUMP, start, node)
+        for test in tests:
+            code.patch(test, code.here())
+        code.emit(LOAD_NONE, 0, node)
+
+    def compile_ForStatementNode(self, node, code):
+        name = node.init.variableDeclarators[0].identifier.name
+        self.compile(node.test, code)
+        code.emit(GET_ITER, 0, node)
+        start = code.emit(FOR_ITER, 0, node)
+        code.emit(STORE_ITEM, code.const((name, node)), node)
+        self.compile(node.body, code)
+        code.emit(POP, 0, node)
+        code.emit(JUMP, start, node)
+        code.patch(start, code.here())
+        code.emit(LOAD_NONE, 0, node)
+
+    def compile_VariableDeclarationNode(self, node, code):
+        for declarator in node.variableDeclarators:
+            self.compile(declarator.init, code)
+            code.emit(DEFINE, code.const((declarator.identifier.name, node.kind)), declarator)
+        code.emit(LOAD_NONE, 0, node)
+
+    def compile_PutStatementNode(self, node, code):
+        for argument in node.arguments:
+            self.compile(argument, code)
+        code.emit(PUTS, len(node.arguments), node)
+
+    def compile_AssignmentExpressionNode(self, node, code):
+        if node.op != Token.cons.ASSIGN and node.op not in Optimizer.ASSIGNMENT:
+            return self.fallback(node, code)
+        self.compile(node.left, code)
+        self.compile(node.right, code)
+        code.emit(ASSIGN, code.const((node.left.name, Optimizer.ASSIGNMENT.get(node.op), node)), node)
+
+    def compile_UpdateExpressionNode(self, node, code):
+        if node.operator not in (Token.cons.INC, Token.cons.DEC):
+            return self.fallback(node, code)
+        self.compile(node.argument, code)
+        method = 'add' if node.operator == Token.cons.INC else 'sub'
+        code.emit(UPDATE, code.const((node.argument.name, method, node)), node)
+
+    ## EXPRESSIONS
+    def compile_IdentifierNode(self, node, code):
+        code.emit(LOAD_NAME, code.const(node), node)
+
+    def compile_NumberNode(self, node, code):
+        code.emit(LOAD_NUMBER, code.const(node), node)
+
+    def compile_LiteralNode(self, node, code):
+        code.emit(LOAD_STRING, code.const(node), node)
+
+    def compile_ConstantNode(self, node, code):
+        code.emit(LOAD_STRING if type(node.value) == str else LOAD_NUMBER, code.const(node), node)
+
+    def compile_ListExpressionNode(self, node, code):
+        for element in node.elements:
+            self.compile(element, code)
+        code.emit(BUILD_LIST, code.const((len(node.elements), node)), node)
+
+    def compile_MemberExpressionNode(self, node, code):
+        self.compile(node.identifier, code)
+        self.compile(node.property, code)
+        code.emit(MEMBER, code.const(node), node)
+
+    def compile_UnaryOpNode(self, node, code):
+        if node.op not in Optimizer.UNARY:
+            return self.fallback(node, code)
+        self.compile(node.expr, code)
+        code.emit(UNARY_OP, code.const((Optimizer.UNARY[node.op], node)), node)
+
+    def compile_BinOpNode(self, node, code):
+        if node.op not in Optimizer.BINARY:
+            return self.fallback(node, code)
+        self.compile(node.left, code)
+        self.compile(node.right, code)
+        code.emit(BINARY_OP, code.const((Optimizer.BINARY[node.op], node)), node)
+
+    def compile_LogicalOpNode(self, node, code):
+        tests = self.condition(node, code)
+        code.emit(LOAD_NUMBER, code.const(ast.ConstantNode(1, node)), node)
+        end = code.emit(JUMP, 0, node)
+        for test in tests:
+            code.patch(test, code.here())
+        code.emit(LOAD_NUMBER, code.const(ast.ConstantNode(0, node)), node)
+        code.patch(end, code.here())
+
+    def condition(self, node, code):
+        # Falls through when 'node' is true; returns the jumps taken when it is false, for
+        # the caller to patch. '&&' and '||' jump on each operand rather than push a Number
+        if type(node) is not ast.LogicalOpNode:
+            self.compile(node, code)
+            return [code.emit(JUMP_IF_FALSE, 0, node)]
+        tests = self.condition(node.left, code)
+        if node.op == Token.cons.AND:
+            return tests + self.condition(node.right, code)
+        # A true left operand of '||' skips the right one
+        skip = code.emit(JUMP, 0, node)
+        for test in tests:
+            code.patch(test, code.here())
+        tests = self.condition(node.right, code)
+        code.patch(skip, code.here())
+        return tests
+
+    def compile_InlineFunctionNode(self, node, code):
+        code.emit(MAKE_FUNCTION, code.const(node), node)
+
+    def compile_CallExpressionNode(self, node, code, opcode = CALL):
+        self.compile(node.callee, code)
+        for argument in node.arguments:
+            self.compile(argument, code)
+        code.emit(opcode, code.const((len(node.arguments), node)), node)
+
+
+def describe(opcode, argument, code):
+    # What the disassembler prints after an instruction's argument
+    if opcode in JUMPS or opcode in (LOAD_NONE, POP, GET_ITER, RETURN, PUTS):
+        return ''
+    const = code.consts[argument]
+    if opcode == LOAD_NAME:
+        where = 'global' if const.scope is None else ('local' if const.slot is not None else 'dynamic')
+        return f'{const.name} ({where})'
+    if opcode in (LOAD_NUMBER, LOAD_STRING):
+        return repr(const.value)
+    if opcode in (BINARY_OP, UNARY_OP):
+        return const[1].op
+    if opcode == DEFINE:
+        return f'{const[0]} ({const[1].type})'
+    if opcode == ASSIGN:
+        return f'{const[0]} ({const[2].op})'
+    if opcode == UPDATE:
+        return f'{const[0]} ({const[2].operator})'
+    if opcode == STORE_ITEM:
+        return const[0]
+    if opcode == BUILD_LIST:
+        return f'{const[0]} items'
+    if opcode == CALL or opcode == TAIL_CALL:
+        return f'{const[0]} arguments'
+    if opcode == MAKE_FUNCTION:
+        return f'<inline {const.name or "function"}>'
+    return type(const).__name__
+
+def disassemble(code):
+    lines = [f'Disassembly of {code.name}:']
+    for offset in range(0, len(code.instructions), 2):
+        opcode, argument = code.instructions[offset], code.instructions[offset + 1]
+        node = code.nodes[offset // 2]
+        line = str(node.pos_start.line) if node is not None and node.source is not None else ''
+        lines.append(f'{line:>5}  {offset:>5}  {OPNAMES[opcode]:<14} {argument:>4}  {describe(opcode, argument, code)}'.rstrip())
+    return '\n'.join(lines)
+
+def disassembleProgram(program, compiler = None):
+    # The program followed by every function it declares, nested ones included
+    compiler = compiler or Compiler()
+    sections = [disassemble(compiler.code(program, '<main>'))]
+    pending = [program.declarations]
+    while pending:
+        for name, kind, value in pending.pop(0).entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                sections.append(disassemble(compiler.code(value.body, value.name)))
+                pending.append(value.symtab)
+    return '\n\n'.join(sections)
@@ -0,0 +1,369 @@
+import visitor
+import token as Token
+import typeSystem as Type
+import errors as Error
+import symTable as SymbolTable
+import interpreter as Interpreter
+import ast
+from optimizer import BINARY, UNARY, ASSIGNMENT, COMPARISON
+
+## An alternative to the tree walker: every node is turned into a Python closure once,
+## with its fields, child closures and operator already looked up, and running the
+## program is calling the closure of the ProgramNode. A closure returns the value the
+## visit_* method would return and raises what it would raise: Error.Failure for an
+## Orion runtime error, visitor.Return for 'ret'. Anything that has no closure of its own
+## here is handed to the tree walker, so both engines print exactly the same output.
+
+
+class Compiler:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        # id(node) -> (node, closure); holding on to the node keeps its id from being reused
+        self.closures = {}
+
+    def compile(self, node):
+        entry = self.closures.get(id(node))
+        if entry is None:
+            method = getattr(self, 'compile_' + type(node).__name__, self.fallback)
+            entry = self.closures[id(node)] = (node, method(node))
+        return entry[1]
+
+    def evaluate(self, node, context):
+        return self.compile(node)(context)
+
+    def fallback(self, node):
+        interpreter = self.interpreter
+        def run(context):
+            interpreter.symtab = context.symbolTable
+            return interpreter.visit(node, context)
+        return run
+
+    ## STATEMENTS
+    def compile_ProgramNode(self, node):
+        statements = [self.compile(statement) for statement in node.statements]
+        def run(context):
+            for statement in statements:
+                statement(context)
+        return run
+
+    def compile_BlockStatementNode(self, node):
+        statements = []
+        for statement in node.body:
+            statements.append(self.compile(statement))
+            # Whatever follows a 'ret' in the same block never runs
+            if isinstance(statement, ast.ReturnNode): break
+        def run(context):
+            value = None
+            for statement in statements:
+                value = statement(context)
+            return value
+        return run
+
+    def compile_ReturnNode(self, node):
+        if node.tail:
+            call = node.expr
+            callee = self.compile(call.callee)
+            arguments = [self.compile(argument) for argument in call.arguments]
+            def run(context):
+                function = callee(context)
+                args = [argument(context) for argument in arguments]
+                if function is context.function:
+                    raise visitor.TailCall(args)
+                function.setPosition(call)
+                raise visitor.Return(function.execute(args, context))
+            return run
+        expr = self.compile(node.expr)
+        def run(context):
+            raise visitor.Return(expr(context))
+        return run
+
+    def compile_IfStatementNode(self, node):
+        test, body = self.condition(node.test), self.compile(node.body)
+        alternative = self.compile(node.alternative) if node.alternative is not None else None
+        def run(context):
+            if test(context):
+                return body(context)
+            elif alternative is not None:
+                return alternative(context)
+        return run
+
+    def compile_WhileStatementNode(self, node):
+        if node.test is None:
+            return self.fallback(node)
+        test, body = self.condition(node.test), self.compile(node.body)
+        def run(context):
+            while test(context):
+                body(context)
+        return run
+
+    def compile_ForStatementNode(self, node):
+        name = node.init.variableDeclarators[0].identifier.name
+        test, body = self.compile(node.test), self.compile(node.body)
+        def run(context):
+            items = test(context)
+            if type(items) is Type.Range:
+                symtab = context.symbolTable
+                for i in items.value.range:
+                    symtab.update(name, Type.number(i), context, node)
+                    body(context)
+                return
+            for i in items.elements():
+                if isinstance(i, Type.String):
+                    iterator = Type.String(i.value)
+                elif isinstance(i, Type.List):
+                    iterator = Type.List(i.value)
+                elif type(i) == str:
+                    iterator = Type.String(i)
+                else:
+                    iterator = Type.number(i.value)
+                context.symbolTable.update(name, iterator, context, node)
+                body(context)
+        return run
+
+    def compile_VariableDeclarationNode(self, node):
+        kind = node.kind
+        declarators = [(declarator.identifier.name, self.compile(declarator.init)) for declarator in node.variableDeclarators]
+        def run(context):
+            for name, init in declarators:
+                context.symbolTable.define(name, SymbolTable.Symbol(kind, init(context)))
+        return run
+
+    def compile_PutStatementNode(self, node):
+        arguments = [self.compile(argument) for argument in node.arguments]
+        def run(context):
+            result = ""
+            for argument in arguments:
+                result += str(argument(context))
+            print(result)
+        return run
+
+    def compile_AssignmentExpressionNode(self, node):
+        if node.op != Token.cons.ASSIGN and node.op not in ASSIGNMENT:
+            return self.fallback(node)
+        name = node.left.name
+        left, right = self.compile(node.left), self.compile(node.right)
+        if node.op == Token.cons.ASSIGN:
+            def run(context):
+                left(context)
+                value = right(context)
+                context.symbolTable.update(name, value, context, node)
+        else:
+            method = ASSIGNMENT[node.op]
+            def run(context):
+                current = left(context)
+                other = right(context)
+                value, error = getattr(current, method)(other)
+                # The tree walker drops this error and carries on
+                if error: return None
+                context.symbolTable.update(name, value, context, node)
+        return run
+
+    def compile_UpdateExpressionNode(self, node):
+        if node.operator not in (Token.cons.INC, Token.cons.DEC):
+            return self.fallback(node)
+        name = node.argument.name
+        argument = self.compile(node.argument)
+        method = 'add' if node.operator == Token.cons.INC else 'sub'
+        fallback, one = self.fallback(node), Type.number(1)
+        def run(context):
+            value = argument(context)
+            if type(value) == str or type(value) == list:
+                return fallback(context)
+            result, error = getattr(value, method)(one)
+            if error: raise Error.Failure(error)
+            context.symbolTable.update(name, result, context, node)
+        return run
+
+    ## EXPRESSIONS
+    def compile_IdentifierNode(self, node):
+        name, scope, slot = node.name, node.scope, node.slot
+        findSymbol = self.interpreter.findSymbol
+        globals = self.interpreter.globals
+        globalSymbols = globals.symbols
+        evaluate = self.evaluate
+        Frame, Value, FUNCTION = SymbolTable.Frame, Type.Value, Token.cons.FUNCTION
+        def run(context):
+            # The same lookup as Interpreter.resolvedSymbol, then findSymbol
+            symtab = context.symbolTable
+            symbol = None
+            if scope is None:
+                if symtab is globals:
+                    symbol = globalSymbols.get(name)
+            elif type(symtab) is Frame and symtab.layout is scope:
+                if slot is not None:
+                    symbol = symtab.values[slot]
+                elif not symtab.symbols:
+                    symbol = globalSymbols.get(name)
+            symbol = symbol or findSymbol(name, context)
+            if symbol:
+                if symbol.kind == FUNCTION:
+                    return symbol.type
+                value = symbol.type
+                if isinstance(value, Value):
+                    return value
+                # A hoisted declaration that has not run yet: its init node
+                return evaluate(value, context)
+            elif name in FUNCTION:
+                return name
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f'Unkown Variable or Function \'{name}\'', context))
+        return run
+
+    def compile_LiteralNode(self, node):
+        value = node.value
+        def run(context):
+            return Type.String(value)
+        return run
+
+    def compile_NumberNode(self, node):
+        value = node.value
+        def run(context):
+            return Type.number(value)
+        return run
+
+    def compile_ConstantNode(self, node):
+        if type(node.value) == str:
+            return self.compile_LiteralNode(node)
+        return self.compile_NumberNode(node)
+
+    def compile_ListExpressionNode(self, node):
+        elements = [self.compile(element) for element in node.elements]
+        def run(context):
+            return Type.List([element(context) for element in elements])
+        return run
+
+    def compile_MemberExpressionNode(self, node):
+        identifier, index = self.compile(node.identifier), self.compile(node.property)
+        def run(context):
+            value = identifier(context)
+            prop = index(context)
+            if isinstance(value, Type.List) or isinstance(value, Type.String):
+                if prop.value > value.length - 1:
+                    raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, "Index out of range", context))
+                item = value.value[prop.value]
+                if type(item) == str:
+                    item = Type.String(item)
+                elif type(item) == list:
+                    item = Type.List(item)
+                elif type(item) == int or type(item) == float:
+                    item = Type.number(item)
+                return item
+            # Not an error in the tree walker either
+            return None
+        return run
+
+    def compile_UnaryOpNode(self, node):
+        if node.op not in UNARY:
+            return self.fallback(node)
+        expr, operation = self.compile(node.expr), UNARY[node.op]
+        def run(context):
+            value, error = operation(expr(context))
+            if error: raise Error.Failure(error)
+            return value
+        return run
+
+    def compile_BinOpNode(self, node):
+        if node.op not in BINARY:
+            return self.fallback(node)
+        left, right, method = self.compile(node.left), self.compile(node.right), BINARY[node.op]
+        def run(context):
+            value = left(context)
+            other = right(context)
+            result, error = getattr(value, method)(other)
+            if error: raise Error.Failure(error.at(node.right, context))
+            return result
+        return run
+
+    def compile_LogicalOpNode(self, node):
+        test = self.condition(node)
+        def run(context):
+            return Type.BOOLEANS[test(context)]
+        return run
+
+    def condition(self, node):
+        # A closure giving the truth of 'node' as a Python bool; see Visitor.truth
+        kind = type(node)
+        if kind is ast.LogicalOpNode:
+            left, right = self.condition(node.left), self.condition(node.right)
+            if node.op == Token.cons.AND:
+                def run(context):
+                    return left(context) and right(context)
+                return run
+            def run(context):
+                return left(context) or right(context)
+            return run
+        if kind is ast.BinOpNode and node.op in COMPARISON:
+            left, right = self.compile(node.left), self.compile(node.right)
+            method, compare = BINARY[node.op], COMPARISON[node.op]
+            def run(context):
+                value = left(context)
+                other = right(context)
+                if type(value) is Type.Number and type(other) is Type.Number:
+                    return compare(value.value, other.value)
+                result, error = getattr(value, method)(other)
+                if error: raise Error.Failure(error.at(node.right, context))
+                return result.is_true()
+            return run
+        expr = self.compile(node)
+        def run(context):
+            return expr(context).is_true()
+        return run
+
+    def compile_InlineFunctionNode(self, node):
+        inline = self.interpreter.inline
+        def run(context):
+            return inline(node)
+        return run
+
+    def compile_CallExpressionNode(self, node):
+        callee = self.compile(node.callee)
+        arguments = [self.compile(argument) for argument in node.arguments]
+        def run(context):
+            function = callee(context)
+            args = [argument(context) for argument in arguments]
+            function.setPosition(node)
+            return function.execute(args, context)
+        return run
+
+
+class ClosureFunction(Type.Function):
+    def __init__(self, functionName, functionArguments, functionBody, functionSymtab, layout, compiler):
+        super().__init__(functionName, functionArguments, functionBody, functionSymtab, layout)
+        self.compiler = compiler
+
+    def invoke(self, arguments, parentContext):
+        newContext = self.generate_new_context(parentContext)
+        self.check_and_populate_args(self.arg_names, arguments, newContext)
+        body = self.compiler.compile(self.body)
+        try:
+            while True:
+                try:
+                    return body(newContext)
+                except visitor.TailCall as call:
+                    self.reenter(call.arguments, newContext)
+        except visitor.Return as result:
+            return result.value
+        except Error.Failure as failure:
+            # Each call reports the error on its way out, like the Interpret it replaces
+            print(failure.error.as_string())
+            raise
+
+
+class ClosureInterpreter(Interpreter.Interpreter):
+    def Interpret(self, context = None):
+        if self.ast.error:
+            print(self.ast.error.as_string())
+            return None
+        # Compiled afresh for every run: closures hold on to the run's global scope
+        self.compiler = Compiler(self)
+        context = SymbolTable.Context('<main>')
+        context.symbolTable = self.environment(self.ast.node)
+        self.symtab = context.symbolTable
+        try:
+            self.compiler.evaluate(self.ast.node, context)
+        except visitor.Return:
+            pass
+        except Error.Failure as failure:
+            print(failure.error.as_string())
+
+    def function(self, name, args, body, symtab, layout):
+        return ClosureFunction(name, args, body, symtab, layout, self.compiler)
@@ -70,6 +70,8 @@ GTE  = "GTE"
 NEQ  = "NEQ"
 AND  = "AND"
 OR   = "OR"
+BAND = "BAND"
+BOR  = "BOR"
 
 
 ## PUNCTUATIONS
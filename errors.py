@@ -30,6 +30,12 @@ class RTError(Error):
         super().__init__(pos_start, pos_end, "Runtime Error", details)
         self.context = context
 
+    def at(self, node, context):
+        # Values have no position, so an operation on them reports its error without
+        # one; the engine running the operation places it at 'node', in 'context'
+        self.pos_start, self.pos_end, self.context = node.pos_start, node.pos_end, context
+        return self
+
     def as_string(self):
         result  = self.generateTraceback()
         result += f'{self.name}: {self.details}'
@@ -49,3 +55,11 @@ class RTError(Error):
 
         return 'Traceback (Most Recent Call Last):\n' + result
         
+
+
+class Failure(Exception):
+    # How an Orion runtime error travels up: raised where it happens, printed by each
+    # function call it leaves and by the Interpret of the program
+    def __init__(self, error):
+        super().__init__(error)
+        self.error = error
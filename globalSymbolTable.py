@@ -1,4 +1,5 @@
 import symTable as SymbolTable
 import typeSystem as Type
 
+## Built-ins only (filled in by typeSystem). Each run copies them into its own global scope.
 GLOBAL_SYMBOL_TABLE = SymbolTable.SymbolTable()
\ No newline at end of file
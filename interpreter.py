@@ -5,34 +5,114 @@ import parser
 import errors as Error
 import symTable as SymbolTable
 import ast
+import purity as Purity
+import memo as Memo
 from globalSymbolTable import GLOBAL_SYMBOL_TABLE
 
 class Interpreter(visitor.Visitor):
+    # Results each pure function keeps in its memo cache (0 for no limit); None is off
+    memoSize = None
+
     def __init__(self, program, args = None, GlobalSymtab = None):
         if isinstance(program, parser.Parser):
             parseResult = program.parse()
             self.ast = parseResult
+        elif isinstance(program, parser.ParseResult):
+            self.ast = program
         else:
             self.ast = parser.ParseResult()
             self.ast.error = None
             self.ast.node = program
+        # The run's global scope; function bodies get it from the Function they belong to
+        self.globals = GlobalSymtab
+        # Filled in by environment() when memoizing
+        self.pure, self.memos = set(), {}
 
 
     def Interpret(self, context = None):
         if self.ast.error:
             print(self.ast.error.as_string())
+            return None
+        # Called with a context to run a function body, and without one to run a program
+        call = context is not None
+        if call:
+            self.symtab = context.symbolTable
         else:
-            if context:
-                self.symtab = context.symbolTable
-            else:
-                context = SymbolTable.Context('<main>')
-                context.symbolTable = GLOBAL_SYMBOL_TABLE
-                self.symtab = context.symbolTable
-            result = self.visit(self.ast.node, context)
-            if result:
-                if result.error:
-                    print(result.error.as_string())
-            return result
+            context = SymbolTable.Context('<main>')
+            context.symbolTable = self.environment(self.ast.node)
+            self.symtab = context.symbolTable
+        try:
+            return self.visit(self.ast.node, context)
+        except visitor.Return as result:
+            return result.value
+        except Error.Failure as failure:
+            # Printed here, then once more by every call it unwinds through
+            print(failure.error.as_string())
+            if call: raise
+            return None
+
+
+    def environment(self, program):
+        # A fresh global scope for every run: copies of the built-ins, then whatever
+        # the program hoists. Nothing from an earlier run of the same AST survives.
+        self.globals = SymbolTable.SymbolTable()
+        for name, symbol in GLOBAL_SYMBOL_TABLE.symbols.items():
+            self.globals.define(name, symbol.copy())
+        # The memo caches of the run, fresh like everything else in it
+        self.pure = Purity.pureFunctions(program) if self.memoSize is not None else set()
+        self.memos = {}
+        return self.declare(program.declarations, self.globals)
+
+    def declare(self, declarations, symtab):
+        for name, kind, value in declarations.entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                scope = self.declare(value.symtab, SymbolTable.SymbolTable(self.globals))
+                memo = self.memo(value, value.name)
+                value = self.function(value.name, value.args, value.body, scope, value.layout)
+                value.memo = memo
+            symtab.define(name, SymbolTable.Symbol(kind, value))
+        return symtab
+
+    def function(self, name, args, body, symtab, layout):
+        # Every user function of a run is made here, so another engine can run its own
+        return Type.Function(name, args, body, symtab, layout, self)
+
+    def inline(self, node):
+        # The Function an inline function expression makes. Every Function made from
+        # the same pure node shares its memo cache: their results can only be the same.
+        function = self.function(node.name, node.params, node.body, SymbolTable.SymbolTable(self.globals), node.layout)
+        function.memo = self.memo(node, node.name or '<inline>')
+        return function
+
+    def memo(self, key, name):
+        # The memo cache of a pure FunctionContext or InlineFunctionNode, or None
+        if key not in self.pure:
+            return None
+        cache = self.memos.get(key)
+        if cache is None:
+            cache = self.memos[key] = Memo.MemoCache(name, self.memoSize)
+        return cache
+
+    def call(self, function, context):
+        # Runs a function body on this interpreter, in the call's own context; the scope
+        # of whatever was running is put back afterwards
+        symtab = self.symtab
+        self.symtab = context.symbolTable
+        try:
+            while True:
+                try:
+                    return self.visit(function.body, context)
+                except visitor.TailCall as call:
+                    # Loops instead of nesting another call
+                    function.reenter(call.arguments, context)
+        except visitor.Return as result:
+            return result.value
+        except Error.Failure as failure:
+            # Printed by every call it unwinds through, then by Interpret
+            print(failure.error.as_string())
+            raise
+        finally:
+            self.symtab = symtab
 
 
     def findSymbol(self, symbol, context):
@@ -49,122 +129,118 @@ class Interpreter(visitor.Visitor):
 
 
     def visit_UpdateExpressionNode(self, node, context):
-        res = visitor.RTResult()
-        value = res.register(self.visit(node.argument, context))
-        if res.error: return res
+        value = self.visit(node.argument, context)
 
-        name = node.argument.identifier.value
+        name = node.argument.name
 
         if type(value) != str and type(value) != list:
-            if node.operator.type == Token.cons.INC:
-                result, error = value.add(Type.Number(1))
-            elif node.operator.type == Token.cons.DEC:
-                result, error = value.sub(Type.Number(1))
+            if node.operator == Token.cons.INC:
+                result, error = value.add(Type.number(1))
+            elif node.operator == Token.cons.DEC:
+                result, error = value.sub(Type.number(1))
             
-            if error: return res.failure(error)
-            result.setPosition(node.pos_start, node.pos_end)
+            if error: raise Error.Failure(error)
         else:
-            res.failure(Error.RTError(node.pos_start, node.pos_end, f'Variable \'{name}\' does not support update expression', context))
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f'Variable \'{name}\' does not support update expression', context))
         
-        res.register(self.symtab.update(name, result, context))
-        if res.error: return res
-
+        self.symtab.update(name, result, context, node)
+
+
+    def resolvedSymbol(self, node, symtab):
+        # The indexed lookup the resolver set up, or None to fall back to findSymbol.
+        # Only valid while running in the frame (or top level) the node belongs to.
+        if node.scope is None:
+            if symtab is self.globals:
+                return symtab.symbols.get(node.name)
+        elif type(symtab) is SymbolTable.Frame and symtab.layout is node.scope:
+            if node.slot is not None:
+                return symtab.values[node.slot]
+            if not symtab.symbols:
+                # Not a local, and the function's hoisted names are all locals
+                return self.globals.symbols.get(node.name)
+        return None
 
     def visit_IdentifierNode(self, node, context):
-        identifier = node.identifier.value
-        res = visitor.RTResult()
-        if self.findSymbol(identifier, context):
+        identifier = node.name
+        ident = self.resolvedSymbol(node, context.symbolTable) or self.findSymbol(identifier, context)
+        if ident:
             # It's a user-defined Function or Variable
-            #ident = self.symtab.get(identifier)
-            ident = self.findSymbol(identifier, context)
             # Checking wether the identifier is a variable or a function
             if ident.kind == Token.cons.FUNCTION:
-                return res.success(ident.type)
+                return ident.type
             elif isinstance(ident.type, Type.Value) or isinstance(ident.type, Type.Number) or isinstance(ident.type, Type.String) or isinstance(ident.type, Type.List):
-                return res.register(ident.type)
+                return ident.type
             else:
                 # it was self.visit(ident.type.value, context)
-                result = res.register(self.visit(ident.type, context))
-                return res.success(result)
+                return self.visit(ident.type, context)
         elif identifier in Token.cons.FUNCTION:
             # It's a built-in Function
-            return res.success(identifier)
+            return identifier
         else:
-            res.failure(Error.RTError(node.pos_start, node.pos_end, f'Unkown Variable or Function \'{node.identifier.value}\'', context))
-            return res
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f'Unkown Variable or Function \'{node.name}\'', context))
 
     
     def visit_ForStatementNode(self, node, context):
-        res = visitor.RTResult()
         # Node.init, node.test = NULL, node.update, node.body
-        init = node.init.variableDeclarators[0].identifier.identifier.value
-        forRange = res.register(self.visit(node.test, context))
-        if res.error: return res
-        for i in forRange.value:
+        init = node.init.variableDeclarators[0].identifier.name
+        forRange = self.visit(node.test, context)
+        if type(forRange) is Type.Range:
+            # One Number per step, straight from the Python range
+            for i in forRange.value.range:
+                self.symtab.update(init, Type.number(i), context, node)
+                self.visit(node.body, context)
+            return
+        for i in forRange.elements():
             if isinstance(i, Type.String):
-                iterator = Type.String(i.value).setContext(context).setPosition(node.pos_start, node.pos_end)
+                iterator = Type.String(i.value)
             elif isinstance(i, Type.List):
-                iterator = Type.List(i.value).setContext(context).setPosition(node.pos_start, node.pos_end)
+                iterator = Type.List(i.value)
             elif type(i) == str:
-                i = Type.String(i).setContext(context).setPosition(node.pos_start, node.pos_end)
+                i = Type.String(i)
                 iterator = i
             else:
-                iterator = Type.Number(i.value).setContext(context).setPosition(node.pos_start, node.pos_end)
-            res.register(self.symtab.update(init, iterator, context))
-            if res.error: return res
-            res.register(self.visit(node.body, context))
-            if res.error: return res
+                iterator = Type.number(i.value)
+            self.symtab.update(init, iterator, context, node)
+            self.visit(node.body, context)
             del iterator
 
 
     def visit_InlineFunctionNode(self, node, context):
-        res = visitor.RTResult()
-        function = Type.Function(node.name, node.params, node.body, node.symtab)
-        return res.success(function)
+        return self.inline(node)
 
     def visit_CallExpressionNode(self, node, context):
-        res = visitor.RTResult()
-        function = res.register(self.visit(node.callee, context))
-        if res.error: return res
+        function = self.visit(node.callee, context)
 
         args = []
         for arg in node.arguments:
             if isinstance(arg, Type.Number):
                 args.append(arg)
             else:
-                arg = res.register(self.visit(arg, context))
-                if res.error: return res
-                args.append(arg)
+                args.append(self.visit(arg, context))
         
         
-        function.setPosition(node.pos_start, node.pos_end)
-        result = res.register(function.execute(args, context))
-        if res.error: return res
-        return res.success(result)
+        function.setPosition(node)
+        return function.execute(args, context)
 
     def visit_AssignmentExpressionNode(self, node, context):
-        res = visitor.RTResult()
-        name = node.left.identifier.value
-        left = res.register(self.visit(node.left, context))
-        if res.error: return res
-        right = res.register(self.visit(node.right, context))
-        if res.error: return res
+        name = node.left.name
+        left = self.visit(node.left, context)
+        right = self.visit(node.right, context)
 
         error = None
-        if node.op.type == Token.cons.ASSIGN:
+        if node.op == Token.cons.ASSIGN:
             value = right
-        elif node.op.type == Token.cons.PAS:
+        elif node.op == Token.cons.PAS:
             value, error = left.add(right)
-        elif node.op.type == Token.cons.NAS:
+        elif node.op == Token.cons.NAS:
             value, error = left.sub(right)
-        elif node.op.type == Token.cons.DAS:
+        elif node.op == Token.cons.DAS:
             value, error = left.div(right)
-        elif node.op.type == Token.cons.MUAS:
+        elif node.op == Token.cons.MUAS:
             value, error = left.mul(right)
-        elif node.op.type == Token.cons.MOAS:
+        elif node.op == Token.cons.MOAS:
             value, error = left.mod(right)
         
-        if error: return res
-        value.setPosition(node.pos_start, node.pos_end)
-        res.register(self.symtab.update(name, value, context))
-        if res.error: return res
\ No newline at end of file
+        # An operator error here has never been reported
+        if error: return None
+        self.symtab.update(name, value, context, node)
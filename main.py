@@ -1,16 +1,63 @@
-import lexer as Lexer
-import parser as Parser
-import typeSystem as Type
-import interpreter as Interpreter
 import sys
+import argparse
+import astCache
+import optimizer as Optimizer
+import interpreter as Interpreter
+import closureCompiler as ClosureCompiler
+import virtualMachine as VirtualMachine
+import bytecode as Bytecode
+import transpiler as Transpiler
+import memo as Memo
+import profiler as Profiler
+
+## The engines --engine can choose from; they print the same output and errors
+ENGINES = {
+    'tree':    Interpreter.Interpreter,
+    'closure': ClosureCompiler.ClosureInterpreter,
+    'vm':      VirtualMachine.VMInterpreter,
+    'python':  Transpiler.PythonInterpreter,
+}
+
+argParser = argparse.ArgumentParser(prog = 'main.py')
+argParser.add_argument('file')
+argParser.add_argument('--no-cache', dest = 'cache', action = 'store_false',
+                       help = 'always parse the source and never read or write __orioncache__')
+argParser.add_argument('--no-optimize', dest = 'optimize', action = 'store_false',
+                       help = 'run the program exactly as parsed, without constant folding')
+argParser.add_argument('--engine', choices = ENGINES, default = 'tree',
+                       help = 'walk the AST (tree, the default), compile it to Python closures first (closure) to bytecode for the stack VM (vm) or to a Python module (python)')
+argParser.add_argument('--disassemble', action = 'store_true',
+                       help = 'print the bytecode the vm engine would run, instead of running the program')
+argParser.add_argument('--memo', type = int, nargs = '?', const = Memo.DEFAULT_SIZE, metavar = 'SIZE',
+                       help = f'cache the results of pure functions, keeping up to SIZE per function (default {Memo.DEFAULT_SIZE}, 0 for no limit)')
+argParser.add_argument('--memo-stats', dest = 'memoStats', action = 'store_true',
+                       help = 'after the run, print the hits and misses of every memo cache')
+argParser.add_argument('--profile', nargs = '?', const = '', metavar = 'FILE',
+                       help = 'time every line and function of the run (tree engine only), print a report to stderr and write collapsed stacks for flamegraph tools to FILE (default: the source file name + .folded)')
+options = argParser.parse_args()
+if options.profile is not None and options.engine != 'tree':
+    argParser.error('--profile needs the tree engine')
 
-name = sys.argv[1]
-file = open(name, 'r')
+file = open(options.file, 'r')
 program, fileName = file.read(), file.name
 
-lexer = Lexer.Lexer(fileName, program)
-parser = Parser.Parser(lexer)
-#program = parser.parse()
-#program = program.node
-interp = Interpreter.Interpreter(parser)
-interp.Interpret()
+parseResult = astCache.parse(fileName, program, options.cache)
+if options.optimize and not parseResult.error:
+    parseResult.node = Optimizer.optimize(parseResult.node)
+if options.disassemble and not parseResult.error:
+    print(Bytecode.disassembleProgram(parseResult.node))
+    raise SystemExit
+interp = (Profiler.ProfilingInterpreter if options.profile is not None else ENGINES[options.engine])(parseResult)
+if options.engine == 'python':
+    interp.useCache = options.cache
+interp.memoSize = options.memo
+try:
+    interp.Interpret()
+finally:
+    # Also when the run is interrupted, which is how a slow script usually ends
+    if options.profile is not None:
+        print(Profiler.report(interp), file = sys.stderr)
+        with open(options.profile or fileName + '.folded', 'w') as folded:
+            folded.write(Profiler.collapsed(interp))
+if options.memoStats and options.memo is not None:
+    print(Memo.report(list(interp.memos.values())))
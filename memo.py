@@ -0,0 +1,58 @@
+import collections
+import typeSystem as Type
+
+## Memo caches for pure functions (see purity.py), turned on with --memo. Each function
+## gets its own cache, keyed on the values of its arguments; a call with an argument that
+## is not a Number or String, or a result that is not one, is never cached. Only the
+## value itself is kept, and every hit hands out a new Number or String, so nothing a
+## caller does to the value can reach the cache.
+
+## Results kept per function when --memo is given no size
+DEFAULT_SIZE = 256
+
+
+class MemoCache:
+    # Least recently used entries are dropped once 'size' are held; 'size' 0 keeps all
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.results = collections.OrderedDict()
+        self.hits = self.misses = self.evictions = self.uncached = 0
+
+    def call(self, function, arguments, parentContext):
+        key = []
+        for argument in arguments:
+            kind = type(argument)
+            if kind is not Type.Number and kind is not Type.String:
+                self.uncached += 1
+                return function.invoke(arguments, parentContext)
+            key.append((kind, type(argument.value), argument.value))
+        key = tuple(key)
+        entry = self.results.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.results.move_to_end(key)
+            kind, value = entry
+            return kind(value)
+        self.misses += 1
+        result = function.invoke(arguments, parentContext)
+        kind = type(result)
+        if kind is Type.Number or kind is Type.String:
+            self.results[key] = (kind, result.value)
+            if self.size and len(self.results) > self.size:
+                self.results.popitem(last = False)
+                self.evictions += 1
+        return result
+
+
+def report(caches):
+    # One line of statistics per cache, for --memo-stats
+    lines = ['Memo cache statistics:']
+    for cache in caches:
+        calls = cache.hits + cache.misses
+        rate = f'{cache.hits / calls:.1%}' if calls else '-'
+        lines.append(f'  {cache.name}: {cache.hits:,} hits, {cache.misses:,} misses ({rate} hit rate), '
+                     f'{cache.evictions:,} evictions, {cache.uncached:,} uncached calls, {len(cache.results):,}/{cache.size or "unlimited"} held')
+    if not caches:
+        lines.append('  no pure functions')
+    return '\n'.join(lines)
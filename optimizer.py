@@ -0,0 +1,153 @@
+import operator
+import token as Token
+import typeSystem as Type
+import symTable as SymbolTable
+import ast
+
+## The Value method visit_BinOpNode/visit_UnaryOpNode call for each operator
+BINARY = {
+    Token.cons.PLUS:   'add',
+    Token.cons.MINUS:  'sub',
+    Token.cons.MUL:    'mul',
+    Token.cons.DIV:    'div',
+    Token.cons.MOD:    'mod',
+    Token.cons.EQ:     'compare_eq',
+    Token.cons.LT:     'compare_lt',
+    Token.cons.GT:     'compare_gt',
+    Token.cons.LTE:    'compare_lte',
+    Token.cons.GTE:    'compare_gte',
+    Token.cons.NEQ:    'compare_neq',
+    Token.cons.CONCAT: 'concat',
+}
+
+## What each comparison gives for two Numbers, as the Python bool a condition needs
+COMPARISON = {
+    Token.cons.EQ:  operator.eq,
+    Token.cons.LT:  operator.lt,
+    Token.cons.GT:  operator.gt,
+    Token.cons.LTE: operator.le,
+    Token.cons.GTE: operator.ge,
+    Token.cons.NEQ: operator.ne,
+}
+
+## What visit_UnaryOpNode does for each operator
+UNARY = {
+    Token.cons.MINUS: lambda value: value.mul(Type.number(-1)),
+    Token.cons.NOT:   lambda value: value.unary_not(),
+    Token.cons.HASH:  lambda value: value._len(),
+}
+
+## The Value method visit_AssignmentExpressionNode calls for each compound assignment
+ASSIGNMENT = {
+    Token.cons.PAS:  'add',
+    Token.cons.NAS:  'sub',
+    Token.cons.DAS:  'div',
+    Token.cons.MUAS: 'mul',
+    Token.cons.MOAS: 'mod',
+}
+
+## Folding ' ' * 1000000 would only move the cost (and the memory) to every start-up
+MAX_STRING_LENGTH = 4096
+
+
+class ConstantFolder:
+    # Replaces operator subtrees whose operands are all literals with a ConstantNode
+    # holding the result. Operations are evaluated with the very Value methods the
+    # interpreter would use; anything that reports an error, returns nothing or
+    # raises is left in the tree so it fails at run time exactly as before.
+    def __init__(self):
+        # id(original) -> (original, replacement); keeping the original alive stops
+        # its id from being reused while the pass runs
+        self.folded = {}
+
+    def optimize(self, program):
+        program = self.fold(program)
+        self.foldDeclarations(program.declarations)
+        return program
+
+    def foldDeclarations(self, declarations):
+        # Hoisted init nodes are shared with the tree, so they must follow its rewrites
+        entries = []
+        for name, kind, value in declarations.entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                value.body = self.fold(value.body)
+                self.foldDeclarations(value.symtab)
+            elif isinstance(value, ast.Node):
+                value = self.fold(value)
+            entries.append((name, kind, value))
+        declarations.entries = entries
+
+    def fold(self, node):
+        key = id(node)
+        if key in self.folded:
+            return self.folded[key][1]
+        result = self.foldChildren(node)
+        if isinstance(node, ast.BinOpNode):
+            result = self.foldBinary(node)
+        elif isinstance(node, ast.UnaryOpNode):
+            result = self.foldUnary(node)
+        self.folded[key] = (node, result)
+        return result
+
+    def foldChildren(self, node):
+        for name, child in ast.fields(node):
+            if isinstance(child, ast.Node):
+                setattr(node, name, self.fold(child))
+            elif isinstance(child, tuple):
+                setattr(node, name, tuple(self.fold(item) if isinstance(item, ast.Node) else item for item in child))
+        return node
+
+    def foldBinary(self, node):
+        if node.op == Token.cons.CONCAT and isinstance(node.left, ast.ListExpressionNode) and isinstance(node.right, ast.ListExpressionNode):
+            # [a, b] .. [c] builds the same list as [a, b, c], evaluated in the same order
+            result = ast.ListExpressionNode(node.left.elements + node.right.elements)
+            result.setSpan(node, node)
+            return result
+        left, right = constant(node.left), constant(node.right)
+        if left is None or right is None or node.op not in BINARY:
+            return node
+        # A String has no comparisons: running one is a runtime error, so it stays unfolded
+        operation = getattr(left, BINARY[node.op], None)
+        if operation is None:
+            return node
+        return evaluate(node, operation, right)
+
+    def foldUnary(self, node):
+        operand = constant(node.expr)
+        if operand is None or node.op not in UNARY:
+            return node
+        return evaluate(node, UNARY[node.op], operand)
+
+
+def constant(node):
+    # The value a literal evaluates to, or None if 'node' is not a literal
+    if isinstance(node, ast.NumberNode):
+        return Type.number(node.value)
+    if isinstance(node, ast.LiteralNode):
+        return Type.String(node.value)
+    if isinstance(node, ast.ConstantNode):
+        return Type.String(node.value) if isinstance(node.value, str) else Type.Number(node.value)
+    return None
+
+def evaluate(node, operation, *args):
+    try:
+        result = operation(*args)
+    except Exception:
+        return node
+    if result is None or result[1] is not None:
+        return node
+    value = result[0]
+    if isinstance(value, Type.String) and len(value.value) <= MAX_STRING_LENGTH:
+        return ast.ConstantNode(value.value, node)
+    if isinstance(value, Type.Number) and type(value.value) in (int, float):
+        return ast.ConstantNode(value.value, node)
+    return node
+
+
+def optimize(program):
+    try:
+        return ConstantFolder().optimize(program)
+    except RecursionError:
+        # Only reachable for absurdly deep expressions, which cannot run anyway. Every
+        # rewrite done so far is valid on its own, so the tree is still safe to run.
+        return program
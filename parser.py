@@ -1,12 +1,34 @@
+from collections import deque
 import token as Token
 import ast
 import typeSystem as Type
 import symTable as SymbolTable
 import errors as Error
-from globalSymbolTable import GLOBAL_SYMBOL_TABLE
+import resolver as Resolver
 
 # TODO: Variable Declaration should be in AST or not?
 
+## Binding power of every binary operator; higher binds tighter. Unary operators are
+## handled by factor() and bind tighter than all of these.
+BINDING_POWER = {
+    Token.cons.OR:     1,
+    Token.cons.AND:    2,
+    Token.cons.IN:     3,
+    Token.cons.EQ:     3,
+    Token.cons.NEQ:    3,
+    Token.cons.LT:     3,
+    Token.cons.GT:     3,
+    Token.cons.LTE:    3,
+    Token.cons.GTE:    3,
+    Token.cons.CONCAT: 4,
+    Token.cons.PLUS:   4,
+    Token.cons.MINUS:  4,
+    Token.cons.MUL:    5,
+    Token.cons.DIV:    5,
+    Token.cons.MOD:    5,
+}
+LOWEST_POWER = min(BINDING_POWER.values())
+
 class ParseResult:
     def __init__(self):
         self.error = None
@@ -28,30 +50,40 @@ class ParseResult:
         return self
 
 class Parser:
-    def __init__(self, lexer):
-        
-        tokens, error = lexer.tokenize()
-        if error: print(error.as_string())
-        self.tokens = tokens
+    def __init__(self, lexer, lazy = True):
+        # In lazy mode tokens are pulled from the lexer as parsing goes, so only the
+        # lookahead buffer (and whatever the AST keeps) is alive at any time.
+        self.lexer = lexer
+        if lazy:
+            self.tokens = lexer.generate()
+        else:
+            # lexer.tokens keeps the full stream even when tokenize() reports an error
+            lexer.tokenize()
+            self.tokens = iter(lexer.tokens)
+        self.lookahead = deque()
+        # Parsing has no side effects: hoisted names are recorded here and only turned
+        # into symbols when a run starts (see Interpreter.declare)
+        self.declarations = SymbolTable.DeclarationTable()
         # TODO: There must be a way to not store all of the contexts. Think about it and then apply it.
         self.currentToken = None
-        self.pos = 0
         self.advance()
 
 
     ## HELPER FUNCTIONS
     def advance(self):
-        if self.pos > len(self.tokens) - 1:
-            self.currentToken = None
+        if self.lookahead:
+            self.currentToken = self.lookahead.popleft()
         else:
-            self.currentToken = self.tokens[self.pos]
-            self.pos += 1
+            # The stream ends with EOF; keep returning it once the lexer is exhausted
+            self.currentToken = next(self.tokens, None) or self.currentToken
 
-    def peek(self):
-        if self.pos > len(self.tokens) - 1:
-            return Token.Token(Token.cons.EOF, None)
-        else:
-            return self.tokens[self.pos]
+    def peek(self, offset = 1):
+        while len(self.lookahead) < offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return Token.Token(Token.cons.EOF, None)
+            self.lookahead.append(token)
+        return self.lookahead[offset - 1]
 
     def error(self, Type):
         raise Exception(f'Parsing Error: expected:\'{Type}\', got:\'{self.currentToken.type}\' ')
@@ -65,8 +97,12 @@ class Parser:
 
     def parse(self):
         res = self.program()
+        if self.lexer.error:
+            return res.failure(self.lexer.error)
         if not res.error and self.currentToken.type != Token.cons.EOF:
             return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected '+', '-', '*' or '/'"))
+        if not res.error:
+            Resolver.resolve(res.node)
         return res
 
     ## PARSING FUNCTIONS
@@ -76,7 +112,7 @@ class Parser:
         while self.currentToken.type != Token.cons.EOF:
             if self.currentToken.type in (Token.cons.LET, Token.cons.CONST):
                 
-                stmt = self.varDecl_stmt(GLOBAL_SYMBOL_TABLE)[0]
+                stmt = self.varDecl_stmt(self.declarations)[0]
                 stmt = res.register(stmt)
                 if res.error: return res
                 statements.append(stmt)
@@ -95,14 +131,14 @@ class Parser:
                 else:
                     return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected ';'"))
             elif self.currentToken.type == Token.cons.FUNCTION:
-                stmt = res.register(self.function_stmt(GLOBAL_SYMBOL_TABLE))
+                stmt = res.register(self.function_stmt(self.declarations))
                 if res.error: return res
             elif self.currentToken.type == Token.cons.IF:
                 stmt = res.register(self.if_stmt())
                 if res.error: return res
                 statements.append(stmt)
             elif self.currentToken.type == Token.cons.FOR:
-                stmt = res.register(self.for_stmt(GLOBAL_SYMBOL_TABLE))
+                stmt = res.register(self.for_stmt(self.declarations))
                 if res.error: return res
                 statements.append(stmt)
             elif self.currentToken.type == Token.cons.WHILE:
@@ -123,7 +159,7 @@ class Parser:
                     return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected binary operation such as '+', '-', etc."))
         
         
-        return res.success(ast.ProgramNode(statements))
+        return res.success(ast.ProgramNode(statements, self.declarations))
 
     def put_statement(self):
         res = ParseResult()
@@ -152,7 +188,7 @@ class Parser:
         res = ParseResult()
         statements = []
         varnames = []
-        symtab = SymbolTable.SymbolTable()
+        symtab = SymbolTable.DeclarationTable()
         while self.currentToken.type != Token.cons.RBRACE:
             if self.currentToken.type == Token.cons.LET:
                 varDeclTuple = self.varDecl_stmt(symtab)
@@ -176,7 +212,7 @@ class Parser:
                 else:
                     return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected ';'"))
             elif self.currentToken.type == Token.cons.FUNCTION:
-                stmt = res.register(self.function_stmt(GLOBAL_SYMBOL_TABLE))
+                stmt = res.register(self.function_stmt(self.declarations))
                 if res.error: return res
             elif self.currentToken.type == Token.cons.PUTS:
                 stmt = res.register(self.put_statement())
@@ -214,7 +250,7 @@ class Parser:
         statements = []
         while self.currentToken.type != Token.cons.RBRACE:
             if self.currentToken.type == Token.cons.LET:
-                stmt = res.register(self.varDecl_stmt(GLOBAL_SYMBOL_TABLE)[0])
+                stmt = res.register(self.varDecl_stmt(self.declarations)[0])
                 if res.error: return res
                 statements.append(stmt)
                 if self.currentToken.type == Token.cons.SEMICOLON:
@@ -245,7 +281,7 @@ class Parser:
                 if res.error: return res
                 statements.append(stmt)
             elif self.currentToken.type == Token.cons.FOR:
-                stmt = res.register(self.for_stmt(GLOBAL_SYMBOL_TABLE))
+                stmt = res.register(self.for_stmt(self.declarations))
                 if res.error: return res
                 statements.append(stmt)
             elif self.currentToken.type == Token.cons.WHILE:
@@ -275,7 +311,7 @@ class Parser:
         if res.error: return res
         idents = []
         idents.append(ident)
-        varnames.append(ident.identifier)
+        varnames.append(ident.name)
         while self.currentToken.type == Token.cons.COMMA:
             res.register(self.advance())
             if res.error: return res
@@ -284,7 +320,7 @@ class Parser:
                 return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected identifier"))
             ident = res.register(self.factor())
             if res.error: return res
-            varnames.append(ident.identifier)
+            varnames.append(ident.name)
             idents.append(ident)
         if self.currentToken.type in (Token.cons.SEMICOLON, Token.cons.COLON):
             for ident in idents:
@@ -323,18 +359,17 @@ class Parser:
             node = ast.VariableDeclarationNode(kind, declaration)
             symbols = {}
         for declaration in node.variableDeclarators:
-            ident = declaration.identifier.identifier.value
+            ident = declaration.identifier.name
             if isinstance(declaration.init, ast.InlineFunctionNode):
                 declaration.init.setPosition(declaration.identifier)
-                prop  = SymbolTable.Symbol(Token.cons.FUNCTION, declaration.init)
+                symbolTable.declare(ident, Token.cons.FUNCTION, declaration.init)
             else:
-                prop  = SymbolTable.Symbol(kind.type, declaration.init)
-            symbolTable.define(ident, prop)
+                symbolTable.declare(ident, kind.type, declaration.init)
 
         return res.success(node), symbolTable, varnames
 
 
-    def inline_expr(self, symtab):
+    def inline_expr(self):
         res = ParseResult()
         
         if self.currentToken.type == Token.cons.LPAREN:
@@ -347,7 +382,7 @@ class Parser:
             param = res.register(self.factor())
             if res.error: return res
             if isinstance(param, ast.IdentifierNode):
-                param = param.identifier.value
+                param = param.name
             params.append(param)
             if self.currentToken.type == Token.cons.RPAREN:
                 break
@@ -370,10 +405,7 @@ class Parser:
         
         body = res.register(self.expr())
         if res.error: return res
-        funcSymtab = SymbolTable.SymbolTable()
-        funcSymtab.parent = symtab
-
-        node = ast.InlineFunctionNode(params, body, funcSymtab)
+        node = ast.InlineFunctionNode(params, body)
         return res.success(node)
 
     def return_stmt(self):
@@ -593,7 +625,7 @@ class Parser:
                 param = res.register(self.factor())
                 if res.error: return res
                 if isinstance(param, ast.IdentifierNode):
-                    param = param.identifier.value
+                    param = param.name
                 params.append(param)
                 if self.currentToken.type == Token.cons.RPAREN:
                     break
@@ -617,8 +649,7 @@ class Parser:
             return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected '{'"))
 
         block = self.function_block()
-        funcSymTab = block[1]
-        funcSymTab.parent = symtab
+        funcSymTab, varnames = block[1], block[2]
         block = res.register(block[0])
         if res.error: return res
 
@@ -628,7 +659,7 @@ class Parser:
         else:
             return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected '}'"))
     
-        symtab.define(functionName, SymbolTable.Symbol(Token.cons.FUNCTION, Type.Function(functionName, params, block, funcSymTab)))
+        symtab.declare(functionName, Token.cons.FUNCTION, SymbolTable.FunctionContext(functionName, params, block, funcSymTab, varnames))
 
     def member_expr(self, ident):
         res = ParseResult()
@@ -640,18 +671,18 @@ class Parser:
     def list_expr(self):
         res = ParseResult()
         elements = []
-        pos_start = self.currentToken.pos_start
+        first = self.currentToken
         res.register(self.advance())
         if res.error: return res
         if self.currentToken.type == Token.cons.RBRACK:
-            pos_end = self.currentToken.pos_start
+            last = self.currentToken
         else:
             while True:
                 el = res.register(self.expr())
                 if res.error: return res
                 elements.append(el)
                 if self.currentToken.type == Token.cons.RBRACK:
-                    pos_end = self.currentToken.pos_start
+                    last = self.currentToken
                     break
                 if self.currentToken.type == Token.cons.COMMA:
                     res.register(self.advance())
@@ -659,7 +690,7 @@ class Parser:
                 else:
                     return res.failure(Error.InvalidSyntaxError(self.currentToken.pos_start, self.currentToken.pos_end, "Expected ',' OR ']'"))
              
-        return res.success(ast.ListExpressionNode(elements, pos_start, pos_end))
+        return res.success(ast.ListExpressionNode(elements, first, last))
 
     def expr_stmt(self):
         res = ParseResult()
@@ -698,33 +729,34 @@ class Parser:
 
         return res.register(ast.CallExpressionNode(callee = ident, arguments = args))
 
-    def binary_expr(self, function, operators):
+    def binary_expr(self, minPower):
+        # Precedence climbing: parse one operand, then keep folding in operators that
+        # bind at least as tightly as 'minPower'. The right operand only takes operators
+        # binding strictly tighter, which makes every level left associative.
         res = ParseResult()
-        node = res.register(function())
+        node = res.register(self.factor())
         if res.error: return res
 
-        while self.currentToken.type in operators:
+        power = BINDING_POWER.get(self.currentToken.type)
+        while power is not None and power >= minPower:
             op = self.currentToken
-            res.register(self.advance())
-            right = res.register(function())
+            self.advance()
+            right = res.register(self.binary_expr(power + 1))
             if res.error: return res
-            node = ast.BinOpNode(node, op, right)
+            node = self.operation(node, op, right)
+            power = BINDING_POWER.get(self.currentToken.type)
         return res.success(node)
 
-    def expr(self):
-        return self.binary_expr(self.and_expr, (Token.cons.OR))
-
-    def and_expr(self):
-        return self.binary_expr(self.comp_expr, (Token.cons.AND))
+    def operation(self, left, op, right):
+        if op.type == Token.cons.AND or op.type == Token.cons.OR:
+            return ast.LogicalOpNode(left, op, right)
+        return ast.BinOpNode(left, op, right)
 
-    def comp_expr(self):
-        return self.binary_expr(self.arith_expr, (Token.cons.IN,Token.cons.EQ,Token.cons.NEQ,Token.cons.LT,Token.cons.GT,Token.cons.LTE,Token.cons.GTE))
+    def expr(self):
+        return self.binary_expr(LOWEST_POWER)
 
     def arith_expr(self):
-        return self.binary_expr(self.term, (Token.cons.CONCAT, Token.cons.PLUS, Token.cons.MINUS))
-
-    def term(self):
-        return self.binary_expr(self.factor, (Token.cons.MUL, Token.cons.DIV, Token.cons.MOD))
+        return self.binary_expr(BINDING_POWER[Token.cons.PLUS])
 
     def factor(self):
         res = ParseResult()
@@ -739,7 +771,7 @@ class Parser:
             return res.success(ast.NumberNode(tok))
         elif tok.type == Token.cons.INLINE:
             res.register(self.advance())
-            node = res.register(self.inline_expr(GLOBAL_SYMBOL_TABLE))
+            node = res.register(self.inline_expr())
             if res.error: return res
             return res.success(node)
         elif tok.type == Token.cons.IDENT:
@@ -1,20 +1,72 @@
+from bisect import bisect_right
+
+class Source:
+    # One per file. Tokens and nodes only keep integer offsets into it; the
+    # newline index is built the first time a line/column is actually asked for.
+    def __init__(self, fileName, text):
+        self.fileName = fileName
+        self.text = text
+        self.newlines = None
+
+    def lineCol(self, offset):
+        if self.newlines is None:
+            text = self.text
+            newlines = []
+            index = text.find('\n')
+            while index >= 0:
+                newlines.append(index)
+                index = text.find('\n', index + 1)
+            self.newlines = newlines
+        # A newline character already belongs to the line it starts
+        count = bisect_right(self.newlines, offset)
+        lastNewline = self.newlines[count - 1] if count else -1
+        return count + 1, offset - lastNewline
+
+    def position(self, offset, shift = 0):
+        return Position(self, offset, shift)
+
+
 class Position:
-    def __init__(self, index, lineno, colno, fn, ftxt):
-        self.index = index
-        self.line = lineno
-        self.col = colno
-        self.fileName = fn
-        self.fileText = ftxt
+    # 'offset' is the character the position points at; 'shift' moves the column
+    # past it, which is how the end of a token or node is expressed.
+    __slots__ = ('source', 'offset', 'shift')
+
+    def __init__(self, source, offset, shift = 0):
+        self.source = source
+        self.offset = offset
+        self.shift = shift
+
+    @property
+    def index(self):
+        return self.offset + 1 + self.shift
+
+    @property
+    def line(self):
+        return self.source.lineCol(self.offset)[0]
+
+    @property
+    def col(self):
+        return self.source.lineCol(self.offset)[1] + self.shift
+
+    @property
+    def fileName(self):
+        return self.source.fileName
+
+    @property
+    def fileText(self):
+        return self.source.text
 
-    def advance(self, currentChar = None):
-        self.index += 1
-        self.col += 1
 
-        if currentChar == '\n':
-            self.line += 1
-            self.col = 0
+class Span:
+    # Mixin for anything carrying start/end offsets into a Source
+    __slots__ = ()
 
-        return self
+    @property
+    def pos_start(self):
+        if self.source is None: return None
+        return Position(self.source, self.start)
 
-    def copy(self):
-        return Position(self.index, self.line, self.col, self.fileName, self.fileText)
\ No newline at end of file
+    @property
+    def pos_end(self):
+        if self.source is None: return None
+        return Position(self.source, self.end - 1, 1)
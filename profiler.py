@@ -0,0 +1,135 @@
+import time
+import collections
+import interpreter as Interpreter
+
+## --profile: where the wall time of a tree walker run goes. Every statement and every
+## function call is timed; the time between two of those events is charged to the
+## statement that was running (its self time), under the chain of functions it ran in,
+## named by their Context.display_name. Afterwards a report sorted by time lists Orion
+## source lines and functions, and the same times are written as collapsed stacks
+## ('<main>;fib;fib;prog.orion:3 1520', microseconds) for flamegraph.pl, speedscope and
+## the like. Only this subclass pays for the clock; a run without --profile never
+## touches it.
+
+clock = time.perf_counter
+
+
+class ProfilingInterpreter(Interpreter.Interpreter):
+    def __init__(self, program, args = None, GlobalSymtab = None):
+        super().__init__(program, args, GlobalSymtab)
+        # A frame is a small int standing for one chain of calls: frames[frame] is (caller's
+        # frame, display name), and ids maps that pair back to it. Each chain gets its int
+        # the first time it is called, so keys cost the same to hash however deep it is
+        self.frames = [(None, '<main>')]
+        self.ids = {}
+        self.frame = 0
+        # (frame, statement node) -> seconds, and statement node -> times it ran
+        self.times = collections.defaultdict(float)
+        self.hits = collections.Counter()
+        # display name -> calls
+        self.calls = collections.Counter()
+        self.current = self.last = None
+
+    def visit_ProgramNode(self, node, context):
+        # Setting the run up is not the program's time
+        self.current, self.last = (self.frame, node), clock()
+        for statement in node.statements:
+            self.statement(statement, context)
+
+    def visit_BlockStatementNode(self, node, context):
+        value = None
+        for statement in node.body:
+            value = self.statement(statement, context)
+        return value
+
+    def statement(self, node, context):
+        outer, times = self.current, self.times
+        now = clock()
+        times[outer] += now - self.last
+        self.current = current = (self.frame, node)
+        self.hits[node] += 1
+        self.last = now
+        try:
+            return self.visit(node, context)
+        finally:
+            now = clock()
+            times[current] += now - self.last
+            self.current = outer
+            self.last = now
+
+    def call(self, function, context):
+        outer, frame, times = self.current, self.frame, self.times
+        now = clock()
+        times[outer] += now - self.last
+        # Until its first statement starts, a call's time is its body's
+        name = context.display_name
+        key = (frame, name)
+        inner = self.ids.get(key)
+        if inner is None:
+            inner = self.ids[key] = len(self.frames)
+            self.frames.append(key)
+        self.frame = inner
+        self.current = current = (inner, function.body)
+        self.calls[name] += 1
+        self.last = now
+        try:
+            return super().call(function, context)
+        finally:
+            now = clock()
+            times[current] += now - self.last
+            self.frame, self.current = frame, outer
+            self.last = now
+
+def names(interp, frame):
+    # '<main>', ..., the innermost function
+    chain = []
+    while frame is not None:
+        frame, name = interp.frames[frame]
+        chain.append(name)
+    return chain[::-1]
+
+def location(node):
+    # 'file:line' of a node, and the text of that line. The program node itself has no
+    # position; its time is what passes between top-level statements
+    position = node.pos_start
+    if position is None:
+        return '<program>', ''
+    line = position.line
+    text = position.fileText.split('\n')[line - 1].strip()
+    return f'{position.fileName}:{line}', text
+
+def report(interp):
+    total = sum(interp.times.values())
+    lines = collections.defaultdict(lambda: [0.0, 0, ''])
+    functions = collections.defaultdict(lambda: [0.0, 0.0])
+    for (frame, node), seconds in interp.times.items():
+        where, text = location(node)
+        entry = lines[where]
+        entry[0] += seconds
+        entry[2] = entry[2] or text
+        chain = names(interp, frame)
+        functions[chain[-1]][0] += seconds
+        # Inclusive time counts a recursive function once per stack
+        for name in set(chain):
+            functions[name][1] += seconds
+    for node, hits in interp.hits.items():
+        lines[location(node)[0]][1] += hits
+
+    def percent(seconds):
+        return f'{seconds / total:6.1%}' if total else f'{"-":>6}'
+    out = [f'Profile: {total * 1000:,.1f} ms in {sum(interp.hits.values()):,} statements', '',
+           f'  {"self ms":>10}  {"%":>6}  {"hits":>10}  line']
+    for where, (seconds, hits, text) in sorted(lines.items(), key = lambda item: -item[1][0]):
+        out.append(f'  {seconds * 1000:10.1f}  {percent(seconds)}  {hits:10,}  {where}  {text}')
+    out += ['', f'  {"self ms":>10}  {"%":>6}  {"total ms":>10}  {"calls":>10}  function']
+    for name, (own, inclusive) in sorted(functions.items(), key = lambda item: -item[1][0]):
+        calls = f'{interp.calls[name]:10,}' if name in interp.calls else f'{"-":>10}'
+        out.append(f'  {own * 1000:10.1f}  {percent(own)}  {inclusive * 1000:10.1f}  {calls}  {name}')
+    return '\n'.join(out)
+
+def collapsed(interp):
+    # One 'frame;frame;...;file:line microseconds' line per stack, for flamegraph tools
+    stacks = collections.defaultdict(float)
+    for (frame, node), seconds in interp.times.items():
+        stacks[';'.join(names(interp, frame) + [location(node)[0]])] += seconds
+    return ''.join(f'{stack} {round(seconds * 1e6)}\n' for stack, seconds in sorted(stacks.items()) if seconds >= 5e-7)
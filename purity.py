@@ -0,0 +1,111 @@
+import ast
+import symTable as SymbolTable
+
+## Which 'func's and inline functions are pure: given the same arguments they give the
+## same result and do nothing else, so a call can be answered from a memo cache (see
+## memo.py). A body is pure when it
+##   - has no 'puts',
+##   - assigns and updates only its own locals,
+##   - reads no name but its own locals, the built-in constants and functions,
+##   - calls only pure built-ins and pure functions, by name.
+## Reading a global 'let' is out: it can change between calls, and until its declaration
+## has run every read evaluates its init node again. Calls through a local (a parameter
+## holding a function) are out because nothing is known about the callee.
+
+## Built-ins whose result depends only on their arguments
+PURE_BUILTINS = {'range', 'len', 'is_number', 'is_string', 'is_list', 'to_number', 'string', 'list', 'type', 'orionSignature'}
+
+## Built-in constants; they cannot be assigned
+CONSTANTS = {'MATH_PI', 'TRUE', 'FALSE', 'NULL'}
+
+
+class PurityAnalysis:
+    def analyse(self, program):
+        # The FunctionContexts and InlineFunctionNodes of the program that are pure
+        self.functions, self.shadowed = {}, set()
+        for name, kind, value in program.declarations.entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                self.functions[name] = value
+            else:
+                self.shadowed.add(name)
+        for name in self.shadowed:
+            self.functions.pop(name, None)
+        # Every function is taken to be pure until its own body or a callee says otherwise
+        # (function name or inline node) -> the names of the functions it calls
+        calls = {}
+        bodies = [(name, function.body, function.layout) for name, function in self.functions.items()]
+        bodies += [(node, node.body, node.layout) for node in inlineFunctions(program)]
+        for key, body, layout in bodies:
+            self.callees = set()
+            if layout is not None and self.pure(body, layout):
+                calls[key] = self.callees
+        changed = True
+        while changed:
+            changed = False
+            for key, callees in list(calls.items()):
+                if not callees <= calls.keys():
+                    del calls[key]
+                    changed = True
+        return {self.functions.get(key, key) for key in calls}
+
+    def pure(self, node, layout):
+        if isinstance(node, tuple):
+            return all(self.pure(item, layout) for item in node)
+        if not isinstance(node, ast.Node):
+            return True
+        if isinstance(node, ast.PutStatementNode):
+            return False
+        if isinstance(node, ast.InlineFunctionNode):
+            # Making one is harmless; calling it can only happen through a local.
+            # Its own body is analysed on its own.
+            return True
+        if isinstance(node, ast.IdentifierNode):
+            return self.read(node.name, layout)
+        if isinstance(node, ast.AssignmentExpressionNode) and node.left.name not in layout.slots:
+            return False
+        if isinstance(node, ast.UpdateExpressionNode) and node.argument.name not in layout.slots:
+            return False
+        if isinstance(node, ast.ForStatementNode) and node.init.variableDeclarators[0].identifier.name not in layout.slots:
+            return False
+        if isinstance(node, ast.CallExpressionNode):
+            if not isinstance(node.callee, ast.IdentifierNode) or node.callee.name in layout.slots:
+                return False
+        return all(self.pure(child, layout) for name, child in ast.fields(node))
+
+    def read(self, name, layout):
+        if name in layout.slots:
+            return True
+        if name in self.shadowed:
+            return False
+        if name in CONSTANTS or name in PURE_BUILTINS:
+            return True
+        if name in self.functions:
+            self.callees.add(name)
+            return True
+        return False
+
+
+def inlineFunctions(node):
+    # Every InlineFunctionNode in the program, function bodies and inline bodies included
+    if isinstance(node, tuple):
+        for item in node:
+            yield from inlineFunctions(item)
+    elif isinstance(node, ast.ProgramNode):
+        yield from inlineFunctions(node.statements)
+        for name, kind, value in node.declarations.entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                yield from inlineFunctions(value.body)
+    elif isinstance(node, ast.Node):
+        if isinstance(node, ast.InlineFunctionNode):
+            yield node
+        for name, child in ast.fields(node):
+            yield from inlineFunctions(child)
+
+
+def pureFunctions(program):
+    if not isinstance(program, ast.ProgramNode):
+        return set()
+    try:
+        return PurityAnalysis().analyse(program)
+    except RecursionError:
+        return set()
@@ -0,0 +1,132 @@
+import token as Token
+import visitor
+import typeSystem as Type
+import errors as Error
+import symTable as SymbolTable
+
+## What the Python generated by transpiler.py runs against. The generated module only
+## spells out the common paths; everything with the tree walker's more unusual rules
+## (dynamic lookups, hoisted initializers, member access) is a call into here, so the
+## output is the same as the other engines'.
+
+
+def fail(error):
+    raise Error.Failure(error)
+
+def call(function, args, node, context):
+    function.setPosition(node)
+    return function.execute(args, context)
+
+def item(i):
+    # The loop variable visit_ForStatementNode makes of one element
+    if isinstance(i, Type.String):
+        return Type.String(i.value)
+    elif isinstance(i, Type.List):
+        return Type.List(i.value)
+    elif type(i) == str:
+        return Type.String(i)
+    return Type.number(i.value)
+
+def member(value, prop, node, context):
+    if isinstance(value, Type.List) or isinstance(value, Type.String):
+        if prop.value > value.length - 1:
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, "Index out of range", context))
+        item = value.value[prop.value]
+        if type(item) == str:
+            item = Type.String(item)
+        elif type(item) == list:
+            item = Type.List(item)
+        elif type(item) == int or type(item) == float:
+            item = Type.number(item)
+        return item
+    # Not an error in the tree walker either
+    return None
+
+
+class Run:
+    # The state of one run of a transpiled program: its global scope and the Python
+    # function ('unit') generated for each program, function body and hoisted init node
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.globals = None
+        self.namespace = None
+        self.units = {}
+
+    def load(self, code, nodes):
+        # Defines the units; they can only run once bind() has given them a global scope
+        namespace = self.namespace = {
+            'Number': Type.Number, 'String': Type.String, 'List': Type.List,
+            'number': Type.number, 'BOOLEANS': Type.BOOLEANS,
+            'Symbol': SymbolTable.Symbol,
+            'Value': Type.Value, 'FUNCTION': Token.cons.FUNCTION, 'Range': Type.Range,
+            'fail': fail, 'call': call, 'item': item, 'member': member, 'TailCall': visitor.TailCall,
+            'lookup': self.lookup, 'resolve': self.resolve, 'fallback': self.fallback,
+            'inline': self.interpreter.inline,
+        }
+        for index, node in enumerate(nodes):
+            namespace[f'n{index}'] = node
+        exec(code, namespace)
+        for index, unit in namespace['UNITS'].items():
+            self.units[id(nodes[index])] = unit
+
+    def bind(self, globals):
+        self.globals = globals
+        self.namespace['G'] = globals.symbols
+
+    def unit(self, node):
+        unit = self.units.get(id(node))
+        if unit is None:
+            # Not transpiled (it was not in the tree when the module was generated)
+            return lambda context: self.fallback(node, context)
+        return unit
+
+    def fallback(self, node, context):
+        interpreter = self.interpreter
+        interpreter.symtab = context.symbolTable
+        return interpreter.visit(node, context)
+
+    def lookup(self, context, node):
+        # Interpreter.resolvedSymbol for an identifier the generated code could not resolve itself
+        symtab = context.symbolTable
+        symbol = None
+        if node.scope is None:
+            if symtab is self.globals:
+                symbol = self.globals.symbols.get(node.name)
+        elif type(symtab) is SymbolTable.Frame and symtab.layout is node.scope:
+            if node.slot is not None:
+                symbol = symtab.values[node.slot]
+            elif not symtab.symbols:
+                symbol = self.globals.symbols.get(node.name)
+        return self.resolve(context, node, symbol)
+
+    def resolve(self, context, node, symbol):
+        # The rest of visit_IdentifierNode
+        symbol = symbol or self.interpreter.findSymbol(node.name, context)
+        if symbol:
+            if symbol.kind == Token.cons.FUNCTION or isinstance(symbol.type, Type.Value):
+                return symbol.type
+            # A hoisted declaration that has not run yet: its init node
+            return self.unit(symbol.type)(context)
+        elif node.name in Token.cons.FUNCTION:
+            return node.name
+        raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f'Unkown Variable or Function \'{node.name}\'', context))
+
+
+class TranspiledFunction(Type.Function):
+    def __init__(self, functionName, functionArguments, functionBody, functionSymtab, layout, run):
+        super().__init__(functionName, functionArguments, functionBody, functionSymtab, layout)
+        self.unit = run.unit(functionBody)
+
+    def invoke(self, arguments, parentContext):
+        newContext = self.generate_new_context(parentContext)
+        self.check_and_populate_args(self.arg_names, arguments, newContext)
+        try:
+            while True:
+                try:
+                    return self.unit(newContext)
+                except visitor.TailCall as call:
+                    self.reenter(call.arguments, newContext)
+        except Error.Failure as failure:
+            # Each call reports the error on its way out, like the Interpret it replaces
+            print(failure.error.as_string())
+            raise
@@ -0,0 +1,79 @@
+import ast
+import symTable as SymbolTable
+
+## Orion has two static levels: the frame of the function being run and the global
+## scope (functions do not nest; inline functions get a frame of their own). So the
+## (depth, slot) of an identifier is stored as the FrameLayout it was resolved in
+## ('scope', None at the top level) and its index there ('slot', None when the name
+## is not one of that function's own and has to come from the global scope).
+##
+## A 'ret' whose value is a call of the function it is in is marked as a tail call
+## ('tail'); engines run it by starting the function over in the frame it already has.
+##
+## Name lookup stays dynamic underneath: an identifier can be evaluated in another
+## frame than its own (hoisted initializers run wherever the variable is first read,
+## inline functions see their caller's locals), so the interpreter only takes the
+## indexed path when the current frame has the layout the identifier was resolved in.
+class Resolver:
+    def resolve(self, program):
+        # The FunctionContext whose body is being walked
+        self.function = None
+        self.walk(program.statements, None)
+        for name, kind, value in program.declarations.entries:
+            # Every 'func' is declared in the program's table, wherever it appears
+            if isinstance(value, SymbolTable.FunctionContext):
+                value.layout = SymbolTable.FrameLayout(list(value.args) + localNames(value.body))
+                self.function = value
+                self.walk(value.body, value.layout)
+                self.function = None
+        return program
+
+    def walk(self, node, layout):
+        if isinstance(node, tuple):
+            for item in node:
+                self.walk(item, layout)
+        elif isinstance(node, ast.IdentifierNode):
+            node.scope = layout
+            node.slot = layout.slots.get(node.name) if layout else None
+        elif isinstance(node, ast.InlineFunctionNode):
+            node.layout = SymbolTable.FrameLayout(node.params)
+            self.walk(node.body, node.layout)
+        elif isinstance(node, ast.Node):
+            if isinstance(node, ast.ReturnNode):
+                node.tail = self.selfCall(node.expr, layout)
+            for name, child in ast.fields(node):
+                self.walk(child, layout)
+
+    def selfCall(self, node, layout):
+        # Whether 'node' calls the function being walked by its own name (which none of
+        # its locals hides), passing exactly as many arguments as it has parameters
+        function = self.function
+        if function is None or layout is not function.layout:
+            return False
+        if not isinstance(node, ast.CallExpressionNode) or not isinstance(node.callee, ast.IdentifierNode):
+            return False
+        name = node.callee.name
+        return name == function.name and name not in layout.slots and len(node.arguments) == len(function.args)
+
+
+def localNames(node):
+    # Every name a 'let' inside the function body defines (at run time those all land
+    # in the call's own table, however deeply the statement is nested)
+    names = []
+    if isinstance(node, tuple):
+        for item in node:
+            names.extend(localNames(item))
+    elif isinstance(node, ast.VariableDeclarationNode):
+        names.extend(declarator.identifier.name for declarator in node.variableDeclarators)
+    elif isinstance(node, ast.Node) and not isinstance(node, ast.InlineFunctionNode):
+        for name, child in ast.fields(node):
+            names.extend(localNames(child))
+    return names
+
+
+def resolve(program):
+    try:
+        return Resolver().resolve(program)
+    except RecursionError:
+        # Identifiers left unresolved simply take the dynamic lookup path
+        return program
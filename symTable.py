@@ -1,18 +1,21 @@
-import visitor as Visitor
 import token as Token
 import ast
 import errors as Error
 
 class Symbol:
+    __slots__ = ('kind', 'type')
+
     def __init__(self, kind, type_):
         self.kind = kind
         self.type = type_
 
     def copy(self):
-        return self
+        return Symbol(self.kind, self.type)
 
 
 class SymbolTable:
+    __slots__ = ('symbols', 'parent')
+
     def __init__(self, parent = None):
         self.symbols = {}
         self.parent = parent
@@ -26,28 +29,103 @@ class SymbolTable:
     def define(self, name, value):
         self.symbols[name] = value
 
-    def update(self, name, value, context):
-        res = Visitor.RTResult()
+    def update(self, name, value, context, node):
+        # 'node' is what assigns, which an error points at
         if self.symbols[name].kind == Token.cons.CONST:
-            return res.failure(Error.RTError(value.pos_start, value.pos_end, f"Constant variable '{name}' is immutable", context))
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f"Constant variable '{name}' is immutable", context))
         # type.value = value.value
         self.symbols[name].type = value
 
     def remove(self, name):
         del self.symbols[name]
 
+    def clear(self):
+        self.symbols = {}
+
+
+class FrameLayout:
+    # Slot numbers for every name a function's frame can hold: its parameters and the
+    # names its own 'let' statements define. Worked out once by the resolver.
+    def __init__(self, names):
+        self.slots = {name: index for index, name in enumerate(dict.fromkeys(names))}
+
+
+class Frame(SymbolTable):
+    # The symbol table of one function call, with its names in a fixed-size list.
+    # Names outside the layout still work through 'symbols', like any SymbolTable.
+    __slots__ = ('layout', 'values')
+
+    def __init__(self, layout, parent = None):
+        self.symbols = {}
+        self.parent = parent
+        self.layout = layout
+        self.values = [None] * len(layout.slots)
+
+    def get(self, name):
+        index = self.layout.slots.get(name)
+        value = self.values[index] if index is not None else self.symbols.get(name)
+        if value is None and self.parent:
+            return self.parent.get(name)
+        return value
+
+    def define(self, name, value):
+        index = self.layout.slots.get(name)
+        if index is None:
+            self.symbols[name] = value
+        else:
+            self.values[index] = value
+
+    def update(self, name, value, context, node):
+        index = self.layout.slots.get(name)
+        if index is None or self.values[index] is None:
+            return super().update(name, value, context, node)
+        if self.values[index].kind == Token.cons.CONST:
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f"Constant variable '{name}' is immutable", context))
+        self.values[index].type = value
+
+    def remove(self, name):
+        index = self.layout.slots.get(name)
+        if index is None or self.values[index] is None:
+            return super().remove(name)
+        self.values[index] = None
+
+    def clear(self):
+        self.symbols = {}
+        self.values = [None] * len(self.layout.slots)
+
+
+class DeclarationTable:
+    # What a scope hoists, in source order: (name, kind, init node or FunctionContext).
+    # The parser fills one for the program and one per function; symbols are only
+    # created from them when a run starts, so a parsed program can be run many times.
+    def __init__(self):
+        self.entries = []
+
+    def declare(self, name, kind, value):
+        self.entries.append((name, kind, value))
+
 
 class Context:
-    def __init__(self, display_name, parent = None, parent_entry_position = None):
+    # One per call. 'entry' is the call node it was entered from; its position is only
+    # worked out if a traceback needs it. 'function' is the Function being called.
+    __slots__ = ('display_name', 'parent', 'entry', 'function', 'symbolTable')
+
+    def __init__(self, display_name, parent = None, entry = None, function = None):
         self.display_name = display_name
         self.parent = parent
-        self.parent_entry_position = parent_entry_position
+        self.entry = entry
+        self.function = function
         self.symbolTable = None
 
+    @property
+    def parent_entry_position(self):
+        return self.entry.pos_start if self.entry else None
+
 class FunctionContext:
     def __init__(self, functionName, functionArgs, functionBody, symtab, varnames):
         self.name     = functionName
         self.args     = functionArgs
         self.body     = functionBody
         self.symtab   = symtab
-        self.varnames = varnames
\ No newline at end of file
+        self.varnames = varnames
+        self.layout   = None
\ No newline at end of file
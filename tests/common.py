@@ -0,0 +1,46 @@
+## Shared helpers for the tests in this folder. Run them from inside it, e.g.
+## `cd tests && python3 -m unittest`: the interpreter ships modules called 'token' and
+## 'ast', which shadow the standard library the test runner itself needs. So every
+## program runs the way a user runs it, through main.py in a Python of its own.
+import os
+import sys
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, 'examples')
+MAIN = os.path.join(ROOT, 'main.py')
+
+## Every engine --engine can choose; they must print the same
+ENGINES = ['tree', 'closure', 'vm', 'python']
+
+
+def run(fileName, *options, stdin = '', cache = False):
+    # main.py's exit status, output and errors for one run of 'fileName'
+    if not cache:
+        options = ('--no-cache',) + options
+    process = subprocess.run([sys.executable, MAIN, fileName, *options],
+                             input = stdin, capture_output = True, text = True, cwd = ROOT)
+    return process.returncode, process.stdout, process.stderr
+
+def source(text):
+    # A temporary .orion file holding 'text'; the caller deletes it
+    handle, fileName = tempfile.mkstemp(suffix = '.orion')
+    with os.fdopen(handle, 'w') as file:
+        file.write(text)
+    return fileName
+
+def runSource(text, *options, stdin = ''):
+    fileName = source(text)
+    try:
+        return run(fileName, *options, stdin = stdin)
+    finally:
+        os.remove(fileName)
+
+def everyEngine(text, *options, stdin = ''):
+    # {engine: (exit status, output, errors)} for 'text' run on each engine
+    fileName = source(text)
+    try:
+        return {engine: run(fileName, '--engine', engine, *options, stdin = stdin) for engine in ENGINES}
+    finally:
+        os.remove(fileName)
@@ -0,0 +1,21 @@
+import unittest
+import common
+
+
+class RandomTest(unittest.TestCase):
+    def test_random_on_every_engine(self):
+        program = 'let n = random(10);\nputs n >= 1 && n <= 10, is_number(n);\n'
+        for engine in common.ENGINES:
+            with self.subTest(engine = engine):
+                status, output, errors = common.runSource(program, '--engine', engine)
+                self.assertEqual(errors, '')
+                self.assertEqual(status, 0)
+                self.assertEqual(output, '11\n')
+
+    def test_random_needs_a_number(self):
+        status, output, errors = common.runSource('puts random("ten");\n')
+        self.assertIn("'random' argument should be number", output + errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import shutil
+import tempfile
+import unittest
+import common
+
+PROGRAM = 'let x = 1;\nputs x / 0;\n'
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_a_moved_script_reports_its_new_path(self):
+        old, new = os.path.join(self.directory, 'x'), os.path.join(self.directory, 'y')
+        os.mkdir(old)
+        with open(os.path.join(old, 'e.orion'), 'w') as file:
+            file.write(PROGRAM)
+        for engine in common.ENGINES:
+            with self.subTest(engine = engine):
+                output = common.run(os.path.join(old, 'e.orion'), '--engine', engine, cache = True)[1]
+                self.assertIn(f'File {old}/e.orion, line 2', output)
+        cached = os.path.join(old, '__orioncache__', 'e.orion.orionc')
+        self.assertTrue(os.path.exists(cached))
+
+        # The cache folder moves with the script, and is still good for the same text
+        os.rename(old, new)
+        stamp = os.stat(os.path.join(new, '__orioncache__', 'e.orion.orionc')).st_mtime_ns
+        for engine in common.ENGINES:
+            with self.subTest(engine = engine):
+                output = common.run(os.path.join(new, 'e.orion'), '--engine', engine, cache = True)[1]
+                self.assertIn(f'File {new}/e.orion, line 2', output)
+                self.assertNotIn(old, output)
+        self.assertEqual(os.stat(os.path.join(new, '__orioncache__', 'e.orion.orionc')).st_mtime_ns, stamp)
+
+
+if __name__ == '__main__':
+    unittest.main()
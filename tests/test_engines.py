@@ -0,0 +1,113 @@
+import unittest
+import common
+
+## Programs every engine must run alike; each with what it must print, or None to check
+## only that the engines agree
+PROGRAMS = {
+    'hoisting': ('''
+puts twice(4);
+func twice(n) { ret double(n) * 2; }
+func double(n) { ret n + n; }
+let square = inline(x) -> x * x;
+puts square(7);
+''', '16\n49\n'),
+    'mutual recursion': ('''
+func isEven(n) { if (n == 0) { ret 1; } ret isOdd(n - 1); }
+func isOdd(n) { if (n == 0) { ret 0; } ret isEven(n - 1); }
+puts isEven(10);
+puts isOdd(7);
+puts isEven(7);
+func fib(n) { if (n < 2) { ret n; } ret fib(n - 1) + fib(n - 2); }
+puts fib(15);
+''', '1\n1\n0\n610\n'),
+    'closures over outer variables': ('''
+let base = 10;
+func add(x) { ret x + base; }
+let win = inline(x) -> x == base;
+base = 20;
+puts add(1);
+puts win(20);
+''', '21\n1\n'),
+    'while and if/elif/else': ('''
+let i, total = 0, 0;
+while (i < 10) {
+    if (i % 2 == 0) { total += i; } elif (i == 5) { total -= 1; } else { total++; }
+    i++;
+}
+puts total;
+let result, count = [], 0;
+while (count < 5) { count++; result = result..[count]; }
+puts result;
+''', '23\n[1, 2, 3, 4, 5]\n'),
+    'for over lists, ranges and strings': ('''
+for (let name : ["a", "b"]) { puts name .. "!"; }
+for (let k : range(3)) { puts k * k; }
+for (let c : "xy") { puts c; }
+for (let row : [[1, 2], [3]]) { puts len(row); }
+''', 'a!\nb!\n0\n1\n4\nx\ny\n2\n1\n'),
+    'logical operators short-circuit': ('''
+func loud(x) { puts "called"; ret x; }
+puts 0 && loud(1);
+puts 1 || loud(1);
+puts 1 && loud(0);
+''', '0\n1\ncalled\n0\n'),
+}
+
+## Programs that stop with a runtime error: the lines the traceback must hold, in order
+ERRORS = {
+    'error inside nested calls': ('''
+func inner(x) { ret x / 0; }
+func outer(x) { ret inner(x) + 1; }
+puts "before";
+puts outer(3);
+puts "after";
+''', ['before', 'Traceback (Most Recent Call Last):', 'line 5, in <main>', 'line 3, in outer',
+      'line 2, in inner', 'Runtime Error: Division by zero', 'func inner(x) { ret x / 0; }']),
+    'unknown variable': ('''
+puts 1;
+puts missing + 1;
+''', ['1', "line 3, in <main>", "Runtime Error: Unkown Variable or Function 'missing'", 'puts missing + 1;']),
+    'missing argument': ('''
+func f(a, b) { ret a + b; }
+puts f(1, 2);
+puts f(1);
+''', ['3', 'line 4, in <main>', 'line 4, in f', "Runtime Error: Function 'f' requires 2 arguments, 1 provided"]),
+    'index out of range': ('''
+let xs = [1, 2, 3];
+puts xs[2];
+puts xs[5];
+''', ['3', 'line 4, in <main>', 'Runtime Error: Index out of range', 'puts xs[5];']),
+}
+
+
+class EngineTest(unittest.TestCase):
+    def runEverywhere(self, program):
+        # Every engine's run, after checking they all match the tree walker's
+        runs = common.everyEngine(program)
+        for engine, outcome in runs.items():
+            with self.subTest(engine = engine):
+                self.assertEqual(outcome, runs['tree'])
+        return runs['tree']
+
+    def test_programs_print_the_same_on_every_engine(self):
+        for name, (program, expected) in PROGRAMS.items():
+            with self.subTest(program = name):
+                status, output, errors = self.runEverywhere(program)
+                self.assertEqual((status, errors), (0, ''))
+                self.assertEqual(output, expected)
+
+    def test_errors_and_tracebacks_are_the_same_on_every_engine(self):
+        for name, (program, lines) in ERRORS.items():
+            with self.subTest(program = name):
+                status, output, errors = self.runEverywhere(program)
+                self.assertEqual(errors, '')
+                self.assertNotIn('after', output)
+                position = 0
+                for line in lines:
+                    found = output.find(line, position)
+                    self.assertGreaterEqual(found, 0, f'{line!r} missing from:\n{output}')
+                    position = found + len(line)
+
+
+if __name__ == '__main__':
+    unittest.main()
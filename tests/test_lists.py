@@ -0,0 +1,104 @@
+import unittest
+import common
+
+
+class ListTest(unittest.TestCase):
+    def assertPrints(self, program, expected):
+        for engine, (status, output, errors) in common.everyEngine(program).items():
+            with self.subTest(engine = engine):
+                self.assertEqual((status, errors), (0, ''))
+                self.assertEqual(output, expected)
+
+    def test_concat_appends_a_number_or_string_as_one_item(self):
+        # The same for a List, a Range and a List of a range
+        self.assertPrints('''
+puts [0, 1] .. 2;
+puts [0, 1] .. "ab";
+puts range(2) .. 2;
+puts range(2) .. "ab";
+puts list(range(2)) .. "ab";
+puts #(range(2) .. "ab");
+''', '[0, 1, 2]\n[0, 1, ab]\n[0, 1, 2]\n[0, 1, ab]\n[0, 1, ab]\n3\n')
+
+    def test_concat_of_ranges_and_lists(self):
+        self.assertPrints('''
+puts range(2) .. range(3);
+puts [9] .. range(2);
+puts range(2) .. [9];
+''', '[0, 1, 0, 1, 2]\n[9, 0, 1]\n[0, 1, 9]\n')
+
+
+    def test_concat_on_packed_lists(self):
+        # '* 1' packs the List into an array first
+        self.assertPrints('''
+let xs = [1, 2] * 1;
+puts xs .. "ab";
+puts xs .. 3;
+puts xs .. [3];
+puts [0] .. xs;
+puts xs .. xs;
+puts range(2) .. xs;
+puts xs .. range(2);
+''', '[1, 2, ab]\n[1, 2, 3]\n[1, 2, 3]\n[0, 1, 2]\n[1, 2, 1, 2]\n[0, 1, 1, 2]\n[1, 2, 0, 1]\n')
+
+
+    def test_boxed_lists_apply_the_operator_to_each_item(self):
+        self.assertPrints('''
+puts ["a", "b"] + 1;
+puts [[1, 2], [3]] + 1;
+puts [1, "a"] * 2;
+''', '[a1, b1]\n[[2, 3], [4]]\n[2, aa]\n')
+
+    def test_list_operators_report_runtime_errors(self):
+        # Every operator, packed or boxed, fails the same way: an Orion error, not a crash
+        cases = [
+            ('[1, 2] * "a"', 'Illegal operation'),
+            ('[1, 2] == "a"', 'Illegal operation'),
+            ('["a"] - [1, 2]', 'Two lists must be of the same size'),
+            ('[1, "x"] + [1]', 'Two lists must be of the same size'),
+            ('[1, 2] + [1]', 'Two lists must be of the same size'),
+            ('[1, 2] < [1]', 'Two lists must be of the same size'),
+            ('[1, 2] / 0', 'Division by zero'),
+        ]
+        for expression, message in cases:
+            for engine, (status, output, errors) in common.everyEngine(f'puts {expression};\n').items():
+                with self.subTest(expression = expression, engine = engine):
+                    self.assertEqual(errors, '')
+                    self.assertIn(f'Runtime Error: {message}', output)
+
+
+    def test_a_list_comparison_is_true_when_not_empty(self):
+        # The README's rule: the comparison is a List, and a non-empty List is true
+        self.assertPrints('''
+if ([1, 2] == [3, 4]) { puts "not empty"; }
+let same = [1, 2] == [3, 4];
+if (same) { puts same; }
+if ([1, 2] != [1, 2] && 1) { puts "also"; }
+let i = 0;
+while ([i] < [2] && i < 5) { i++; }
+puts i;
+''', 'not empty\n[0, 0]\nalso\n5\n')
+
+    def test_concat_leaves_the_list_it_grew_from_unchanged(self):
+        # 'a .. [x]' grows a's items in place; b and c both branch from a and must not
+        # see each other's items, and a must keep its own count
+        self.assertPrints('''
+let a = [1, 2];
+let b = a .. [3];
+let c = a .. [4];
+let d = b .. [5];
+let e = c .. [6];
+puts a; puts b; puts c; puts d; puts e;
+let built = [];
+let i = 0;
+while (i < 3) { built = built .. [i]; i++; }
+let left = built .. ["x"];
+let right = built .. ["y"];
+puts built; puts left; puts right;
+for (let item : built) { puts item; }
+''', '[1, 2]\n[1, 2, 3]\n[1, 2, 4]\n[1, 2, 3, 5]\n[1, 2, 4, 6]\n'
+     '[0, 1, 2]\n[0, 1, 2, x]\n[0, 1, 2, y]\n0\n1\n2\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+import common
+
+
+class FoldingTest(unittest.TestCase):
+    def assertSameWithoutFolding(self, program):
+        fileName = common.source(program)
+        try:
+            for engine in common.ENGINES:
+                with self.subTest(engine = engine):
+                    folded = common.run(fileName, '--engine', engine)
+                    plain = common.run(fileName, '--engine', engine, '--no-optimize')
+                    self.assertEqual(folded, plain)
+        finally:
+            os.remove(fileName)
+
+    def test_operators_a_string_lacks_are_left_for_run_time(self):
+        # Never run, so never an error
+        program = 'if (0) { puts "a" == "a"; puts "a" < 3; puts "a" % 2; }\nputs "ok";\n'
+        self.assertEqual(common.runSource(program)[1], 'ok\n')
+        self.assertSameWithoutFolding(program)
+
+    def test_constant_errors_still_happen_at_run_time(self):
+        self.assertSameWithoutFolding('puts 1;\nputs 4 / 0;\n')
+
+
+class ExamplesTest(unittest.TestCase):
+    # Enough guesses for examples/guessNumber.orion to run out of chances
+    STDIN = '50\n' * 10
+
+    def test_examples_print_the_same_without_folding(self):
+        names = sorted(name for name in os.listdir(common.EXAMPLES) if name.endswith('.orion'))
+        self.assertTrue(names)
+        for name in names:
+            fileName = os.path.join(common.EXAMPLES, name)
+            with open(fileName) as file:
+                # What a program drawing random numbers prints differs run to run
+                drawsRandom = 'random(' in file.read()
+            for engine in common.ENGINES:
+                with self.subTest(example = name, engine = engine):
+                    folded = common.run(fileName, '--engine', engine, stdin = self.STDIN)
+                    plain = common.run(fileName, '--engine', engine, '--no-optimize', stdin = self.STDIN)
+                    self.assertEqual(folded[0], 0, folded[2])
+                    self.assertEqual(plain[0], 0, plain[2])
+                    if drawsRandom:
+                        self.assertEqual((folded[2], plain[2]), ('', ''))
+                    else:
+                        self.assertEqual(folded, plain)
+
+
+if __name__ == '__main__':
+    unittest.main()
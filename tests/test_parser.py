@@ -0,0 +1,43 @@
+import unittest
+import common
+
+## Each expression with the value its grouping gives; the comment is what a wrong grouping
+## would print instead
+GROUPINGS = [
+    # Left associativity within a level
+    ('10 - 3 - 2', '5'),            # 10 - (3 - 2) = 9
+    ('12 / 2 / 3', '2.0'),          # 18.0
+    ('17 % 10 % 4', '3'),           # 17 % 2 = 1
+    ('3 > 2 > 1', '0'),             # 3 > 1 = 1
+    # Unary operators bind tighter than any binary one
+    ('!0 * 5', '5'),                # !(0 * 5) = 1
+    ('!0 + 1', '2'),                # !(0 + 1) = 0
+    ('-7 % 3', '2'),                # -(7 % 3) = -1
+    ('-2 * 3 + 10', '4'),
+    # '..' shares the level of '+' and '-', below '*'
+    ('"a" .. 1 + 2', 'a12'),        # "a" .. 3 = a3
+    ('[1] .. [2] + 1', '[2, 3]'),   # [1] .. [3] = [1, 3]
+    ('"a" .. 2 * 3', 'a6'),         # ("a" .. 2) * 3 = a2a2a2
+    # Comparisons sit below arithmetic and above '&&', which is above '||'
+    ('2 + 2 == 4', '1'),            # 2 + (2 == 4) = 2
+    ('1 < 2 && 3 > 4', '0'),
+    ('1 || 0 && 0', '1'),           # (1 || 0) && 0 = 0
+    ('0 && 0 || 1', '1'),           # 0 && (0 || 1) = 0
+    ('1 == 2 || 3 == 3', '1'),
+]
+
+
+class PrecedenceTest(unittest.TestCase):
+    def test_binding_powers_and_associativity(self):
+        program = ''.join(f'puts {expression};\n' for expression, value in GROUPINGS)
+        expected = [value for expression, value in GROUPINGS]
+        # Without the optimizer each engine evaluates the tree itself instead of a folded constant
+        for options in ((), ('--no-optimize',)):
+            for engine, (status, output, errors) in common.everyEngine(program, *options).items():
+                with self.subTest(engine = engine, options = options):
+                    self.assertEqual((status, errors), (0, ''))
+                    self.assertEqual(output.splitlines(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import common
+
+
+class StringTest(unittest.TestCase):
+    def test_concat_leaves_the_rope_it_grew_from_unchanged(self):
+        # Past FLAT_STRING_LENGTH (256) a String is a rope whose parts '..' and '+' grow in
+        # place; t and u both branch from s and must not see each other's pieces
+        program = '''
+let s = "";
+let i = 0;
+while (i < 30) { s = s .. "abcdefghij"; i++; }
+let t = s .. "A";
+let u = s .. "B";
+let v = t .. "C";
+let w = u + "D";
+puts len(s); puts len(t); puts len(u); puts len(v); puts len(w);
+puts s; puts t; puts u; puts v; puts w;
+let x = s .. "E";
+puts x; puts s;
+'''
+        s = 'abcdefghij' * 30
+        expected = [300, 301, 301, 302, 302, s, s + 'A', s + 'B', s + 'AC', s + 'BD', s + 'E', s]
+        for engine, (status, output, errors) in common.everyEngine(program).items():
+            with self.subTest(engine = engine):
+                self.assertEqual((status, errors), (0, ''))
+                self.assertEqual(output.splitlines(), [str(line) for line in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
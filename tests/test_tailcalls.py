@@ -0,0 +1,31 @@
+import os
+import unittest
+import common
+
+DEPTH = 1000000
+SUM = '''
+func sum(n, total) {{
+    if (n == 0) {{ ret total; }}
+    ret sum(n - 1, total + n);
+}}
+puts sum({0}, 0);
+'''
+
+
+class TailCallTest(unittest.TestCase):
+    def test_self_tail_recursion_a_million_deep(self):
+        # Far past Python's recursion limit: only runs if the tail calls reuse the frame
+        fileName = common.source(SUM.format(DEPTH))
+        try:
+            for engine in common.ENGINES:
+                with self.subTest(engine = engine):
+                    status, output, errors = common.run(fileName, '--engine', engine)
+                    self.assertNotIn('RecursionError', errors)
+                    self.assertEqual((status, errors), (0, ''))
+                    self.assertEqual(output, f'{DEPTH * (DEPTH + 1) // 2}\n')
+        finally:
+            os.remove(fileName)
+
+
+if __name__ == '__main__':
+    unittest.main()
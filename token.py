@@ -1,22 +1,17 @@
 import constant as cons
+from position import Span
 
 
-# TODO: remember to add position for better debugging
-class Token:
-    def __init__(self, Type, value, pos_start = None, pos_end = None):
+class Token(Span):
+    # Positions are plain offsets into 'source'; see position.Span for pos_start/pos_end
+    __slots__ = ('type', 'value', 'start', 'end', 'source')
+
+    def __init__(self, Type, value, start = None, end = None, source = None):
         self.type = Type
         self.value = value
-        self.pos_start = None
-        self.pos_end = None
-
-        if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
-
-        if pos_end:
-            self.pos_end = pos_end
+        self.start = start
+        self.end = end
+        self.source = source
 
     def __repr__(self):
         return f'Token({self.type}, {self.value})'
-
@@ -0,0 +1,499 @@
+import os
+import hashlib
+import marshal
+import token as Token
+import symTable as SymbolTable
+import interpreter as Interpreter
+import pythonRuntime as Runtime
+import errors as Error
+import optimizer as Optimizer
+import astCache
+import ast
+
+## Orion -> Python. A program becomes one Python module with a function ('unit') for
+## the program itself, one per Orion function and inline function body, and one per
+## hoisted init node. Units take the Context they run in; temporaries are Python locals,
+## parameters and 'let' names of a function are read straight out of its Frame, and a
+## 'for' over a Range is a native Python loop. The nodes the code needs are module
+## globals n0, n1, ... numbered by nodeTable(), so a compiled module can be cached on
+## disk and run against the same tree parsed (or unpickled) again.
+
+EXTENSION = '.orionpy'
+MAGIC = b'ORIONPY\x01\n'
+
+## Python line -> node is kept for every module, so tracebacks can name the Orion line
+GENERATED = '<orion:{}>'
+
+## The Python operator a comparison of two Numbers' values is written as
+COMPARISONS = {
+    Token.cons.EQ: '==', Token.cons.LT: '<', Token.cons.GT: '>',
+    Token.cons.LTE: '<=', Token.cons.GTE: '>=', Token.cons.NEQ: '!=',
+}
+
+
+def nodeTable(program):
+    # Every node of the program in a fixed order: the tree first, then function bodies
+    nodes, seen = [], set()
+    def walk(node):
+        if isinstance(node, (list, tuple)):
+            for item in node: walk(item)
+        elif isinstance(node, ast.Node) and id(node) not in seen:
+            seen.add(id(node))
+            nodes.append(node)
+            for name, child in ast.fields(node):
+                walk(child)
+    def declarations(table):
+        for name, kind, value in table.entries:
+            if isinstance(value, SymbolTable.FunctionContext):
+                walk(value.body)
+                declarations(value.symtab)
+            else:
+                walk(value)
+    walk(program)
+    declarations(program.declarations)
+    return nodes
+
+def functions(table):
+    # Every FunctionContext a declaration table holds, nested tables included
+    for name, kind, value in table.entries:
+        if isinstance(value, SymbolTable.FunctionContext):
+            yield value
+            yield from functions(value.symtab)
+
+def hoisted(table):
+    # The init nodes a declaration table evaluates on first read
+    for name, kind, value in table.entries:
+        if isinstance(value, SymbolTable.FunctionContext):
+            yield from hoisted(value.symtab)
+        elif kind != Token.cons.FUNCTION and isinstance(value, ast.Node):
+            yield name, value
+
+
+class Unit:
+    # The Python source of one generated function
+    def __init__(self, name, layout, frame):
+        self.name = name
+        # The FrameLayout every run of the unit has (None at the top level), and whether
+        # that is certain: hoisted init nodes run in whichever frame reads them
+        self.layout = layout
+        self.frame = frame
+        self.lines = []
+        self.nodes = []
+        self.indent = 1
+        self.temps = 0
+
+
+class Transpiler:
+    def __init__(self, program):
+        self.program = program
+        self.nodes = nodeTable(program)
+        self.index = {id(node): index for index, node in enumerate(self.nodes)}
+        self.units = {}
+        self.pending = []
+        self.unit = None
+        self.node = None
+
+    def transpile(self):
+        # (Python source, the node index of each of its lines)
+        self.add(self.program, 'main', None, True)
+        for function in functions(self.program.declarations):
+            self.add(function.body, function.name, function.layout, True)
+        for name, init in hoisted(self.program.declarations):
+            self.add(init, f'init_{name}', None, False)
+        lines, nodes = ['## Generated by transpiler.py; do not edit'], [-1]
+        names = {}
+        while self.pending:
+            node, unit = self.pending.pop(0)
+            self.unit = unit
+            self.write(node)
+            unit.name = self.pythonName(unit.name, names)
+            lines.append(f'def {unit.name}(context):')
+            nodes.append(self.index[id(node)])
+            lines.extend(unit.lines)
+            nodes.extend(unit.nodes)
+            lines.append('')
+            nodes.append(-1)
+        lines.append('UNITS = {' + ', '.join(f'{self.index[key]}: {unit.name}' for key, unit in self.units.items()) + '}')
+        nodes.append(-1)
+        return '\n'.join(lines) + '\n', nodes
+
+    def add(self, node, name, layout, frame):
+        if id(node) not in self.units and id(node) in self.index:
+            unit = self.units[id(node)] = Unit(name, layout, frame)
+            self.pending.append((node, unit))
+
+    def pythonName(self, name, names):
+        name = 'orion_' + name
+        names[name] = names.get(name, 0) + 1
+        return name if names[name] == 1 else f'{name}_{names[name]}'
+
+    ## WRITING
+    def line(self, text):
+        self.unit.lines.append('    ' * self.unit.indent + text)
+        self.unit.nodes.append(self.index.get(id(self.node), -1))
+
+    def temp(self):
+        self.unit.temps += 1
+        return f't{self.unit.temps}'
+
+    def ref(self, node):
+        return f'n{self.index[id(node)]}' if id(node) in self.index else 'None'
+
+    def write(self, node):
+        unit = self.unit
+        self.node = node
+        self.line('S = context.symbolTable')
+        if unit.frame and unit.layout is not None:
+            self.line('V = S.values')
+        if isinstance(node, ast.ProgramNode):
+            self.value(node)
+            self.line('return None')
+        else:
+            self.line(f'return {self.value(node)}')
+
+    def value(self, node):
+        # Writes the statements evaluating 'node'; returns the local holding its value
+        method = getattr(self, 'write_' + type(node).__name__, self.fallback)
+        outer, self.node = self.node, node
+        try:
+            return method(node)
+        finally:
+            self.node = outer
+
+    def fallback(self, node):
+        result = self.temp()
+        self.line(f'{result} = fallback({self.ref(node)}, context)')
+        return result
+
+    def block(self, node):
+        # A nested Python block: statements written inside are indented one more level
+        return _Indented(self.unit)
+
+    ## STATEMENTS
+    def write_ProgramNode(self, node):
+        for statement in node.statements:
+            self.value(statement)
+        return 'None'
+
+    def write_BlockStatementNode(self, node):
+        if not node.body:
+            return 'None'
+        for statement in node.body:
+            value = self.value(statement)
+            if isinstance(statement, ast.ReturnNode): break
+        return value
+
+    def write_ReturnNode(self, node):
+        if node.tail:
+            call = node.expr
+            callee = self.value(call.callee)
+            arguments = ', '.join(self.value(argument) for argument in call.arguments)
+            self.line(f'if {callee} is context.function: raise TailCall([{arguments}])')
+            self.line(f'return call({callee}, [{arguments}], {self.ref(call)}, context)')
+            return 'None'
+        value = self.value(node.expr)
+        self.line(f'return {value}')
+        return value
+
+    def write_IfStatementNode(self, node):
+        test = self.condition(node.test)
+        result = self.temp()
+        self.line(f'if {test}:')
+        with self.block(node):
+            self.line(f'{result} = {self.value(node.body)}')
+        self.line('else:')
+        with self.block(node):
+            alternative = self.value(node.alternative) if node.alternative is not None else 'None'
+            self.line(f'{result} = {alternative}')
+        return result
+
+    def write_WhileStatementNode(self, node):
+        if node.test is None:
+            return self.fallback(node)
+        self.line('while True:')
+        with self.block(node):
+            test = self.condition(node.test)
+            self.line(f'if not {test}: break')
+            self.value(node.body)
+        return 'None'
+
+    def write_ForStatementNode(self, node):
+        name = node.init.variableDeclarators[0].identifier.name
+        items, native, element = self.value(node.test), self.temp(), self.temp()
+        # A Range is looped over as its Python range, so no List of Numbers is made
+        self.line(f'{native} = type({items}) is Range')
+        self.line(f'for {element} in ({items}.value.range if {native} else {items}.elements()):')
+        with self.block(node):
+            self.line(f'S.update({name!r}, number({element}) if {native} else item({element}), context, {self.ref(node)})')
+            self.value(node.body)
+        return 'None'
+
+    def write_VariableDeclarationNode(self, node):
+        for declarator in node.variableDeclarators:
+            value = self.value(declarator.init)
+            self.line(f'S.define({declarator.identifier.name!r}, Symbol({self.ref(node)}.kind, {value}))')
+        return 'None'
+
+    def write_PutStatementNode(self, node):
+        values = [self.value(argument) for argument in node.arguments]
+        self.line('print(' + ' + '.join(f'str({value})' for value in values) + ')')
+        return 'None'
+
+    def write_AssignmentExpressionNode(self, node):
+        if node.op != Token.cons.ASSIGN and node.op not in Optimizer.ASSIGNMENT:
+            return self.fallback(node)
+        name = node.left.name
+        left, right = self.value(node.left), self.value(node.right)
+        if node.op == Token.cons.ASSIGN:
+            self.line(f'S.update({name!r}, {right}, context, {self.ref(node)})')
+        else:
+            result = self.temp()
+            self.line(f'{result}, e = {left}.{Optimizer.ASSIGNMENT[node.op]}({right})')
+            # The tree walker drops this error and carries on
+            self.line('if not e:')
+            with self.block(node):
+                self.line(f'S.update({name!r}, {result}, context, {self.ref(node)})')
+        return 'None'
+
+    def write_UpdateExpressionNode(self, node):
+        if node.operator not in (Token.cons.INC, Token.cons.DEC):
+            return self.fallback(node)
+        value, result = self.value(node.argument), self.temp()
+        method = 'add' if node.operator == Token.cons.INC else 'sub'
+        self.line(f'if type({value}) == str or type({value}) == list:')
+        with self.block(node):
+            self.line(f'fallback({self.ref(node)}, context)')
+        self.line('else:')
+        with self.block(node):
+            self.line(f'{result}, e = {value}.{method}(number(1))')
+            self.line('if e: fail(e)')
+            self.line(f'S.update({node.argument.name!r}, {result}, context, {self.ref(node)})')
+        return 'None'
+
+    ## EXPRESSIONS
+    def write_IdentifierNode(self, node):
+        unit, result = self.unit, self.temp()
+        if not unit.frame or node.scope is not unit.layout:
+            self.line(f'{result} = lookup(context, {self.ref(node)})')
+            return result
+        # The unit always runs in the frame (or the global scope) 'node' was resolved in
+        if node.scope is None:
+            self.line(f's = G.get({node.name!r})')
+        elif node.slot is not None:
+            self.line(f's = V[{node.slot}]')
+        else:
+            self.line(f's = None if S.symbols else G.get({node.name!r})')
+        self.line(f'{result} = s.type if s and (s.kind == FUNCTION or isinstance(s.type, Value)) else resolve(context, {self.ref(node)}, s)')
+        return result
+
+    def write_NumberNode(self, node):
+        result = self.temp()
+        self.line(f'{result} = number({self.ref(node)}.value)')
+        return result
+
+    def write_LiteralNode(self, node):
+        result = self.temp()
+        self.line(f'{result} = String({self.ref(node)}.value)')
+        return result
+
+    def write_ConstantNode(self, node):
+        if type(node.value) == str:
+            return self.write_LiteralNode(node)
+        return self.write_NumberNode(node)
+
+    def write_ListExpressionNode(self, node):
+        elements = [self.value(element) for element in node.elements]
+        result = self.temp()
+        self.line(f'{result} = List([{", ".join(elements)}])')
+        return result
+
+    def write_MemberExpressionNode(self, node):
+        value, prop = self.value(node.identifier), self.value(node.property)
+        result = self.temp()
+        self.line(f'{result} = member({value}, {prop}, {self.ref(node)}, context)')
+        return result
+
+    def write_UnaryOpNode(self, node):
+        calls = {Token.cons.MINUS: 'mul(number(-1))', Token.cons.NOT: 'unary_not()', Token.cons.HASH: '_len()'}
+        if node.op not in calls:
+            return self.fallback(node)
+        value, result = self.value(node.expr), self.temp()
+        self.line(f'{result}, e = {value}.{calls[node.op]}')
+        self.line('if e: fail(e)')
+        return result
+
+    def write_BinOpNode(self, node):
+        if node.op not in Optimizer.BINARY:
+            return self.fallback(node)
+        left, right = self.value(node.left), self.value(node.right)
+        result = self.temp()
+        self.line(f'{result}, e = {left}.{Optimizer.BINARY[node.op]}({right})')
+        self.line(f'if e: fail(e.at({self.ref(node.right)}, context))')
+        return result
+
+    def write_LogicalOpNode(self, node):
+        test, result = self.condition(node), self.temp()
+        self.line(f'{result} = BOOLEANS[{test}]')
+        return result
+
+    def condition(self, node):
+        # Writes the statements deciding whether 'node' holds; returns the local holding
+        # that Python bool. See Visitor.truth
+        outer, self.node = self.node, node
+        try:
+            result = self.temp()
+            if type(node) is ast.LogicalOpNode:
+                self.line(f'{result} = {self.condition(node.left)}')
+                self.line(f'if {"" if node.op == Token.cons.AND else "not "}{result}:')
+                with self.block(node):
+                    self.line(f'{result} = {self.condition(node.right)}')
+            elif type(node) is ast.BinOpNode and node.op in COMPARISONS:
+                left, right = self.value(node.left), self.value(node.right)
+                self.line(f'if type({left}) is Number and type({right}) is Number:')
+                with self.block(node):
+                    self.line(f'{result} = {left}.value {COMPARISONS[node.op]} {right}.value')
+                self.line('else:')
+                with self.block(node):
+                    self.line(f'{result}, e = {left}.{Optimizer.BINARY[node.op]}({right})')
+                    self.line(f'if e: fail(e.at({self.ref(node.right)}, context))')
+                    self.line(f'{result} = {result}.is_true()')
+            else:
+                self.line(f'{result} = {self.value(node)}.is_true()')
+            return result
+        finally:
+            self.node = outer
+
+    def write_InlineFunctionNode(self, node):
+        self.add(node.body, f'inline_{node.name or "function"}', node.layout, True)
+        result = self.temp()
+        self.line(f'{result} = inline({self.ref(node)})')
+        return result
+
+    def write_CallExpressionNode(self, node):
+        callee = self.value(node.callee)
+        arguments = [self.value(argument) for argument in node.arguments]
+        result = self.temp()
+        self.line(f'{result} = call({callee}, [{", ".join(arguments)}], {self.ref(node)}, context)')
+        return result
+
+
+class _Indented:
+    def __init__(self, unit):
+        self.unit = unit
+
+    def __enter__(self):
+        self.unit.indent += 1
+
+    def __exit__(self, *exc):
+        self.unit.indent -= 1
+
+
+## CODE CACHE
+def programKey(nodes):
+    # The source text and the shape of the tree; --no-optimize gives a different shape
+    digest = hashlib.sha256(MAGIC + astCache.interpreterKey())
+    for node in nodes:
+        if node.source is not None:
+            digest.update(astCache.sourceKey(node.source.text))
+            break
+    digest.update(' '.join(type(node).__name__ for node in nodes).encode())
+    return digest.digest()
+
+def fileOf(nodes):
+    for node in nodes:
+        if node.source is not None:
+            return node.source.fileName
+    return None
+
+def load(fileName, key):
+    try:
+        with open(astCache.cachePath(fileName, EXTENSION), 'rb') as file:
+            if file.read(len(MAGIC) + len(key)) != MAGIC + key:
+                return None
+            return marshal.load(file)
+    except Exception:
+        return None
+
+def store(fileName, key, module):
+    path = astCache.cachePath(fileName, EXTENSION)
+    temp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        with open(temp, 'wb') as file:
+            file.write(MAGIC + key)
+            marshal.dump(module, file)
+        os.replace(temp, path)
+    except (OSError, ValueError):
+        try: os.remove(temp)
+        except OSError: pass
+
+def compileProgram(program, useCache = True):
+    # (code object, Python source, Python line -> node index, node table)
+    nodes = nodeTable(program)
+    fileName = fileOf(nodes)
+    useCache = useCache and fileName is not None
+    if useCache:
+        key = programKey(nodes)
+        module = load(fileName, key)
+        if module is not None:
+            return module + (nodes,)
+    source, lines = Transpiler(program).transpile()
+    code = compile(source, GENERATED.format(fileName), 'exec')
+    if useCache:
+        store(fileName, key, (code, source, lines))
+    return code, source, lines, nodes
+
+
+## TRACEBACKS
+def orionTraceback(exception, fileName, source, lines, nodes):
+    # The Orion lines the generated frames of a Python traceback were running
+    entries = []
+    entry = exception.__traceback__
+    while entry is not None:
+        frame, line, entry = entry.tb_frame, entry.tb_lineno, entry.tb_next
+        if frame.f_code.co_filename != fileName or not 0 < line <= len(lines):
+            continue
+        index = lines[line - 1]
+        node = nodes[index] if index >= 0 else None
+        if node is None or node.source is None:
+            continue
+        position = node.pos_start
+        text = position.fileText.split('\n')[position.line - 1].strip()
+        name = frame.f_code.co_name.replace('orion_', '', 1)
+        entries.append(f'  File "{position.fileName}", line {position.line}, in {name}\n    {text}')
+    if not entries:
+        return None
+    return 'Orion traceback (most recent call last):\n' + '\n'.join(entries)
+
+
+class PythonInterpreter(Interpreter.Interpreter):
+    useCache = True
+
+    def Interpret(self, context = None):
+        if self.ast.error:
+            print(self.ast.error.as_string())
+            return None
+        try:
+            code, source, lines, nodes = compileProgram(self.ast.node, self.useCache)
+        except (RecursionError, SyntaxError, MemoryError):
+            # Nesting deeper than Python can compile; the tree walker still runs it
+            return Interpreter.Interpreter(self.ast).Interpret()
+        fileName = code.co_filename
+        self.run = Runtime.Run(self)
+        self.run.load(code, nodes)
+        context = SymbolTable.Context('<main>')
+        context.symbolTable = self.environment(self.ast.node)
+        self.symtab = context.symbolTable
+        self.run.bind(self.globals)
+        try:
+            self.run.unit(self.ast.node)(context)
+        except Error.Failure as failure:
+            print(failure.error.as_string())
+        except Exception as exception:
+            # An interpreter bug: say where in the Orion program it happened
+            note = orionTraceback(exception, fileName, source, lines, nodes)
+            if note: exception.add_note(note)
+            raise
+
+    def function(self, name, args, body, symtab, layout):
+        return Runtime.TranspiledFunction(name, args, body, symtab, layout, self.run)
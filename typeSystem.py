@@ -1,137 +1,195 @@
 
 import errors as Error
-from visitor import RTResult
 from globalSymbolTable import GLOBAL_SYMBOL_TABLE
-import interpreter as Interpreter
 import symTable as SymbolTable
 import token as Token
 import ast
 import math
+import array
+import operator
+import itertools
 import random
 
 
 class Value:
+    # Numbers, Strings and Lists are only their value: one is made for nearly every
+    # operation, so they carry no source position or context. An error about one takes
+    # its place from the node that was being evaluated (see errors.RTError.at).
+    __slots__ = ()
+
     def __init__(self, value = None):
         self.value = value
-        self.setPosition()
-        self.setContext()
 
-    def setPosition(self, pos_start = None, pos_end = None):
-        self.pos_start = pos_start
-        self.pos_end = pos_end
-        return self
+    def is_true(self):
+        # What 'if', 'while', '&&' and '||' take the value as: zero, NULL, "" and [] are false
+        return bool(self.value)
 
-    def setContext(self, context = None):
-        self.context = context
-        return self
+    def elements(self):
+        # What a 'for' loop goes over
+        return self.value
 
     def __repr__(self):
         return str(self.value)
 
 class Number(Value):
-    def __init__(self, value):
-        super().__init__(value)
-        if type(self.value) == float:
-            self.length = len(str(self.value)) - 1
-        else:
-            self.length = len(str(self.value))
+    __slots__ = ('value',)
 
+    @property
+    def length(self):
+        # The digits, worked out when '#' asks; a float's point is not counted
+        if type(self.value) == float:
+            return len(str(self.value)) - 1
+        return len(str(self.value))
 
     def _len(self):
-        return Number(self.length).setContext(self.context), None
+        return number(self.length), None
 
     def add(self, other):
         if isinstance(other, Number):
-            return Number(self.value + other.value).setContext(self.context), None
+            return number(self.value + other.value), None
 
     def sub(self, other):
         if isinstance(other, Number):
-            return Number(self.value - other.value).setContext(self.context), None
+            return number(self.value - other.value), None
 
     def mul(self, other):
         if isinstance(other, Number):
-            return Number(self.value * other.value).setContext(self.context), None
+            return number(self.value * other.value), None
 
     def div(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                return None, Error.RTError(
-                    other.pos_start,
-                    other.pos_end,
-                    'Division by zero',
-                    self.context
-                )
-            return Number(self.value / other.value).setContext(self.context), None
+                return None, Error.RTError(None, None, 'Division by zero', None)
+            return Number(self.value / other.value), None
 
     def mod(self, other):
         if isinstance(other, Number):
             if other.value == 0:
-                return None, Error.RTError(
-                    other.pos_start,
-                    other.pos_end,
-                    'Division by zero',
-                    self.context
-                )
-            return Number(self.value % other.value).setContext(self.context), None
+                return None, Error.RTError(None, None, 'Division by zero', None)
+            return number(self.value % other.value), None
 
     def compare_eq(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value == other.value)).setContext(self.context), None
+            return BOOLEANS[self.value == other.value], None
 
     def compare_lt(self, other):
 
         if isinstance(other, Number):
-            return Number(int(self.value < other.value)).setContext(self.context), None
+            return BOOLEANS[self.value < other.value], None
 
     def compare_gt(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value > other.value)).setContext(self.context), None
+            return BOOLEANS[self.value > other.value], None
     
     def compare_lte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value <= other.value)).setContext(self.context), None
+            return BOOLEANS[self.value <= other.value], None
 
     def compare_gte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value >= other.value)).setContext(self.context), None
+            return BOOLEANS[self.value >= other.value], None
 
     def compare_neq(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value != other.value)).setContext(self.context), None
+            return BOOLEANS[self.value != other.value], None
 
-    def compare_and(self, other):
-        if isinstance(other, Number):
-            return Number(int(self.value and other.value)).setContext(self.context), None
+    def unary_not(self):
+        return BOOLEANS[not self.value > 0], None
 
-    def compare_or(self, other):
-        if isinstance(other, Number):
-            return Number(int(self.value or other.value)).setContext(self.context), None
 
-    def unary_not(self):
-        return Number(0 if self.value > 0 else 1).setContext(self.context), None
+
+## Numbers never change once made, so one instance can stand for a value anywhere.
+## BOOLEANS, indexed by a Python bool, are what comparisons, '&&', '||', '!' and the is_*
+## built-ins give, and are TRUE and FALSE. SMALL_INTS holds a Number for each int in
+## SMALL_INT_RANGE, where loop counters and indexes mostly stay; number() hands those
+## out instead of making new ones.
+BOOLEANS = (Number(0), Number(1))
+SMALL_INT_RANGE = (-5, 1024)
+SMALL_INTS = {}
+
+def smallInts(low, high):
+    # Pools the ints low <= i < high, in place of the range pooled so far
+    SMALL_INTS.clear()
+    SMALL_INTS.update((i, Number(i)) for i in range(low, high))
+    for boolean in BOOLEANS:
+        if boolean.value in SMALL_INTS:
+            SMALL_INTS[boolean.value] = boolean
+
+smallInts(*SMALL_INT_RANGE)
+
+def number(value):
+    # The Number for 'value': the pooled one for a small int, otherwise a new one
+    if type(value) is int:
+        pooled = SMALL_INTS.get(value)
+        if pooled is not None:
+            return pooled
+    return Number(value)
 
 
+## Concatenations up to this long are made as plain Python strings, longer ones as ropes
+FLAT_STRING_LENGTH = 256
+
 
 class String(Value):
+    # 'text' is the Python str, or None while the String is a rope: the first 'count'
+    # pieces of 'parts', 'size' characters in all, joined the first time 'value' is read
+    # (indexing, comparing, printing). '..' and '+' append to the left side's parts in
+    # place when the left side is the last String made from them, so a string built a
+    # piece at a time is copied once, not once per piece. Its length never needs the join.
+    __slots__ = ('text', 'parts', 'count', 'size')
+
     def __init__(self, value):
-        super().__init__(value)
-        self.length = len(self.value)
+        self.text = value
+        self.parts = None
+        self.size = len(value)
+
+    @property
+    def value(self):
+        if self.text is None:
+            self.text = ''.join(self.parts[:self.count])
+            # Flat from now on; the parts stay with the Strings that share them
+            self.parts = None
+        return self.text
+
+    @property
+    def length(self):
+        return self.size
+
+    def is_true(self):
+        return self.size > 0
 
     def _len(self):
-        return Number(self.length).setContext(self.context), None
+        return number(self.length), None
 
     def add(self, other):
         return self.concat(other)
     
     def concat(self, other):
         if isinstance(other, String):
-            return String(self.value + other.value).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            return self.joined(other.value), None
         elif isinstance(other, Number) or isinstance(other, List):
-            return String(self.value + str(other.value)).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            return self.joined(str(other.value)), None
+
+    def joined(self, piece):
+        # This String followed by the Python str 'piece'
+        size = self.size + len(piece)
+        if self.parts is None:
+            if size <= FLAT_STRING_LENGTH:
+                return String(self.text + piece)
+            parts, count = [self.text], 1
+        else:
+            parts, count = self.parts, self.count
+            if len(parts) != count:
+                # A longer String already grew these parts; this one goes on from a copy
+                parts = parts[:count]
+        parts.append(piece)
+        rope = String.__new__(String)
+        rope.text, rope.parts, rope.count, rope.size = None, parts, count + 1, size
+        return rope
 
     def mul(self, other):
         if isinstance(other, Number):
-            return String(self.value * other.value).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            return String(self.value * other.value), None
 
     def sub(self, other):
         if isinstance(other, String) or isinstance(other, Number) or isinstance(other, List):
@@ -150,118 +208,373 @@ class String(Value):
                 i += 1
             if len(result) == 0:
                 result = self.value
-            return String(result).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            return String(result), None
 
 
 
 class List(Value):
+    # A List is the first 'count' of 'items'. '..' appends to the left side's items in
+    # place when the left side is the last List made from them, so 'result = result..[x]'
+    # costs the new items, not a copy of the old ones. A List whose items have grown past
+    # it since takes its own copy the next time its value is read.
+    __slots__ = ('items', 'count')
+
     def __init__(self, value):
-        super().__init__(value)
-        self.length = len(self.value)
+        self.items = value
+        self.count = len(value)
+
+    @property
+    def value(self):
+        if len(self.items) != self.count:
+            self.items = self.items[:self.count]
+        return self.items
+
+    @property
+    def length(self):
+        return self.count
+
+    def is_true(self):
+        return self.count > 0
+
+    def elements(self):
+        # Only this List's items, even if the loop body appends to them
+        return itertools.islice(self.items, self.count)
 
     def _len(self):
-        return Number(self.length).setContext(self.context), None
+        return number(self.length), None
 
     def concat(self, other):
         if isinstance(other, List):
-            return List(self.value + other.value).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            return self.extended(other.value), None
         elif isinstance(other, Number) or isinstance(other, String):
-            return List(self.value + other.value).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            # A Number or String on the right is appended as one item
+            return self.extended([other]), None
+
+    def extended(self, values):
+        # This List followed by the Python list 'values'
+        items, count = self.items, self.count
+        if type(items) is not list:
+            # A Range's items
+            return List(items + values)
+        if len(items) != count:
+            # A longer List already grew these items; this one goes on from a copy
+            items = items[:count]
+        items.extend(values)
+        extended = List.__new__(List)
+        extended.items, extended.count = items, len(items)
+        return extended
     
     def add(self, other):
-        if isinstance(other, Number):
-            result = []
-            for i in self.value:
-                if isinstance(i, Number):
-                    result.append(i.add(other)[0])
-                elif isinstance(i, String):
-                    result.append(i.concat(other)[0])
-                elif isinstance(i, List):
-                    result.append(i.add(other)[0])
-            return List(result).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
-        elif isinstance(other, List):
-            listlen = other.length
-            result = []
-            if listlen != self.length:
-                raise Exception("Two lists must be of the same size when adding toghether")
-            for el in range(self.length):
-                result.append(self.value[el].add(other.value[el])[0])
-            return List(result).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+        return self.vectorized('add', other) or self.elementwise('add', other)
 
     def sub(self, other):
-        if isinstance(other, Number):
-            result = []
-            for i in self.value:
-                if isinstance(i, Number):
-                    result.append(i.sub(other)[0])
-                elif isinstance(i, String):
-                    result.append(i.sub(other)[0])
-                elif isinstance(i, List):
-                    result.append(i.sub(other)[0])
-            return List(result).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+        return self.vectorized('sub', other) or self.elementwise('sub', other)
+
+    def mul(self, other):
+        return self.vectorized('mul', other) or self.elementwise('mul', other)
+
+    def div(self, other):
+        return self.vectorized('div', other) or self.elementwise('div', other)
+
+    def mod(self, other):
+        return self.vectorized('mod', other) or self.elementwise('mod', other)
+
+    def compare_eq(self, other):
+        return self.vectorized('compare_eq', other) or self.elementwise('compare_eq', other)
+
+    def compare_lt(self, other):
+        return self.vectorized('compare_lt', other) or self.elementwise('compare_lt', other)
+
+    def compare_gt(self, other):
+        return self.vectorized('compare_gt', other) or self.elementwise('compare_gt', other)
+
+    def compare_lte(self, other):
+        return self.vectorized('compare_lte', other) or self.elementwise('compare_lte', other)
+
+    def compare_gte(self, other):
+        return self.vectorized('compare_gte', other) or self.elementwise('compare_gte', other)
+
+    def compare_neq(self, other):
+        return self.vectorized('compare_neq', other) or self.elementwise('compare_neq', other)
+
+    def packed(self):
+        # This List's items as a NumberArray when they are all ints or all floats, else
+        # None. The List switches to the NumberArray the first time it is asked, unless
+        # it is a Range, which is smaller as it is
+        items = self.items
+        if type(items) is NumberArray:
+            return items
+        if type(items) is NumberRange:
+            try:
+                return NumberArray(array.array('q', items.range))
+            except OverflowError:
+                return None
+        items = self.value
+        if not all(type(item) is Number for item in items):
+            return None
+        values = [item.value for item in items]
+        typecode = PACKED_TYPECODES.get(frozenset(map(type, values)))
+        if typecode is None:
+            return None
+        try:
+            self.items = NumberArray(array.array(typecode, values))
+        except OverflowError:
+            # An int past 64 bits
+            return None
+        return self.items
+
+    def vectorized(self, method, other):
+        # 'method' item by item over packed items with a Number or with a List of the same
+        # length, as one C loop over Python ints or floats; None when either side will not
+        # pack, for the boxed way to handle
+        items = self.packed()
+        if items is None:
+            return None
+        items = items.array
+        if type(other) is Number:
+            if type(other.value) not in PACKED_TYPES:
+                return None
+            floats = items.typecode == 'd' or type(other.value) is float
+            operands = itertools.repeat(other.value, len(items))
+            divisors = (other.value,)
         elif isinstance(other, List):
-            listlen = other.length
-            result = []
-            if listlen != self.length:
-                raise Exception("Two lists must be of the same size when subtracting toghether")
-            for el in range(self.length):
-                result.append(self.value[el].sub(other.value[el])[0])
-            return List(result).setContext(self.context).setPosition(self.pos_start, self.pos_end), None
+            operands = other.packed()
+            if operands is None or len(operands) != len(items):
+                return None
+            operands = operands.array
+            floats = items.typecode == 'd' or operands.typecode == 'd'
+            divisors = operands
+        else:
+            return None
+        if (method == 'div' or method == 'mod') and 0 in divisors:
+            return None, Error.RTError(None, None, 'Division by zero', None)
+        values = list(map(VECTORIZED[method], items, operands))
+        # Comparisons give 0 or 1, a byte each; '/' always a float, the rest a float if
+        # either side is
+        if method.startswith('compare'):
+            typecode = 'b'
+        elif method == 'div' or floats:
+            typecode = 'd'
+        else:
+            typecode = 'q'
+        try:
+            return List(NumberArray(array.array(typecode, values))), None
+        except OverflowError:
+            return List([number(value) for value in values]), None
+
+    def elementwise(self, method, other):
+        # 'method' of each item with 'other', or with the item at the same place in the
+        # List 'other': what lists of anything but numbers do
+        if isinstance(other, List):
+            if other.length != self.length:
+                return None, Error.RTError(None, None, 'Two lists must be of the same size', None)
+            operands = other.value
+        else:
+            operands = itertools.repeat(other, self.length)
+        result = []
+        for item, operand in zip(self.value, operands):
+            operation = getattr(item, method, None)
+            outcome = operation(operand) if operation is not None else None
+            if outcome is None:
+                # An item that does not take this operand, such as a Number times a String
+                return None, Error.RTError(None, None, 'Illegal operation', None)
+            value, error = outcome
+            if error:
+                return None, error
+            result.append(value)
+        return List(result), None
+
+
+class NumberRange:
+    # The items of a Range. Reads like the list of Numbers range() used to build, but only
+    # holds the Python range: each Number is made when it is read.
+    __slots__ = ('range',)
+
+    def __init__(self, numbers):
+        self.range = numbers
+
+    def __len__(self):
+        return len(self.range)
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            return [number(i) for i in self.range[index]]
+        return number(self.range[index])
+
+    def __iter__(self):
+        for i in self.range:
+            yield number(i)
+
+    def __add__(self, other):
+        # Only another List's items; a str would come apart into characters
+        if not isinstance(other, (list, NumberRange, NumberArray)):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return other + list(self)
+
+    def __repr__(self):
+        return repr(list(self.range))
+
+
+## The Python operator vectorized List operations map over packed items, and the array
+## typecode items pack as: 64-bit ints or doubles, never a mix
+VECTORIZED = {
+    'add':         operator.add,
+    'sub':         operator.sub,
+    'mul':         operator.mul,
+    'div':         operator.truediv,
+    'mod':         operator.mod,
+    'compare_eq':  operator.eq,
+    'compare_lt':  operator.lt,
+    'compare_gt':  operator.gt,
+    'compare_lte': operator.le,
+    'compare_gte': operator.ge,
+    'compare_neq': operator.ne,
+}
+PACKED_TYPECODES = {frozenset((int,)): 'q', frozenset((float,)): 'd'}
+PACKED_TYPES = (int, float)
+
+
+class NumberArray:
+    # The items of a List of Numbers packed into a Python array: eight bytes each rather
+    # than a Number and a pointer. Reads like the list of Numbers, as NumberRange does;
+    # each Number is made when it is read.
+    __slots__ = ('array',)
+
+    def __init__(self, numbers):
+        self.array = numbers
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            return [number(i) for i in self.array[index]]
+        return number(self.array[index])
+
+    def __iter__(self):
+        for i in self.array:
+            yield number(i)
+
+    def __add__(self, other):
+        # Only another List's items, as NumberRange takes
+        if not isinstance(other, (list, NumberRange, NumberArray)):
+            return NotImplemented
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return other + list(self)
+
+    def __repr__(self):
+        return repr(self.array.tolist())
+
+
+class Range(List):
+    # What range() returns: a List of the Numbers start, start + step, ... short of stop,
+    # held as a NumberRange. 'for' loops iterate its Python range directly.
+    __slots__ = ()
+
+    def __init__(self, start, stop, step = 1):
+        super().__init__(NumberRange(range(start, stop, step)))
 
 
 
 class BaseFunction(Value):
+    # Functions do keep a place: the call node they were last called from, which their
+    # argument errors and the call's Context point at
     def __init__(self, functionName, functionSymtab):
         super().__init__()
+        self.span = None
         self.name = functionName or "<inline>"
         self.symtab = functionSymtab
+        self.layout = None
+        # The frame slot of each parameter, when the function has a frame layout
+        self.slots = None
+
+    def setPosition(self, span = None):
+        self.span = span
+        return self
+
+    @property
+    def pos_start(self):
+        return self.span.pos_start if self.span else None
+
+    @property
+    def pos_end(self):
+        return self.span.pos_end if self.span else None
 
     def generate_new_context(self, parentContext):
-        context = SymbolTable.Context(self.name, parentContext, self.pos_start)
-        context.symbolTable = SymbolTable.SymbolTable(self.symtab)
+        context = SymbolTable.Context(self.name, parentContext, self.span, self)
+        if self.layout:
+            context.symbolTable = SymbolTable.Frame(self.layout, self.symtab)
+        else:
+            context.symbolTable = SymbolTable.SymbolTable(self.symtab)
         return context
 
     def check_args(self, arg_names, arguments, exec_ctx):
-        res = RTResult()
         if len(arguments) > len(arg_names):
-            return res.failure(Error.RTError(self.pos_start, self.pos_end, f'Function \'{self.name}\' requires {len(arg_names)} arguments, {len(arguments) - len(arg_names)} more provided', exec_ctx))
+            raise Error.Failure(Error.RTError(self.pos_start, self.pos_end, f'Function \'{self.name}\' requires {len(arg_names)} arguments, {len(arguments) - len(arg_names)} more provided', exec_ctx))
         if len(arguments) < len(arg_names):
-            return res.failure(Error.RTError(self.pos_start, self.pos_end, f'Function \'{self.name}\' requires {len(arg_names)} arguments, {len(arguments)} provided, needs {len(arg_names) - len(arguments)} more arguments', exec_ctx))
-        return res.success(None)
+            raise Error.Failure(Error.RTError(self.pos_start, self.pos_end, f'Function \'{self.name}\' requires {len(arg_names)} arguments, {len(arguments)} provided, needs {len(arg_names) - len(arguments)} more arguments', exec_ctx))
 
     def populate_args(self, arg_names, arguments, exec_ctx):
+        if self.slots is not None:
+            # Parameters are the first slots of the frame: bind them there by position
+            values = exec_ctx.symbolTable.values
+            LET = Token.cons.LET
+            for slot, argument in zip(self.slots, arguments):
+                values[slot] = SymbolTable.Symbol(LET, argument)
+            return
         for i in range(len(arg_names)):
             name = arg_names[i]
             prop = SymbolTable.Symbol(Token.cons.LET, arguments[i])
             exec_ctx.symbolTable.define(name, prop)
 
     def check_and_populate_args(self, arg_names, arguments, exec_ctx):
-        res = RTResult()
-        res.register(self.check_args(arg_names, arguments, exec_ctx))
-        if res.error: return res
+        self.check_args(arg_names, arguments, exec_ctx)
         self.populate_args(arg_names, arguments, exec_ctx)
-        return res.success(None)
+
+    def reenter(self, arguments, exec_ctx):
+        # A tail call of the function from its own body: the call's frame is emptied and
+        # takes the new arguments, as a new call's would
+        exec_ctx.symbolTable.clear()
+        self.populate_args(self.arg_names, arguments, exec_ctx)
 
 class Function(BaseFunction):
-    def __init__(self, functionName, functionArguments, functionBody, functionSymtab):
+    def __init__(self, functionName, functionArguments, functionBody, functionSymtab, layout = None, interpreter = None):
         super().__init__(functionName, functionSymtab)
         self.arg_names = functionArguments
         self.body = functionBody
+        self.layout = layout
+        if layout is not None:
+            self.slots = [layout.slots[name] for name in functionArguments]
+        # The Interpreter of the run that made the function; every call runs on it
+        self.interpreter = interpreter
+        # A memo.MemoCache when the function is pure and --memo is on
+        self.memo = None
 
     def __repr__(self):
         return f'<Function {self.name}>'
 
 
     def execute(self, arguments, parentContext):
-        res = RTResult()
+        if self.memo is not None:
+            return self.memo.call(self, arguments, parentContext)
+        return self.invoke(arguments, parentContext)
+
+    def invoke(self, arguments, parentContext):
+        # The call itself; each engine's Function runs the body its own way
         newContext = self.generate_new_context(parentContext)
 
         self.check_and_populate_args(self.arg_names, arguments, newContext)
         
-        interp = Interpreter.Interpreter(self.body)
-        result = res.register(interp.Interpret(newContext))
-        if res.error: return res
-        return res.success(result)
+        return self.interpreter.call(self, newContext)
 
 
 class BuiltInFunction(BaseFunction):
@@ -269,19 +582,18 @@ class BuiltInFunction(BaseFunction):
         super().__init__(functionName, SymbolTable.SymbolTable())
 
     def execute(self, arguments, parentContext = None):
-        res = RTResult()
         newContext = self.generate_new_context(parentContext)
 
         method_name = f'execute_{self.name}'
         method = getattr(self, method_name, self.no_execute_method)
 
-        res.register(self.check_and_populate_args(method.arg_names, arguments, newContext))
-        if res.error: return res
-
-        result = res.register(method(newContext))
-        if res.error: return res
+        arg_names = method.arg_names
+        if getattr(method, 'required', len(arg_names)) <= len(arguments) < len(arg_names):
+            # The trailing arguments are optional; they are left undefined
+            arg_names = arg_names[:len(arguments)]
+        self.check_and_populate_args(arg_names, arguments, newContext)
 
-        return res.success(result)
+        return method(newContext)
 
     def no_execute_method(self, args, parentContext = None):
         raise Exception(f'No execute_{self.name} method found')
@@ -292,26 +604,36 @@ class BuiltInFunction(BaseFunction):
     ## BUILT_IN FUNCTIONS
     def execute_input(self, exec_ctx):
         text = input()
-        return RTResult().success(String(text))
+        return String(text)
     execute_input.arg_names = []
 
     def execute_range(self, exec_ctx):
-        end = exec_ctx.symbolTable.get('end').type
-        if not isinstance(end, Number):
-            return RTResult().failure(Error.RTError(
+        # range(stop), range(start, stop) or range(start, stop, step), as in Python
+        bounds = []
+        for name in ('start', 'stop', 'step'):
+            symbol = exec_ctx.symbolTable.get(name)
+            if symbol is None:
+                break
+            if not isinstance(symbol.type, Number) or type(symbol.type.value) is not int:
+                raise Error.Failure(Error.RTError(
+                    self.pos_start,
+                    self.pos_end,
+                    "'range' function argument must be an integer",
+                    exec_ctx
+                ))
+            bounds.append(symbol.type.value)
+        if len(bounds) == 1:
+            bounds.insert(0, 0)
+        if len(bounds) == 3 and bounds[2] == 0:
+            raise Error.Failure(Error.RTError(
                 self.pos_start,
                 self.pos_end,
-                "'range' function argument must be an integer",
+                "'range' step must not be zero",
                 exec_ctx
             ))
-        end = end.value
-        result = range(end)
-        result = list(result)
-        for index in range(len(result)):
-            result[index] = Number(result[index])
-        result = List(result)
-        return RTResult().success(result)
-    execute_range.arg_names = ['end']
+        return Range(*bounds)
+    execute_range.arg_names = ['start', 'stop', 'step']
+    execute_range.required = 1
 
     def execute_orionSignature(self, exec_ctx):
         return Token.cons.SIGNATURE
@@ -319,21 +641,21 @@ class BuiltInFunction(BaseFunction):
 
     def execute_len(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('argument').type
-        return RTResult().success(Number(arg.length))
+        return number(arg.length)
     execute_len.arg_names = ['argument']
 
     def execute_is_number(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('argument').type
         if isinstance(arg, Number):
-            return RTResult().success(Number(1))
+            return BOOLEANS[1]
         else:
-            return RTResult().success(Number(0))
+            return BOOLEANS[0]
     execute_is_number.arg_names = ['argument']
 
     def execute_to_number(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('argument').type
         if isinstance(arg, List):
-            return RTResult().failure(Error.RTError(
+            raise Error.Failure(Error.RTError(
                 self.pos_start,
                 self.pos_end,
                 f"Can not convert 'List' to Number.",
@@ -351,57 +673,57 @@ class BuiltInFunction(BaseFunction):
                 else:
                     value = int(arg.value)
         except:
-            return RTResult().failure(Error.RTError(
+            raise Error.Failure(Error.RTError(
                 self.pos_start,
                 self.pos_end,
                 f"Can not convert {arg.value} to type Number",
                 exec_ctx
             ))
-        return RTResult().success(Number(value))
+        return number(value)
     execute_to_number.arg_names = ['argument']
 
     def execute_string(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('arguments')
-        return RTResult().success(String(arg.value))
+        return String(arg.value)
     execute_string.arg_names = ['argument']
 
     def execute_list(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('arguments').type
         if isinstance(arg, Number):
-            return RTResult().success(List([arg.value]))
+            return List([arg.value])
         elif isinstance(arg, String):
             result = []
             for i in arg.value:
                 result.append(i)
-            return RTResult().success(List(result))
+            return List(result)
         else:
-            return RTResult().success(List(arg.value))
+            return List(arg.value)
     execute_list.arg_names = ['arguments']
 
     def execute_is_string(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('argument').type
         if isinstance(arg, String):
-            return RTResult().success(Number(1))
+            return BOOLEANS[1]
         else:
-            return RTResult().success(Number(0))
+            return BOOLEANS[0]
     execute_is_string.arg_names = ['argument']
     
     def execute_is_list(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('argument').type
         if isinstance(arg, List):
-            return RTResult().success(Number(1))
+            return BOOLEANS[1]
         else:
-            return RTResult().success(Number(0))
+            return BOOLEANS[0]
     execute_is_list.arg_names = ['argument']
 
 
     def execute_random(self, exec_ctx):
-        number = exec_ctx.symbolTable.get('number').type
-        if isinstance(number, Number):
-            result = random.randint(1, number.value)
-            return RTResult().success(Number(result))
+        limit = exec_ctx.symbolTable.get('number').type
+        if isinstance(limit, Number):
+            result = random.randint(1, limit.value)
+            return number(result)
         else:
-            return RTResult().failure(Error.RTError(
+            raise Error.Failure(Error.RTError(
                 self.pos_start,
                 self.pos_end,
                 f"'random' argument should be number",
@@ -412,17 +734,17 @@ class BuiltInFunction(BaseFunction):
     def execute_type(self, exec_ctx):
         arg = exec_ctx.symbolTable.get('arguments').type
         if isinstance(arg, Number):
-            return RTResult().success(String('<Type Number>'))
+            return String('<Type Number>')
         elif isinstance(arg, String):
-            return RTResult().success(String('<Type String>'))
+            return String('<Type String>')
         else:
-            return RTResult().success(String('<Type List>'))
+            return String('<Type List>')
     execute_type.arg_names = ['arguments']
 
     def execute_prompt(self, exec_ctx):
         msg = exec_ctx.symbolTable.get('message').type
         result = input(msg.value)
-        return RTResult().success(String(result))
+        return String(result)
     execute_prompt.arg_names = ['message']
 
 
@@ -456,9 +778,9 @@ GLOBAL_SYMBOL_TABLE.define("orionSignature", BuiltInFunction.orionSignature)
 
 MATH_PI = SymbolTable.Symbol(Token.cons.CONST, Number(math.pi)).copy()
 GLOBAL_SYMBOL_TABLE.define("MATH_PI", MATH_PI)
-TRUE = SymbolTable.Symbol(Token.cons.CONST, Number(1)).copy()
+TRUE = SymbolTable.Symbol(Token.cons.CONST, BOOLEANS[1]).copy()
 GLOBAL_SYMBOL_TABLE.define("TRUE", TRUE)
-FALSE = SymbolTable.Symbol(Token.cons.CONST, Number(0)).copy()
+FALSE = SymbolTable.Symbol(Token.cons.CONST, BOOLEANS[0]).copy()
 GLOBAL_SYMBOL_TABLE.define("FALSE", FALSE)
 NULL = SymbolTable.Symbol(Token.cons.CONST, Number(None)).copy()
 GLOBAL_SYMBOL_TABLE.define("NULL", NULL)
\ No newline at end of file
@@ -0,0 +1,294 @@
+import token as Token
+import typeSystem as Type
+import errors as Error
+import symTable as SymbolTable
+import interpreter as Interpreter
+import bytecode as Bytecode
+from bytecode import (LOAD_NUMBER, LOAD_STRING, LOAD_NAME, LOAD_NONE, POP, BINARY_OP, UNARY_OP, DEFINE,
+                      ASSIGN, UPDATE, BUILD_LIST, MEMBER, PUTS, MAKE_FUNCTION, CALL, JUMP, JUMP_IF_FALSE,
+                      GET_ITER, FOR_ITER, STORE_ITEM, RETURN, FALLBACK, TAIL_CALL)
+
+## Runs bytecode.CodeObjects in a single dispatch loop. Every call to a user function
+## pushes a CallFrame (its code, program counter, value stack and Context) instead of
+## recursing in Python, so the depth of Orion recursion is only bounded by memory.
+## Values, scopes and errors are the tree walker's own, and so is the output.
+
+
+class CallFrame:
+    __slots__ = ('code', 'pc', 'stack', 'context', 'reports')
+
+    def __init__(self, code, context, reports):
+        self.code = code
+        self.pc = 0
+        self.stack = []
+        self.context = context
+        # Function calls print a runtime error on their way out, like Function.execute's
+        # Interpret; a hoisted init node runs inside the frame that read it and does not
+        self.reports = reports
+
+
+class VM:
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.compiler = Bytecode.Compiler()
+
+    def run(self, node, name, context):
+        # The value of 'node' run in 'context'; runtime errors raise Error.Failure
+        frames = [CallFrame(self.compiler.code(node, name), context, False)]
+        try:
+            return self.loop(frames)
+        except Error.Failure as failure:
+            # The bottom frame belongs to whoever called run(), which reports it
+            for frame in reversed(frames[1:]):
+                if frame.reports: print(failure.error.as_string())
+            raise
+
+    def loop(self, frames):
+        interpreter = self.interpreter
+        compiler = self.compiler
+        findSymbol = interpreter.findSymbol
+        globalTable = interpreter.globals
+        globalSymbols = globalTable.symbols
+        Frame, Value, FUNCTION = SymbolTable.Frame, Type.Value, Token.cons.FUNCTION
+
+        frame = frames[-1]
+        instructions, consts = frame.code.instructions, frame.code.consts
+        stack, context, pc = frame.stack, frame.context, frame.pc
+        while True:
+            opcode = instructions[pc]
+            argument = instructions[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_NAME:
+                # Interpreter.resolvedSymbol, then findSymbol
+                node = consts[argument]
+                name, scope = node.name, node.scope
+                symtab = context.symbolTable
+                symbol = None
+                if scope is None:
+                    if symtab is globalTable:
+                        symbol = globalSymbols.get(name)
+                elif type(symtab) is Frame and symtab.layout is scope:
+                    if node.slot is not None:
+                        symbol = symtab.values[node.slot]
+                    elif not symtab.symbols:
+                        symbol = globalSymbols.get(name)
+                if not symbol:
+                    symbol = findSymbol(name, context)
+                if symbol:
+                    if symbol.kind == FUNCTION or isinstance(symbol.type, Value):
+                        stack.append(symbol.type)
+                    else:
+                        # A hoisted declaration that has not run yet: run its init node here
+                        frame.pc = pc
+                        frame = CallFrame(compiler.code(symbol.type, name), context, False)
+                        frames.append(frame)
+                        instructions, consts = frame.code.instructions, frame.code.consts
+                        stack, pc = frame.stack, 0
+                elif name in FUNCTION:
+                    stack.append(name)
+                else:
+                    raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, f'Unkown Variable or Function \'{name}\'', context))
+
+            elif opcode == LOAD_NUMBER:
+                node = consts[argument]
+                stack.append(Type.number(node.value))
+
+            elif opcode == BINARY_OP:
+                method, node = consts[argument]
+                right = stack.pop()
+                result, error = getattr(stack[-1], method)(right)
+                if error: raise Error.Failure(error.at(node.right, context))
+                stack[-1] = result
+
+            elif opcode == POP:
+                stack.pop()
+
+            elif opcode == JUMP_IF_FALSE:
+                if not stack.pop().value:
+                    pc = argument
+
+            elif opcode == JUMP:
+                pc = argument
+
+            elif opcode == CALL or opcode == TAIL_CALL:
+                count, node = consts[argument]
+                start = len(stack) - count
+                args = stack[start:]
+                del stack[start:]
+                function = stack.pop()
+                if opcode == TAIL_CALL and function is context.function:
+                    # The frame is reused: nothing is pushed, the code starts over
+                    function.reenter(args, context)
+                    stack.clear()
+                    pc = 0
+                    continue
+                function.setPosition(node)
+                if type(function) is VMFunction and function.memo is None:
+                    newContext = function.generate_new_context(context)
+                    function.check_and_populate_args(function.arg_names, args, newContext)
+                    frame.pc = pc
+                    frame = CallFrame(compiler.code(function.body, function.name), newContext, True)
+                    frames.append(frame)
+                    instructions, consts = frame.code.instructions, frame.code.consts
+                    stack, context, pc = frame.stack, newContext, 0
+                else:
+                    stack.append(function.execute(args, context))
+
+            elif opcode == RETURN:
+                value = stack.pop()
+                frames.pop()
+                if not frames:
+                    return value
+                frame = frames[-1]
+                instructions, consts = frame.code.instructions, frame.code.consts
+                stack, context, pc = frame.stack, frame.context, frame.pc
+                stack.append(value)
+
+            elif opcode == ASSIGN:
+                name, method, node = consts[argument]
+                right = stack.pop()
+                left = stack.pop()
+                stack.append(None)
+                if method is None:
+                    value = right
+                else:
+                    value, error = getattr(left, method)(right)
+                    # The tree walker drops this error and carries on
+                    if error: continue
+                context.symbolTable.update(name, value, context, node)
+
+            elif opcode == UPDATE:
+                name, method, node = consts[argument]
+                value = stack.pop()
+                if type(value) == str or type(value) == list:
+                    interpreter.symtab = context.symbolTable
+                    stack.append(interpreter.visit(node, context))
+                    continue
+                result, error = getattr(value, method)(Type.number(1))
+                if error: raise Error.Failure(error)
+                context.symbolTable.update(name, result, context, node)
+                stack.append(None)
+
+            elif opcode == LOAD_STRING:
+                node = consts[argument]
+                stack.append(Type.String(node.value))
+
+            elif opcode == LOAD_NONE:
+                stack.append(None)
+
+            elif opcode == UNARY_OP:
+                operation, node = consts[argument]
+                value, error = operation(stack[-1])
+                if error: raise Error.Failure(error)
+                stack[-1] = value
+
+            elif opcode == DEFINE:
+                name, kind = consts[argument]
+                context.symbolTable.define(name, SymbolTable.Symbol(kind, stack.pop()))
+
+            elif opcode == PUTS:
+                result = ""
+                for value in stack[-argument:]:
+                    result += str(value)
+                del stack[-argument:]
+                print(result)
+                stack.append(None)
+
+            elif opcode == GET_ITER:
+                # A Range is iterated as its Python range: STORE_ITEM gets plain ints
+                items = stack[-1]
+                stack[-1] = iter(items.value.range if type(items) is Type.Range else items.elements())
+
+            elif opcode == FOR_ITER:
+                try:
+                    stack.append(next(stack[-1]))
+                except StopIteration:
+                    stack.pop()
+                    pc = argument
+
+            elif opcode == STORE_ITEM:
+                name, node = consts[argument]
+                i = stack.pop()
+                if type(i) is int:
+                    iterator = Type.number(i)
+                elif isinstance(i, Type.String):
+                    iterator = Type.String(i.value)
+                elif isinstance(i, Type.List):
+                    iterator = Type.List(i.value)
+                elif type(i) == str:
+                    iterator = Type.String(i)
+                else:
+                    iterator = Type.number(i.value)
+                context.symbolTable.update(name, iterator, context, node)
+
+            elif opcode == BUILD_LIST:
+                count, node = consts[argument]
+                start = len(stack) - count
+                elements = stack[start:]
+                del stack[start:]
+                stack.append(Type.List(elements))
+
+            elif opcode == MEMBER:
+                node = consts[argument]
+                prop = stack.pop()
+                value = stack.pop()
+                if isinstance(value, Type.List) or isinstance(value, Type.String):
+                    if prop.value > value.length - 1:
+                        raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, "Index out of range", context))
+                    item = value.value[prop.value]
+                    if type(item) == str:
+                        item = Type.String(item)
+                    elif type(item) == list:
+                        item = Type.List(item)
+                    elif type(item) == int or type(item) == float:
+                        item = Type.number(item)
+                    stack.append(item)
+                else:
+                    # Not an error in the tree walker either
+                    stack.append(None)
+
+            elif opcode == MAKE_FUNCTION:
+                stack.append(interpreter.inline(consts[argument]))
+
+            elif opcode == FALLBACK:
+                interpreter.symtab = context.symbolTable
+                stack.append(interpreter.visit(consts[argument], context))
+
+            else:
+                raise Exception(f'Unknown opcode {opcode}')
+
+
+class VMFunction(Type.Function):
+    def __init__(self, functionName, functionArguments, functionBody, functionSymtab, layout, vm):
+        super().__init__(functionName, functionArguments, functionBody, functionSymtab, layout)
+        self.vm = vm
+
+    def invoke(self, arguments, parentContext):
+        # Only used when something other than the VM calls the function (the tree walker
+        # running a fallback node) or it has a memo cache; the VM itself pushes a CallFrame
+        newContext = self.generate_new_context(parentContext)
+        self.check_and_populate_args(self.arg_names, arguments, newContext)
+        try:
+            return self.vm.run(self.body, self.name, newContext)
+        except Error.Failure as failure:
+            print(failure.error.as_string())
+            raise
+
+
+class VMInterpreter(Interpreter.Interpreter):
+    def Interpret(self, context = None):
+        if self.ast.error:
+            print(self.ast.error.as_string())
+            return None
+        self.vm = VM(self)
+        context = SymbolTable.Context('<main>')
+        context.symbolTable = self.environment(self.ast.node)
+        self.symtab = context.symbolTable
+        try:
+            self.vm.run(self.ast.node, '<main>', context)
+        except Error.Failure as failure:
+            print(failure.error.as_string())
+
+    def function(self, name, args, body, symtab, layout):
+        return VMFunction(name, args, body, symtab, layout, self.vm)
@@ -3,35 +3,40 @@ import typeSystem as Type
 import ast
 import symTable as SymbolTable
 import errors as Error
+from optimizer import BINARY, COMPARISON
 from globalSymbolTable import GLOBAL_SYMBOL_TABLE
 
-class RTResult:
-    def __init__(self):
-        self.value = None
-        self.error = None
-        self.returnFlag = False
-
+class Return(Exception):
+    # 'ret': unwinds whatever is running up to the function call it returns from
+    def __init__(self, value):
+        self.value = value
 
-    def register(self, res):
-        if isinstance(res, RTResult):
-            if res.error: self.error = res.error
-            return res.value
+class TailCall(Exception):
+    # A 'ret' the resolver marked as a tail call, found calling the very function it is
+    # in: that call catches it and runs its body again with these arguments
+    def __init__(self, arguments):
+        self.arguments = arguments
 
-        return res
+class NodeVisitor:
+    # Every visitor class gets its own node class -> visit_* function table, filled the
+    # first time each node class is met, so visiting costs one dict lookup
+    handlers = {}
 
-    def success(self, value):
-        self.value = value
-        return self
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.handlers = {}
 
-    def failure(self, error):
-        self.error = error
-        return self
+    @classmethod
+    def handler(cls, nodeClass):
+        function = getattr(cls, 'visit_' + nodeClass.__name__, cls.generic_visit)
+        cls.handlers[nodeClass] = function
+        return function
 
-class NodeVisitor:
     def visit(self, node, context):
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node, context)
+        handler = self.handlers.get(type(node))
+        if handler is None:
+            handler = self.handler(type(node))
+        return handler(self, node, context)
 
     def generic_visit(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method found')
@@ -39,74 +44,43 @@ class NodeVisitor:
 
 
 class Visitor(NodeVisitor):
+    # visit_* methods return the node's value; an Orion runtime error is raised as
+    # Error.Failure and 'ret' as Return, so nothing is wrapped on the way up
 
     def visit_ProgramNode(self, node, context):
-        res = RTResult()
-        if len(node.statements) > 0:
-            for statement in node.statements:
-                result = res.register(self.visit(statement, context))
-                if res.error: return res
-        else:
-            return
+        for statement in node.statements:
+            self.visit(statement, context)
 
     def visit_IfStatementNode(self, node, context):
-        res = RTResult()
-        test = res.register(self.visit(node.test, context))
-        if res.error: return res
-        if test.value:
-            result = res.register(self.visit(node.body, context))
-            if res.error: return res
-            return res.success(result)
+        if self.truth(node.test, context):
+            return self.visit(node.body, context)
         elif node.alternative is not None:
-            result = res.register(self.visit(node.alternative, context))
-            if res.error: return res
-            return res.success(result)
+            return self.visit(node.alternative, context)
 
     def visit_WhileStatementNode(self, node, context):
-        res = RTResult()
         if type(node.test) == type(None):
-            return res.failure(Error.RTError(node.post_start, node.pos_end, 'Infinite loop', context))
-        test = res.register(self.visit(node.test, context))
-        if res.error: return res
-        test = test.value
-        while test:
-            res.register(self.visit(node.body, context))
-            if res.error: return res
-            test = res.register(self.visit(node.test, context))
-            if res.error: return res
-            test = test.value
-
-        
+            raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, 'Infinite loop', context))
+        while self.truth(node.test, context):
+            self.visit(node.body, context)
 
     def visit_BlockStatementNode(self, node, context):
-        res = RTResult()
+        value = None
         for statement in node.body:
-            if isinstance(statement, ast.ReturnNode):
-                value = res.register(self.visit(statement, context))
-                if res.error: return res
-                return res.success(value)
-            
-            value = res.register(self.visit(statement, context))
-            if res.error: return res
-        return res.success(value)
+            value = self.visit(statement, context)
+        return value
 
     def visit_ListExpressionNode(self, node, context):
-        res = RTResult()
         elements = []
         for element in node.elements:
-            result = res.register(self.visit(element, context))
-            if res.error: return res
-            elements.append(result)
+            elements.append(self.visit(element, context))
         
-        return res.success(Type.List(elements).setContext(context).setPosition(node.pos_start, node.pos_end))
+        return Type.List(elements)
                         
     def visit_VariableDeclarationNode(self, node, context):
-        res = RTResult()
         kind = node.kind
         for declaration in node.variableDeclarators:
-            ident = declaration.identifier.identifier.value
-            init = res.register(self.visit(declaration.init, context))
-            if res.error: return res
+            ident = declaration.identifier.name
+            init = self.visit(declaration.init, context)
             if isinstance(init, SymbolTable.FunctionContext):
                 prop = SymbolTable.Symbol(kind, Type.Function(init))
             else:
@@ -118,32 +92,26 @@ class Visitor(NodeVisitor):
         pass
 
     def visit_MemberExpressionNode(self, node, context):
-        res = RTResult()
-        ident = res.register(self.visit(node.identifier, context))
-        if res.error: return res
-        prop = res.register(self.visit(node.property, context))
-        if res.error: return res
+        ident = self.visit(node.identifier, context)
+        prop = self.visit(node.property, context)
         if isinstance(ident, Type.List) or isinstance(ident, Type.String):
             if prop.value > ident.length - 1:
-                return res.failure(Error.RTError(node.pos_start, node.pos_end, "Index out of range", context))
+                raise Error.Failure(Error.RTError(node.pos_start, node.pos_end, "Index out of range", context))
             value = ident.value[prop.value]
             if type(value) == str:
-                value = Type.String(value).setContext(context).setPosition(node.pos_start, node.pos_end)
+                value = Type.String(value)
             elif type(value) == list:
-                value = Type.List(value).setContext(context).setPosition(node.pos_start, node.pos_end)
+                value = Type.List(value)
             elif type(value) == int or type(value) == float:
-                value = Type.Number(value).setContext(context).setPosition(node.pos_start, node.pos_end)
-            return res.success(value)
-        else:
-            res.failure(Error.RTError(node.pos_start, node.pos_end, f'Variable \'{ident}\' does not support member expression.', context))
+                value = Type.number(value)
+            return value
+        # Indexing anything else has never been reported; it just gives None
+        return None
 
     def visit_PutStatementNode(self, node, context):
-        res = RTResult()
         result = ""
         for arg in node.arguments:
-            stmt = res.register(self.visit(arg, context))
-            if res.error: return res
-            result += str(stmt)
+            result += str(self.visit(arg, context))
 
         print(result)
     
@@ -151,67 +119,90 @@ class Visitor(NodeVisitor):
         pass
 
     def visit_LiteralNode(self, node, context):
-        return RTResult().success(Type.String(node.token.value).setContext(context).setPosition(node.pos_start, node.pos_end))
+        return Type.String(node.value)
 
     def visit_ReturnNode(self, node, context):
-        value = self.visit(node.expr, context)
-        return value
+        if node.tail:
+            call = node.expr
+            function = self.visit(call.callee, context)
+            args = [self.visit(arg, context) for arg in call.arguments]
+            if function is context.function:
+                raise TailCall(args)
+            function.setPosition(call)
+            raise Return(function.execute(args, context))
+        raise Return(self.visit(node.expr, context))
 
     def visit_NumberNode(self, node, context):
-        return RTResult().success(Type.Number(node.value).setContext(context).setPosition(node.pos_start, node.pos_end))
+        return Type.number(node.value)
+
+    def visit_ConstantNode(self, node, context):
+        if type(node.value) == str:
+            return Type.String(node.value)
+        return Type.number(node.value)
 
     def visit_UnaryOpNode(self, node, context):
-        res = RTResult()
-        number = res.register(self.visit(node.expr, context))
-        if res.error: return res
+        number = self.visit(node.expr, context)
 
         error = None
-        if node.op.type == Token.cons.MINUS:
-            value, error = number.mul(Type.Number(-1))
-        elif node.op.type == Token.cons.NOT:
+        if node.op == Token.cons.MINUS:
+            value, error = number.mul(Type.number(-1))
+        elif node.op == Token.cons.NOT:
             value, error = number.unary_not()
-        elif node.op.type == Token.cons.HASH:
+        elif node.op == Token.cons.HASH:
             value, error = number._len()
 
-        if error: return res.failure(error)
-        return res.success(value.setPosition(node.pos_start, node.pos_end))
+        if error: raise Error.Failure(error)
+        return value
 
     def visit_BinOpNode(self, node, context):
-        res = RTResult()
-        left = res.register(self.visit(node.left, context))
-        if res.error: return res
-        right = res.register(self.visit(node.right, context))
-        if res.error: return res
+        left = self.visit(node.left, context)
+        right = self.visit(node.right, context)
 
-        if node.op.type == Token.cons.PLUS:
+        if node.op == Token.cons.PLUS:
             result, error = left.add(right)
-        elif node.op.type == Token.cons.MINUS:
+        elif node.op == Token.cons.MINUS:
             result, error = left.sub(right)
-        elif node.op.type == Token.cons.MUL:
+        elif node.op == Token.cons.MUL:
             result, error = left.mul(right)
-        elif node.op.type == Token.cons.DIV:
+        elif node.op == Token.cons.DIV:
             result, error = left.div(right)
-        elif node.op.type == Token.cons.MOD:
+        elif node.op == Token.cons.MOD:
             result, error = left.mod(right)
-        elif node.op.type == Token.cons.EQ:
+        elif node.op == Token.cons.EQ:
             result, error = left.compare_eq(right)
-        elif node.op.type == Token.cons.LT:
+        elif node.op == Token.cons.LT:
             result, error = left.compare_lt(right)
-        elif node.op.type == Token.cons.GT:
+        elif node.op == Token.cons.GT:
             result, error = left.compare_gt(right)
-        elif node.op.type == Token.cons.LTE:
+        elif node.op == Token.cons.LTE:
             result, error = left.compare_lte(right)
-        elif node.op.type == Token.cons.GTE:
+        elif node.op == Token.cons.GTE:
             result, error = left.compare_gte(right)
-        elif node.op.type == Token.cons.NEQ:
+        elif node.op == Token.cons.NEQ:
             result, error = left.compare_neq(right)
-        elif node.op.type == Token.cons.AND:
-            result, error = left.compare_and(right)
-        elif node.op.type == Token.cons.OR:
-            result, error = left.compare_or(right)
-        elif node.op.type == Token.cons.CONCAT:
+        elif node.op == Token.cons.CONCAT:
             result, error = left.concat(right)
 
-        if error: return res.failure(error)
-        return res.success(result.setPosition(node.pos_start, node.pos_end))
-        
\ No newline at end of file
+        if error: raise Error.Failure(error.at(node.right, context))
+        return result
+
+    def visit_LogicalOpNode(self, node, context):
+        return Type.BOOLEANS[self.truth(node, context)]
+
+    def truth(self, node, context):
+        # Whether a condition holds, as a Python bool. '&&' and '||' stop at the operand that
+        # decides them, and comparing two Numbers makes no Number for its result
+        kind = type(node)
+        if kind is ast.LogicalOpNode:
+            if node.op == Token.cons.AND:
+                return self.truth(node.left, context) and self.truth(node.right, context)
+            return self.truth(node.left, context) or self.truth(node.right, context)
+        if kind is ast.BinOpNode and node.op in COMPARISON:
+            left = self.visit(node.left, context)
+            right = self.visit(node.right, context)
+            if type(left) is Type.Number and type(right) is Type.Number:
+                return COMPARISON[node.op](left.value, right.value)
+            result, error = getattr(left, BINARY[node.op])(right)
+            if error: raise Error.Failure(error.at(node.right, context))
+            return result.is_true()
+        return self.visit(node, context).is_true()